@@ -0,0 +1,55 @@
+"""
+Time of comparison and hashing of AST on the queries from the parser tests:
+- render: previous comparison by to_tree() and str() of the nodes
+- __eq__: structural comparison
+- hash: structural hash of not frozen AST, and of frozen AST (cached)
+
+Every AST is compared with its copy (equal) and with the next query (usually differs in the first fields).
+
+    env PYTHONPATH=./ python benchmarks/ast_equality.py
+"""
+import copy
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.utils import to_single_line
+
+from parser_throughput import best_time, collect_queries
+
+REPEATS = 5
+
+
+def render_equal(first, second):
+    return first.to_tree() == second.to_tree() and to_single_line(str(first)) == to_single_line(str(second))
+
+
+def compare(pairs, func):
+    def run():
+        for first, second in pairs:
+            func(first, second)
+    return best_time(run, REPEATS)
+
+
+if __name__ == '__main__':
+    asts = []
+    for sql, dialect in collect_queries():
+        try:
+            asts.append(parse_sql(sql, dialect=dialect))
+        except Exception:
+            pass
+
+    equal_pairs = [(ast, copy.deepcopy(ast)) for ast in asts]
+    other_pairs = list(zip(asts, asts[1:]))
+
+    print(f'{len(asts)} queries, total time, s')
+    print(f'{"":<16}{"render":>10}{"__eq__":>10}')
+    for name, pairs in (('equal', equal_pairs), ('different', other_pairs)):
+        render_time = compare(pairs, render_equal)
+        eq_time = compare(pairs, lambda first, second: first == second)
+        print(f'{name:<16}{render_time:>10.3f}{eq_time:>10.3f}')
+
+    copies = [second for _, second in equal_pairs]
+    hash_time = best_time(lambda: [hash(ast) for ast in copies], REPEATS)
+    for ast in copies:
+        ast.freeze()
+    frozen_time = best_time(lambda: [hash(ast) for ast in copies], REPEATS)
+    print(f'hash: {hash_time:.3f}, frozen: {frozen_time:.4f}')
@@ -0,0 +1,89 @@
+"""
+Memory held by ASTs and plans kept in caches, without and with interning of leaves (InternTable).
+
+Workloads:
+- parser tests: ASTs of all queries from the parser tests
+- dashboard: queries of the planner benchmark with different literals (like queries of a dashboard
+  with changing filters), ASTs and plans of the queries are kept
+
+The memory is measured with tracemalloc after the objects are created (temporary objects are freed),
+the table itself is included. Time of the workload is measured in a separate run without tracemalloc.
+
+    env PYTHONPATH=./ python benchmarks/ast_interning.py
+"""
+import gc
+import time
+import tracemalloc
+
+from mindsdb_sql import parse_sql, set_intern_table, InternTable
+from mindsdb_sql.planner import plan_query
+
+from parser_throughput import collect_queries
+from planner_latency import QUERIES, PLAN_PARAMS
+
+VARIANTS = 200
+
+
+def dashboard_queries():
+    # the same queries with different numbers
+    queries = []
+    for i in range(VARIANTS):
+        for sql in QUERIES:
+            queries.append(sql.replace('1', str(i + 1)).replace("'x'", f"'x{i % 20}'"))
+    return queries
+
+
+def parse_queries(queries):
+    asts = []
+    for sql, dialect in queries:
+        try:
+            asts.append(parse_sql(sql, dialect=dialect))
+        except Exception:
+            pass
+    return asts
+
+
+def parse_and_plan(queries):
+    items = []
+    for sql in queries:
+        query = parse_sql(sql, dialect='mindsdb')
+        items.append((query, plan_query(query, **PLAN_PARAMS)))
+    return items
+
+
+def measure(func, queries, intern):
+    set_intern_table(InternTable() if intern else None)
+    start_time = time.perf_counter()
+    result = func(queries)
+    duration = time.perf_counter() - start_time
+    del result
+
+    table = InternTable() if intern else None
+    set_intern_table(table)
+    gc.collect()
+    tracemalloc.start()
+    result = func(queries)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    set_intern_table(None)
+    leaves = len(table) if table is not None else 0
+    del result, table
+    return size, duration, leaves
+
+
+if __name__ == '__main__':
+    workloads = [
+        ('parser tests', parse_queries, collect_queries()),
+        ('dashboard', parse_and_plan, dashboard_queries()),
+    ]
+    # parse once: tables of the parser are loaded
+    parse_sql('select 1')
+
+    print(f'{"workload":<14}{"queries":>8}{"MB":>8}{"interned":>10}{"saved":>8}{"leaves":>8}'
+          f'{"time, s":>9}{"interned":>10}')
+    for name, func, queries in workloads:
+        size, duration, _ = measure(func, queries, False)
+        size2, duration2, leaves = measure(func, queries, True)
+        print(f'{name:<14}{len(queries):>8}{size / 2 ** 20:>8.2f}{size2 / 2 ** 20:>10.2f}'
+              f'{1 - size2 / size:>8.0%}{leaves:>8}{duration:>9.3f}{duration2:>10.3f}')
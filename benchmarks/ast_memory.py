@@ -0,0 +1,62 @@
+"""
+Memory kept alive by parsed AST: wide SELECTs, big IN lists and bulk INSERTs.
+
+For every query the AST is parsed and the memory held by it is measured with tracemalloc
+(the size of the traced memory after the parsing, tokens and the parser's temporary objects are freed).
+
+    env PYTHONPATH=./ python benchmarks/ast_memory.py
+"""
+import gc
+import tracemalloc
+
+from mindsdb_sql import get_lexer_parser
+
+
+def wide_select(size):
+    targets = ', '.join(f't.col{i} as alias{i}' for i in range(size))
+    return f'select {targets} from db.tbl as t where t.a = 1'
+
+
+def wide_expressions(size):
+    targets = ', '.join(f'sum(col{i} * 2 + 1) as s{i}' for i in range(size))
+    return f'select {targets} from tbl group by a order by a'
+
+
+def in_list(size):
+    values = ', '.join(str(i) for i in range(size))
+    return f'select * from tbl where a in ({values})'
+
+
+def bulk_insert(size):
+    rows = ', '.join(f"({i}, 'name{i}', {i}.5, null)" for i in range(size))
+    return f'insert into tbl (a, b, c, d) values {rows}'
+
+
+QUERIES = (
+    ('wide select', wide_select, 10 ** 4),
+    ('wide expressions', wide_expressions, 10 ** 4),
+    ('IN list', in_list, 10 ** 5),
+    ('bulk insert', bulk_insert, 10 ** 4),
+)
+
+
+def measure(sql):
+    lexer, parser = get_lexer_parser('mindsdb')
+    tokens = list(lexer.tokenize(sql))
+
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    ast = parser.parse(iter(tokens))
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del ast
+    return size
+
+
+if __name__ == '__main__':
+    print(f'{"query":<18}{"size":>8}{"AST, MB":>10}{"per item, bytes":>18}')
+    for name, make_query, size in QUERIES:
+        memory = measure(make_query(size))
+        print(f'{name:<18}{size:>8}{memory / 2 ** 20:>10.2f}{memory / size:>18.0f}')
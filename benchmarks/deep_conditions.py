@@ -0,0 +1,51 @@
+"""
+Time of parsing, traversal, copying, pickling, rendering and planning of queries
+with long chains of OR / AND conditions (with default recursion limit).
+to_tree is not measured: its output grows quadratically with depth of the tree because of indents.
+
+    env PYTHONPATH=./ python benchmarks/deep_conditions.py
+"""
+import copy
+import pickle
+import time
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.planner import plan_query
+from mindsdb_sql.planner.utils import query_traversal
+from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
+
+SIZES = (100, 1000, 10 ** 4, 5 * 10 ** 4)
+
+
+def make_query(size, op='or'):
+    condition = f' {op} '.join(f'a = {i}' for i in range(size))
+    return f'select * from int1.tbl where b = 1 and ({condition})'
+
+
+def measure(func):
+    start = time.perf_counter()
+    try:
+        func()
+    except RecursionError:
+        return '   recursion'
+    return f'{time.perf_counter() - start:12.3f}'
+
+
+if __name__ == '__main__':
+    render = SqlalchemyRender('postgres')
+
+    columns = ('parse', 'to_string', 'traversal', 'deepcopy', 'pickle', 'render', 'plan')
+    print(f'{"size":>8}' + ''.join(f'{name:>12}' for name in columns))
+    for size in SIZES:
+        sql = make_query(size)
+        ast = parse_sql(sql)
+        times = [
+            measure(lambda: parse_sql(sql)),
+            measure(lambda: ast.to_string()),
+            measure(lambda: query_traversal(ast, lambda node, **kwargs: None)),
+            measure(lambda: copy.deepcopy(ast)),
+            measure(lambda: pickle.loads(pickle.dumps(ast))),
+            measure(lambda: render.get_string(ast, with_failback=False)),
+            measure(lambda: plan_query(ast, integrations=['int1'])),
+        ]
+        print(f'{size:>8}' + ''.join(times))
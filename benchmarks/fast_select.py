@@ -0,0 +1,77 @@
+"""
+Comparison of MindsDBParser with the fast path for simple SELECTs (parser/dialects/mindsdb/fast_select.py)
+on the queries from the parser tests and on typical generated queries.
+
+Queries are collected by running tests/test_parser (see parser_throughput.py), ASTs of the fast path
+are checked to be the same as ASTs of MindsDBParser:
+    env PYTHONPATH=./ python benchmarks/fast_select.py [repeats]
+"""
+import sys
+
+from mindsdb_sql import get_lexer_parser
+from mindsdb_sql.parser.dialects.mindsdb.fast_select import FastSelectParser, parse_select
+
+from parser_throughput import best_time, collect_queries
+
+TYPICAL_QUERIES = [
+    'select * from mindsdb.models',
+    'select a, b from int1.tbl where id = 1',
+    "select t.a, t.b as x, count(*) from int1.tbl t where t.id in (1, 2, 3) and t.name like 'a%' group by 1, 2",
+    'select t.*, m.target from int1.tbl as t join mindsdb.model m where t.date > 10 order by t.date desc limit 10',
+    "select * from files.f1 where a = 1 and (b = 'x' or b = 'y') and c is not null limit 100 offset 10",
+]
+
+
+def measure(name, token_lists, repeats):
+    lexer, parser = get_lexer_parser('mindsdb')
+    fast_parser = FastSelectParser(parser)
+
+    fast_count = 0
+    for tokens in token_lists:
+        ast = parse_select(tokens)
+        if ast is not None:
+            fast_count += 1
+            expected = parser.parse(iter(tokens))
+            assert ast == expected and ast.to_tree() == expected.to_tree(), ' '.join(t.value for t in tokens)
+
+    def parse_lalr():
+        for tokens in token_lists:
+            parser.parse(iter(tokens))
+
+    def parse_fast():
+        for tokens in token_lists:
+            fast_parser.parse(tokens)
+
+    lalr_time = best_time(parse_lalr, repeats)
+    fast_time = best_time(parse_fast, repeats)
+
+    count = len(token_lists)
+    print(f'{name}: {count} queries, {fast_count} ({fast_count / count:.0%}) by fast path, best of {repeats} passes')
+    print(f'  MindsDBParser: {count / lalr_time:8.0f} queries/s')
+    print(f'  fast path:     {count / fast_time:8.0f} queries/s  x{lalr_time / fast_time:.1f}')
+
+
+def tokenize_valid(queries):
+    lexer, parser = get_lexer_parser('mindsdb')
+    token_lists = []
+    for sql in queries:
+        try:
+            tokens = list(lexer.tokenize(sql))
+            parser.parse(iter(tokens))
+        except Exception:
+            continue
+        token_lists.append(tokens)
+    return token_lists
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+
+    queries = sorted({sql for sql, dialect in collect_queries() if dialect == 'mindsdb'})
+    token_lists = tokenize_valid(queries)
+    measure('tests/test_parser', token_lists, repeats)
+
+    selects = [tokens for tokens in token_lists if tokens[0].type == 'SELECT']
+    measure('tests/test_parser, SELECT', selects, repeats)
+
+    measure('typical queries', tokenize_valid(TYPICAL_QUERIES) * 200, repeats)
@@ -0,0 +1,38 @@
+"""
+Time of parsing, traversal, copying and rendering of queries with long IN lists of constants.
+
+    env PYTHONPATH=./ python benchmarks/in_lists.py
+"""
+import copy
+import sys
+import time
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.planner.utils import query_traversal
+from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 2 * 10 ** 5)
+
+
+def make_query(size):
+    return f'select * from int1.tbl where id in ({", ".join(str(i) for i in range(size))}) and name = \'x\''
+
+
+def measure(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    sys.setrecursionlimit(10000)
+    render = SqlalchemyRender('postgres')
+
+    print(f'{"size":>8} {"parse":>9} {"traversal":>9} {"deepcopy":>9} {"render":>9}')
+    for size in SIZES:
+        sql = make_query(size)
+        parse_time, ast = measure(lambda: parse_sql(sql))
+        traversal_time, _ = measure(lambda: query_traversal(ast, lambda node, **kwargs: None))
+        copy_time, _ = measure(lambda: copy.deepcopy(ast))
+        render_time, _ = measure(lambda: render.get_string(ast, with_failback=False))
+        print(f'{size:>8} {parse_time:9.3f} {traversal_time:9.3f} {copy_time:9.3f} {render_time:9.3f}')
@@ -0,0 +1,39 @@
+"""
+Parsing time of INSERT ... VALUES with growing count of rows.
+Time per row has to be about the same for every size.
+
+    env PYTHONPATH=./ python benchmarks/insert_values.py [max rows]
+"""
+import sys
+import time
+
+from mindsdb_sql import get_lexer_parser
+
+
+def make_query(rows):
+    values = ', '.join(f"({i}, {i}.5, 'value {i}', NULL)" for i in range(rows))
+    return f'INSERT INTO tbl (a, b, c, d) VALUES {values}'
+
+
+if __name__ == '__main__':
+    max_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    lexer, parser = get_lexer_parser('mindsdb')
+
+    rows = 1000
+    while rows <= max_rows:
+        sql = make_query(rows)
+
+        start = time.perf_counter()
+        tokens = list(lexer.tokenize(sql))
+        lex_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        ast = parser.parse(iter(tokens))
+        parse_time = time.perf_counter() - start
+        assert ast.is_plain and len(ast.values) == rows
+
+        print(f'{rows:>9} rows  '
+              f'lexer {lex_time:8.3f}s {lex_time / rows * 1e6:6.1f}us/row  '
+              f'parser {parse_time:8.3f}s {parse_time / rows * 1e6:6.1f}us/row')
+        rows *= 10
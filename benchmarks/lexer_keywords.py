@@ -0,0 +1,54 @@
+"""
+Lexing throughput of long queries: keywords are matched by regex rules or found by lookup table
+(keyword_lookup of the lexer).
+
+    env PYTHONPATH=./ python benchmarks/lexer_keywords.py
+"""
+import time
+
+from mindsdb_sql.parser.lexer import SQLLexer
+from mindsdb_sql.parser.dialects.mindsdb.lexer import MindsDBLexer
+
+RUNS = 5
+
+
+def make_query(size):
+    columns = ', '.join(f'col{i} as alias_{i}' for i in range(size))
+    conditions = ' and '.join(
+        f"(t.field{i} > {i} or t.name{i} like 'value {i}' or t.flag{i} is not null)" for i in range(size)
+    )
+    return (
+        f'select {columns} from integration.table1 as t '
+        f'join table2 on t.id = table2.id '
+        f'where {conditions} '
+        f'group by col1, col2 order by col3 desc limit 10'
+    )
+
+
+def regex_lexer(lexer_cls):
+    # the same lexer without keyword lookup
+    class RegexLexer(lexer_cls):
+        tokens = lexer_cls.tokens
+        keyword_lookup = False
+
+    return RegexLexer
+
+
+def measure(lexer, sql):
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        tokens = list(lexer.tokenize(sql))
+        times.append(time.perf_counter() - start)
+    return len(tokens) / min(times)
+
+
+if __name__ == '__main__':
+    for size in (100, 1000):
+        sql = make_query(size)
+        print(f'query: {len(sql)} chars')
+        for lexer_cls in (SQLLexer, MindsDBLexer):
+            regex = measure(regex_lexer(lexer_cls)(), sql)
+            lookup = measure(lexer_cls(), sql)
+            print(f'  {lexer_cls.__name__:<13} regex: {regex:9.0f} tokens/s  lookup: {lookup:9.0f} tokens/s  '
+                  f'x{lookup / regex:.1f}')
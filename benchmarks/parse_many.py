@@ -0,0 +1,46 @@
+"""
+Throughput of parse_many with different count of workers compared to serial parse_sql loop.
+
+    env PYTHONPATH=./ python benchmarks/parse_many.py [count of queries]
+"""
+import os
+import sys
+import time
+
+from mindsdb_sql import parse_sql, parse_many
+from mindsdb_sql.parser.parallel import dump_asts, load_asts
+
+QUERIES = [
+    "select a, b as x from db.tbl where c = {i} and d in (1, 2, 3) order by a limit 10",
+    "select t.a, sum(m.b) from int1.tbl t join mindsdb.model m where t.c > {i} group by t.a",
+    "insert into tbl (a, b, c) values ({i}, 'x', 1.5), (2, 'y', NULL)",
+    "select * from (select a, b from t where x = '{i}') as sub where sub.a is not null",
+    "update tbl set a = {i}, b = 'x' where c in (select c from t2)",
+]
+
+
+def measure(name, func, count):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f'{name:<25} {elapsed:7.2f}s  {count / elapsed:8.0f} queries/s')
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    sqls = [QUERIES[i % len(QUERIES)].format(i=i) for i in range(count)]
+    print(f'{count} queries, {os.cpu_count()} CPUs')
+
+    measure('serial parse_sql', lambda: [parse_sql(sql) for sql in sqls], count)
+    workers = 2
+    while workers <= max(os.cpu_count(), 2):
+        measure(f'parse_many workers={workers}', lambda: parse_many(sqls, workers=workers, chunksize=200), count)
+        workers *= 2
+
+    # size and load time of ASTs returned by workers
+    asts = [parse_sql(sql) for sql in sqls[:1000]]
+    data = dump_asts(asts)
+    start = time.perf_counter()
+    load_asts(data)
+    elapsed = time.perf_counter() - start
+    print(f'transfer   {len(data) / len(asts):6.0f} bytes/ast  load {elapsed / len(asts) * 1e6:5.1f}us/ast')
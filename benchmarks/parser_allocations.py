@@ -0,0 +1,63 @@
+"""
+Memory allocated by lexer and parser per query, on the queries from the parser tests.
+
+For every query (tokens are prepared in advance for the parser):
+- peak: max size of memory allocated during the call (tracemalloc)
+- blocks: count of memory blocks kept alive by the result (tokens or AST)
+
+    env PYTHONPATH=./ python benchmarks/parser_allocations.py
+"""
+import gc
+import sys
+import tracemalloc
+
+from mindsdb_sql import get_lexer_parser
+
+from parser_throughput import collect_queries
+
+
+def measure_call(func, *args):
+    blocks = sys.getallocatedblocks()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+
+    result = func(*args)
+
+    peak = tracemalloc.get_traced_memory()[1] - start
+    blocks = sys.getallocatedblocks() - blocks
+    return result, peak, blocks
+
+
+def measure(queries):
+    lexers = {}
+    for sql, dialect in queries:
+        if dialect not in lexers:
+            lexers[dialect] = get_lexer_parser(dialect)
+
+    stats = {'lexer': [0, 0], 'parser': [0, 0]}
+
+    # the parser doesn't create reference cycles, blocks are freed without gc
+    gc.disable()
+    tracemalloc.start()
+    for sql, dialect in queries:
+        lexer, parser = lexers[dialect]
+
+        tokens, peak, blocks = measure_call(lambda: list(lexer.tokenize(sql)))
+        stats['lexer'][0] += peak
+        stats['lexer'][1] += blocks
+
+        ast, peak, blocks = measure_call(lambda: parser.parse(iter(tokens)))
+        stats['parser'][0] += peak
+        stats['parser'][1] += blocks
+        del ast, tokens
+    tracemalloc.stop()
+    gc.enable()
+
+    count = len(queries)
+    print(f'{count} queries, per query:')
+    for name, (peak, blocks) in stats.items():
+        print(f'{name + ":":<8} peak={peak / count:8.0f} bytes  blocks={blocks / count:6.1f}')
+
+
+if __name__ == '__main__':
+    measure(collect_queries())
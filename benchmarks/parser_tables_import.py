@@ -0,0 +1,63 @@
+"""
+Cold import time of the parsers:
+- tables are built from the grammar
+- tables are loaded from the disk cache
+- tables are loaded from generated modules (python -m mindsdb_sql.parser.build_tables)
+
+Every measurement is done in a new python process with a copy of the package:
+    env PYTHONPATH=./ python benchmarks/parser_tables_import.py
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+RUNS = 5
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_CODE = '''
+import sys
+import time
+if sys.argv[1] == 'no-modules':
+    import sly.yacc
+    sly.yacc.read_lrtable_module = lambda *args: None
+
+start = time.perf_counter()
+import mindsdb_sql.parser.parser
+import mindsdb_sql.parser.dialects.mysql.parser
+import mindsdb_sql.parser.dialects.mindsdb.parser
+print(time.perf_counter() - start)
+'''
+
+
+def cold_import(package_dir, cachedir, use_modules):
+    env = dict(os.environ, MINDSDB_SQL_CACHE_DIR=cachedir, PYTHONPATH=package_dir)
+    mode = 'modules' if use_modules else 'no-modules'
+    out = subprocess.check_output([sys.executable, '-c', IMPORT_CODE, mode], env=env, cwd=package_dir)
+    return float(out)
+
+
+def measure(name, *args):
+    times = [cold_import(*args) for _ in range(RUNS)]
+    print(f'{name:<25} min={min(times):.3f}s  avg={sum(times) / len(times):.3f}s')
+
+
+if __name__ == '__main__':
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        package_dir = os.path.join(tmp_dir, 'package')
+        cachedir = os.path.join(tmp_dir, 'cache')
+        for name in ('mindsdb_sql', 'sly'):
+            shutil.copytree(os.path.join(ROOT_DIR, name), os.path.join(package_dir, name),
+                            ignore=shutil.ignore_patterns('__pycache__', 'parsetab.py'))
+
+        measure('build tables', package_dir, '', False)
+
+        # fill the cache
+        cold_import(package_dir, cachedir, False)
+        measure('disk cache', package_dir, cachedir, False)
+
+        subprocess.check_call([sys.executable, '-m', 'mindsdb_sql.parser.build_tables'],
+                              cwd=package_dir, stdout=subprocess.DEVNULL)
+        measure('generated modules', package_dir, '', True)
@@ -0,0 +1,83 @@
+"""
+Throughput of lexer and parser on the queries from the parser tests.
+
+Queries are collected by running tests/test_parser with patched parse_sql,
+then every query is lexed and parsed several times:
+    env PYTHONPATH=./ python benchmarks/parser_throughput.py [repeats]
+"""
+import os
+import re
+import sys
+import time
+
+import pytest
+
+import mindsdb_sql
+from mindsdb_sql import get_lexer_parser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def collect_queries():
+    queries = []
+    parse_sql = mindsdb_sql.parse_sql
+
+    def recording_parse_sql(sql, dialect='mindsdb', *args, **kwargs):
+        ast = parse_sql(sql, dialect, *args, **kwargs)
+        queries.append((re.sub(r'[\s;]+$', '', sql), dialect))
+        return ast
+
+    class Plugin:
+        def pytest_configure(self, config):
+            # before test modules import parse_sql
+            mindsdb_sql.parse_sql = recording_parse_sql
+
+        def pytest_unconfigure(self, config):
+            mindsdb_sql.parse_sql = parse_sql
+
+    pytest.main(['-q', '-p', 'no:cacheprovider', '--no-header', '--no-summary',
+                 os.path.join(ROOT_DIR, 'tests', 'test_parser')], plugins=[Plugin()])
+    return queries
+
+
+def best_time(func, repeats):
+    # the best pass is the least affected by other processes
+    times = []
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def measure(queries, repeats):
+    lexers = {}
+    for sql, dialect in queries:
+        if dialect not in lexers:
+            lexers[dialect] = get_lexer_parser(dialect)
+    tokenized = [
+        (lexers[dialect][1], list(lexers[dialect][0].tokenize(sql)))
+        for sql, dialect in queries
+    ]
+
+    def lex_all():
+        for sql, dialect in queries:
+            list(lexers[dialect][0].tokenize(sql))
+
+    def parse_all():
+        for parser, tokens in tokenized:
+            parser.parse(iter(tokens))
+
+    lex_time = best_time(lex_all, repeats)
+    parse_time = best_time(parse_all, repeats)
+
+    count = sum(len(tokens) for _, tokens in tokenized)
+    print(f'{len(queries)} queries, {count} tokens, best of {repeats} passes')
+    print(f'lexer:  {len(queries) / lex_time:8.0f} queries/s  {count / lex_time:9.0f} tokens/s')
+    print(f'parser: {len(queries) / parse_time:8.0f} queries/s  {count / parse_time:9.0f} tokens/s')
+
+
+if __name__ == '__main__':
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    queries = collect_queries()
+    measure(queries, repeats)
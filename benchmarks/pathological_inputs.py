@@ -0,0 +1,62 @@
+"""
+Lexing and parsing time of pathological inputs: not closed strings with backslashes, not closed comments,
+long runs of spaces, huge literals, errors in long multiline queries and deep nesting (with and without ParseLimits).
+
+The time has to grow linearly with the size of the input:
+    env PYTHONPATH=./ python benchmarks/pathological_inputs.py
+"""
+import time
+
+import mindsdb_sql
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.limits import ParseLimits
+
+SIZES = (10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6)
+
+CASES = {
+    'not closed string, backslashes': lambda n: "select '" + '\\' * n + 'a',
+    'not closed dquote, backslashes': lambda n: 'select "' + '\\' * n + 'a',
+    'escaped quotes, closed by backtracking': lambda n: "select '" + "\\'" * (n // 2),
+    'not closed comment, many openings': lambda n: 'select 1 /*' + ' /*' * (n // 3),
+    'not closed backtick, many backticks': lambda n: 'select `' + 'a ``' * (n // 4),
+    'spaces inside the query': lambda n: 'select 1' + ' ' * n + 'x',
+    'long string': lambda n: "select 'a" + "a''b" * (n // 4) + "'",
+    'many lines, error at the end': lambda n: 'select ' + 'a,\n' * (n // 3) + ' from',
+    'deep nesting': lambda n: 'select ' + '(' * (n // 10) + '1' + ')' * (n // 10),
+}
+
+LIMITS = ParseLimits(max_length=10 ** 6, max_tokens=10 ** 4, max_depth=100)
+
+
+def measure(sql):
+    start = time.perf_counter()
+    try:
+        parse_sql(sql)
+        result = 'ok'
+    except Exception as e:
+        result = type(e).__name__
+    return time.perf_counter() - start, result
+
+
+def run(title):
+    print(title)
+    for name, make_query in CASES.items():
+        results = []
+        for size in SIZES:
+            if name == 'deep nesting' and mindsdb_sql.get_parse_limits() is None and size > 10 ** 4:
+                # too deep for recursive processing of AST
+                continue
+            elapsed, result = measure(make_query(size))
+            results.append(f'{size:>8}: {elapsed * 1000:8.1f}ms {result:<20}')
+        print(f'  {name}')
+        for item in results:
+            print('    ' + item)
+
+
+if __name__ == '__main__':
+    # warm up
+    parse_sql('select 1')
+
+    run('without limits')
+    mindsdb_sql.set_parse_limits(LIMITS)
+    run(f'with limits: length={LIMITS.max_length}, tokens={LIMITS.max_tokens}, depth={LIMITS.max_depth}')
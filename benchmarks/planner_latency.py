@@ -0,0 +1,90 @@
+"""
+Latency of planning of typical queries: selects from integrations, nested selects, joins with predictors,
+time series predictors and updates. Queries are parsed in advance.
+Peak memory allocated during planning of the query is measured with tracemalloc.
+Also time of copying of the parsed queries: copy.deepcopy and clone (with and without sharing of leaves).
+
+    env PYTHONPATH=./ python benchmarks/planner_latency.py
+"""
+import copy
+import time
+import tracemalloc
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.planner import plan_query
+
+REPEATS = 5
+LOOPS = 200
+
+PLAN_PARAMS = dict(
+    integrations=['int1', 'int2'],
+    predictor_namespace='mindsdb',
+    default_namespace='mindsdb',
+    predictor_metadata={
+        'pred': {},
+        'tp3': {
+            'timeseries': True,
+            'window': 10,
+            'order_by_column': 'date',
+            'group_by_columns': ['type'],
+        },
+    },
+)
+
+QUERIES = [
+    "select a, b, sum(c) as s from int1.tbl where x = 1 and y in (1, 2, 3) group by a, b order by s desc limit 10",
+    "select * from int1.tbl as t where t.a > 1 and t.b like '%x%' or t.c between 1 and 10",
+    "select x.a, count(*) from (select a, b from int1.tbl where c is not null) as x group by x.a",
+    "select * from int1.tbl where a in (select a from int2.tbl2 where b = 'x')",
+    "select t.a, p.y from int1.tbl as t join mindsdb.pred as p where t.x = 1 limit 100",
+    "select t.a, t.b, p.y from int1.tbl as t join int2.tbl2 as t2 on t.id = t2.id "
+    "join mindsdb.pred as p where t.x > 10 and t2.y = 'a'",
+    "select * from mindsdb.pred where a = 1 and b = 'x'",
+    "select p.date, p.y from int1.tbl as t join mindsdb.tp3 as p "
+    "where t.date > latest and t.type = 'house' limit 10",
+    "update int1.tbl set a = df.a, b = df.b from (select * from int2.tbl2 where c = 1) as df where tbl.id = df.id",
+    "select a, b from int1.tbl union select a, b from int2.tbl2",
+]
+
+
+def best_time(func):
+    times = []
+    for i in range(REPEATS):
+        start = time.perf_counter()
+        for j in range(LOOPS):
+            func()
+        times.append(time.perf_counter() - start)
+    return min(times) / LOOPS
+
+
+def planning_memory(query):
+    plan_query(query, **PLAN_PARAMS)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = tracemalloc.get_traced_memory()[0]
+    plan_query(query, **PLAN_PARAMS)
+    peak = tracemalloc.get_traced_memory()[1] - start
+    tracemalloc.stop()
+    return peak
+
+
+if __name__ == '__main__':
+    queries = [parse_sql(sql, dialect='mindsdb') for sql in QUERIES]
+
+    print(f'{"query":<62}{"plan, ms":>10}{"peak, KB":>10}')
+    total = 0
+    total_memory = 0
+    for sql, query in zip(QUERIES, queries):
+        duration = best_time(lambda: plan_query(query, **PLAN_PARAMS))
+        memory = planning_memory(query)
+        total += duration
+        total_memory += memory
+        print(f'{sql[:60]:<62}{duration * 1000:>10.3f}{memory / 1024:>10.1f}')
+    print(f'{"total":<62}{total * 1000:>10.3f}{total_memory / 1024:>10.1f}')
+
+    print()
+    print('copy of all queries, ms:')
+    print(f'deepcopy: {best_time(lambda: copy.deepcopy(queries)) * 1000:.3f}')
+    print(f'clone: {best_time(lambda: [query.clone() for query in queries]) * 1000:.3f}')
+    shared = best_time(lambda: [query.clone(share_leaves=True) for query in queries])
+    print(f'clone(share_leaves=True): {shared * 1000:.3f}')
@@ -1,10 +1,21 @@
-import re
-from collections import defaultdict
+import os
+import threading
+import time
+from contextlib import contextmanager
 
-from sly.lex import Token
-
-from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.exceptions import ParsingException, UnexpectedTokenException
 from mindsdb_sql.parser.ast import *
+from mindsdb_sql.parser.cache import ParseCache
+from mindsdb_sql.parser.template import TemplateCache
+from mindsdb_sql.parser.limits import ParseLimits
+from mindsdb_sql.parser.script import split_script
+from mindsdb_sql.parser.fingerprint import QueryFingerprint, fingerprint, fingerprint_tokens
+from mindsdb_sql.parser.stats import QueryStats, set_query_stats, get_query_stats
+from mindsdb_sql.parser.intern import InternTable, set_intern_table, get_intern_table
+
+
+# count of tokens after the error which have to be accepted with the suggested token
+SUGGESTION_LOOKAHEAD = 10
 
 
 class ErrorHandling:
@@ -13,10 +24,10 @@ class ErrorHandling:
         self.parser = parser
         self.lexer = lexer
 
-    def process(self, error_info):
-        self.tokens = [t for t in error_info['tokens'] if t is not None]
-        self.bad_token = error_info['bad_token']
-        self.expected_tokens = error_info['expected_tokens']
+    def process(self, tokens, bad_token, expected_tokens, suggestions=True):
+        self.tokens = tokens
+        self.bad_token = bad_token
+        self.expected_tokens = expected_tokens
 
         if len(self.tokens) == 0:
             return 'Empty input'
@@ -25,7 +36,7 @@ class ErrorHandling:
         msgs = self.error_location()
 
         # suggestion
-        suggestions = self.make_suggestion()
+        suggestions = self.make_suggestion() if suggestions else None
 
         if suggestions:
             prefix = 'Possible inputs: ' if len(suggestions) > 1 else 'Expected symbol: '
@@ -33,56 +44,34 @@ class ErrorHandling:
         return '\n'.join(msgs)
 
     def error_location(self):
-
-        # restore query text
-        lines_idx = defaultdict(str)
-
-        # used + unused tokens
-        for token in self.tokens:
-            if token is None:
-                continue
-            line = lines_idx[token.lineno]
-
-            if len(line) > token.index:
-                line = line[: token.index]
-            else:
-                line = line.ljust(token.index)
-
-            line += token.value
-            lines_idx[token.lineno] = line
-
         msgs = []
 
         # error message and location
         if self.bad_token is None:
             msgs.append('Syntax error, unexpected end of query:')
+            # after the last token
+            last_token = self.tokens[-1]
+            lines = last_token.lines
+            error_pos = last_token.end
             error_len = 1
-            # last line
-            error_line_num = list(lines_idx.keys())[-1]
-            error_index = len(lines_idx[error_line_num])
         else:
             msgs.append('Syntax error, unknown input:')
-            error_len = len(self.bad_token.value)
-            error_line_num = self.bad_token.lineno
-            error_index = self.bad_token.index
-
-        # shift lines indexes (it removes spaces from beginnings of the lines)
-        lines = []
-        shift = 0
-        error_line = 0
-        for i, line_num in enumerate(lines_idx.keys()):
-            if line_num == error_line_num:
-                error_index -= shift
-                error_line = i
-
-            line = lines_idx[line_num]
-            lines.append(line[shift:])
-            shift = len(line)
-
-        # add source code
-        first_line = error_line - 2 if error_line > 1 else 0
-        for line in lines[first_line: error_line + 1]:
-            msgs.append('>' + line)
+            lines = self.bad_token.lines
+            error_pos = self.bad_token.index
+            error_len = None
+
+        error_line = lines.lineno(error_pos)
+        error_index = lines.column(error_pos)
+
+        # add source code: the line of the error and two lines before it
+        for lineno in range(max(error_line - 2, lines.first_lineno), error_line + 1):
+            # one char per column to keep the marker under the error
+            msgs.append('>' + lines.line(lineno).replace('\t', ' '))
+
+        if error_len is None:
+            # the part of the token on the line of the error
+            line_len = len(lines.line(error_line))
+            error_len = max(min(self.bad_token.end - error_pos, line_len - error_index), 1)
 
         # error position
         msgs.append('-' * (error_index + 1) + '^' * error_len)
@@ -130,36 +119,34 @@ class ErrorHandling:
                 # if this is the end of query, just show next expected keywords
                 return list(expected.keys())
 
-            # not every suggestion satisfy the end of the query. we have to check if it works
-            for value, token_name in expected.items():
-                # make up a token
-                token = Token()
-                token.type = token_name
-                token.value = value
-                token.end = 0
-                token.index = 0
-                token.lineno = 0
+            # not every suggestion satisfy the rest of the query. we have to check if it works:
+            #   the candidate is checked by LR automaton from the state of the parser before the bad token
+            #   (or before the previous token), only the following SUGGESTION_LOOKAHEAD tokens are used
+            rest = [token.type for token in self.tokens[error_index: error_index + SUGGESTION_LOOKAHEAD]]
+            if error_index + SUGGESTION_LOOKAHEAD >= len(self.tokens):
+                rest.append('$end')
+
+            prev_states = states = None
+            if error_index > 0:
+                prev_states = self.parser.simulate([token.type for token in self.tokens[:error_index - 1]])
+                if prev_states is not None:
+                    states = self.parser.simulate([self.tokens[error_index - 1].type], prev_states)
+            else:
+                states = self.parser.simulate([])
 
+            for value, token_name in expected.items():
                 # try to add token
-                tokens2 = self.tokens[:error_index] + [token] + self.tokens[error_index:]
-                if self.query_is_valid(tokens2):
+                if states is not None and self.parser.simulate([token_name] + rest, states) is not None:
                     suggestions.append(value)
                     continue
 
                 # try to replace token
-                tokens2 = self.tokens[:error_index - 1] + [token] + self.tokens[error_index:]
-                if self.query_is_valid(tokens2):
+                if prev_states is not None and self.parser.simulate([token_name] + rest, prev_states) is not None:
                     suggestions.append(value)
                     continue
 
         return suggestions
 
-    def query_is_valid(self, tokens):
-        # try to parse list of tokens
-
-        ast = self.parser.parse(iter(tokens))
-        return ast is not None
-
 
 def get_lexer_parser(dialect):
     if dialect == 'sqlite':
@@ -179,19 +166,258 @@ def get_lexer_parser(dialect):
     return lexer, parser
 
 
-def parse_sql(sql, dialect='mindsdb'):
+class LexerParserPool:
+    """
+    Keeps lexers and parsers of the dialect to reuse them between queries.
+    Every pair is used by one caller at the time, so the pool is safe to use from many threads
+    """
+
+    def __init__(self, dialect, max_size=32):
+        self.dialect = dialect
+        self.max_size = max_size
+        self._items = [get_lexer_parser(dialect)]
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self):
+        with self._lock:
+            item = self._items.pop() if self._items else None
+
+        if item is None:
+            item = get_lexer_parser(self.dialect)
+        try:
+            yield item
+        finally:
+            with self._lock:
+                if len(self._items) < self.max_size:
+                    self._items.append(item)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_lexer_parser_pool(dialect):
+    pool = _pools.get(dialect)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(dialect)
+            if pool is None:
+                pool = LexerParserPool(dialect)
+                _pools[dialect] = pool
+    return pool
+
+
+_parse_cache = None
+
+
+def set_parse_cache(cache):
+    """
+    Enables cache of parsed queries in parse_sql
+    :param cache: ParseCache object, None disables caching
+    """
+    global _parse_cache
+    _parse_cache = cache
+
+
+def get_parse_cache():
+    return _parse_cache
+
+
+_template_cache = None
+
+
+def set_template_cache(cache):
+    """
+    Enables cache of statement templates in parse_sql:
+      queries which differ only by literals are parsed once
+    :param cache: TemplateCache object, None disables templates
+    """
+    global _template_cache
+    _template_cache = cache
+
+
+def get_template_cache():
+    return _template_cache
+
+
+def strip_query(sql):
+    """
+    Removes semicolons and spaces from the end of the query.
+    Only the end is scanned: the regex for spaces at the end is quadratic on long runs of spaces inside the query
+    """
+    end = len(sql)
+    while end > 0 and (sql[end - 1] == ';' or sql[end - 1].isspace()):
+        end -= 1
+    return sql[:end]
+
+
+_parse_limits = None
+
+
+def set_parse_limits(limits):
+    """
+    Enables limits of the parsed queries in parse_sql
+    :param limits: ParseLimits object, None disables limits
+    """
+    global _parse_limits
+    _parse_limits = limits
+
+
+def get_parse_limits():
+    return _parse_limits
+
+
+_fast_parse = False
+
+
+def set_fast_parse(enabled):
+    """
+    Enables the fast path for simple SELECTs of mindsdb dialect in parse_sql:
+      they are parsed by hand-written parser (parser/dialects/mindsdb/fast_select.py),
+      other queries - by MindsDBParser
+    :param enabled: True or False
+    """
+    global _fast_parse
+    _fast_parse = enabled
+
+
+def get_fast_parse():
+    return _fast_parse
+
+
+def parse_sql(sql, dialect='mindsdb', spans=False, suggestions=True):
+    """
+    :param sql: text of the query
+    :param dialect: sqlite, mysql or mindsdb
+    :param spans: attach position in the text (node.span: start, end, lineno) to every node of AST
+    :param suggestions: add possible inputs to the message of syntax error,
+        False - only location of the error is shown
+    """
     # remove ending semicolon and spaces
-    sql = re.sub(r'[\s;]+$', '', sql)
+    sql = strip_query(sql)
+
+    stats = get_query_stats()
+    if stats is None:
+        return _parse_stripped_sql(sql, dialect, spans, suggestions)
+
+    start = time.perf_counter()
+    try:
+        ast = _parse_stripped_sql(sql, dialect, spans, suggestions)
+    except Exception:
+        elapsed = time.perf_counter() - start
+        stats.record(fingerprint(sql), 'parse', elapsed, error=True)
+        raise
+    elapsed = time.perf_counter() - start
+    if ast.fingerprint is None:
+        ast.fingerprint = fingerprint(sql)
+    stats.record(ast.fingerprint, 'parse', elapsed)
+    return ast
+
 
-    lexer, parser = get_lexer_parser(dialect)
-    tokens = lexer.tokenize(sql)
-    ast = parser.parse(tokens)
+def _parse_stripped_sql(sql, dialect, spans, suggestions):
+    if _parse_limits is not None:
+        _parse_limits.check_length(sql)
 
-    if ast is None:
+    if spans:
+        # caches don't keep positions
+        return _parse_sql(sql, dialect, spans=True, suggestions=suggestions)
 
-        eh = ErrorHandling(lexer, parser)
-        message = eh.process(parser.error_info)
+    cache = _parse_cache
+    if cache is not None:
+        ast = cache.get(sql, dialect)
+        if ast is None:
+            ast = _intern_leaves(_parse_sql(sql, dialect, suggestions=suggestions), dialect)
+            cache.put(sql, dialect, ast)
+        elif not cache.shared:
+            # copy from the cache has its own leaves
+            ast = _intern_leaves(ast, dialect)
+        return ast
 
-        raise ParsingException(message)
+    return _intern_leaves(_parse_sql(sql, dialect, suggestions=suggestions), dialect)
 
+
+def _intern_leaves(ast, dialect):
+    # the tree is just parsed (or copied from the cache): leaves are replaced in place
+    intern_table = get_intern_table()
+    if intern_table is not None:
+        intern_table.intern_tree(ast, dialect)
     return ast
+
+
+def parse_script(source, dialect='mindsdb', chunk_size=1024 ** 2, encoding='utf-8'):
+    """
+    Parses script with many statements separated by semicolons.
+    The script is read and parsed incrementally, one statement at the time.
+
+    :param source: text of the script, file object, mmap or iterable of strings/bytes
+    :param dialect: sqlite, mysql or mindsdb
+    :param chunk_size: size of the chunk to read from source
+    :param encoding: encoding of binary source
+    :return: generator of (ast, span), span is position of the statement in the script: start, end, lineno
+    """
+    for sql, span in split_script(source, chunk_size=chunk_size, encoding=encoding):
+        yield parse_sql(sql, dialect), span
+
+
+def parse_many(sqls, dialect='mindsdb', workers=None, chunksize=100):
+    """
+    Parses list of queries in parallel processes
+
+    :param sqls: list of queries
+    :param dialect: sqlite, mysql or mindsdb
+    :param workers: count of processes, default is count of CPUs. 1 - parse in current process
+    :param chunksize: count of queries sent to worker at once
+    :return: list of ASTs in the order of queries, ParsingException object in place of query with error
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from mindsdb_sql.parser.parallel import init_worker, parse_chunk, load_asts
+
+    sqls = list(sqls)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    chunks = [sqls[i: i + chunksize] for i in range(0, len(sqls), chunksize)]
+
+    if workers <= 1 or len(chunks) <= 1:
+        results = []
+        for chunk in chunks:
+            results.extend(load_asts(parse_chunk(chunk, dialect)))
+        return results
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks)),
+                             initializer=init_worker, initargs=(dialect,)) as executor:
+        for data in executor.map(parse_chunk, chunks, [dialect] * len(chunks)):
+            results.extend(load_asts(data))
+    return results
+
+
+def _parse_sql(sql, dialect, spans=False, suggestions=True):
+    with get_lexer_parser_pool(dialect).acquire() as (lexer, parser):
+        limits = _parse_limits
+        if limits is not None:
+            tokens = limits.tokenize(lexer, sql)
+        else:
+            tokens = list(lexer.tokenize(sql))
+        template_cache = _template_cache
+        # parser for the query, the parser of the dialect is used for error handling
+        query_parser = parser
+        if _fast_parse and dialect == 'mindsdb':
+            from mindsdb_sql.parser.dialects.mindsdb.fast_select import FastSelectParser
+            query_parser = FastSelectParser(parser)
+        try:
+            if spans:
+                ast = parser.parse(iter(tokens), spans=True)
+            elif template_cache is not None:
+                ast = template_cache.parse(tokens, query_parser, dialect)
+            else:
+                ast = query_parser.parse(iter(tokens))
+            if dialect == 'mindsdb' and get_query_stats() is not None:
+                # the same tokens are used for fingerprint, it is kept in cached AST
+                ast.fingerprint = fingerprint_tokens(tokens)
+            return ast
+        except UnexpectedTokenException as e:
+            eh = ErrorHandling(lexer, parser)
+            message = eh.process(tokens, e.bad_token, e.expected_tokens, suggestions=suggestions)
+
+    raise ParsingException(message)
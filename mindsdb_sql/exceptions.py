@@ -8,3 +8,16 @@ class ParsingException(MindsdbSQLException):
 
 class PlanningException(MindsdbSQLException):
     pass
+
+
+class UnexpectedTokenException(ParsingException):
+    # raised by parser at the first unexpected token (or end of the query if bad_token is None)
+
+    def __init__(self, bad_token, expected_tokens=None):
+        self.bad_token = bad_token
+        self.expected_tokens = expected_tokens or []
+        if bad_token is not None:
+            message = f"Syntax error at token {bad_token.type}: \"{bad_token.value}\""
+        else:
+            message = "Syntax error at EOF"
+        super().__init__(message)
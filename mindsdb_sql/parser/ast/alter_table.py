@@ -3,10 +3,14 @@ from mindsdb_sql.parser.utils import indent
 
 
 class Alter(ASTNode):
+    __slots__ = ()
+
     ...
 
 
 class AlterTable(ASTNode):
+    __slots__ = ('target', 'arg')
+
     def __init__(self,
                  target,
                  arg,
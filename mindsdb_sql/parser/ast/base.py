@@ -1,17 +1,363 @@
 import copy
+import types
+import weakref
 
 from mindsdb_sql import ParsingException
-from mindsdb_sql.parser.utils import to_single_line
+
+
+_missing = object()
+
+
+def _init_fields(cls):
+    # names of the slots of the class and its parents, slots shadowed by properties are skipped
+    names = []
+    for klass in reversed(cls.__mro__):
+        for name in klass.__dict__.get('__slots__', ()):
+            if name in ('__weakref__', '_hash') or name in names:
+                continue
+            if isinstance(getattr(cls, name), types.MemberDescriptorType):
+                names.append(name)
+    cls._slot_names = tuple(names)
+
+    if '_eq_fields' not in cls.__dict__:
+        cls._eq_fields = tuple(name for name in names if name not in cls._non_structural)
+    if '_eq_class' not in cls.__dict__:
+        cls._eq_class = cls
+
+    # generated clone is not used if the class or its parent defines its own clone
+    cls._clone_fields = _make_clone(cls)
+    cls._shallow_copy = _make_clone(cls, shallow=True)
+    inherited = getattr(cls, 'clone', None)
+    if 'clone' not in cls.__dict__ and (inherited is None or getattr(inherited, 'generated', False)):
+        cls.clone = cls._clone_fields
+
+
+# values which are not copied
+_scalar_types = frozenset([str, int, float, bool, type(None)])
+
+
+class FrozenList(list):
+    """
+    List which can't be changed in place, is used for parts of interned identifiers (see parser.intern).
+    Copies (copy, deepcopy, clone of the node) are plain lists
+    """
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('List is shared between ASTs and can not be changed, use a copy of the node (clone)')
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+    append = extend = insert = pop = remove = clear = sort = reverse = _immutable
+
+    def __copy__(self):
+        return list(self)
+
+    def __deepcopy__(self, memo):
+        return copy.deepcopy(list(self), memo)
+
+    def __reduce_ex__(self, protocol):
+        return list, (list(self),)
+
+
+_list_types = (list, tuple, FrozenList)
+
+# ids of interned leaves (see parser.intern), ids are removed when the leaves are deleted
+_interned_ids = set()
+
+
+def mark_interned(node):
+    """
+    Makes attributes of the leaf read only: the leaf is shared between ASTs
+    """
+    node_id = id(node)
+    if node_id not in _interned_ids:
+        _interned_ids.add(node_id)
+        weakref.finalize(node, _interned_ids.discard, node_id)
+
+
+def is_interned(node):
+    return id(node) in _interned_ids
+
+
+def leaf_setattr(self, name, value):
+    # __setattr__ of the leaves which can be interned
+    if _interned_ids and id(self) in _interned_ids:
+        raise TypeError(
+            f'{type(self).__name__} is shared between ASTs and can not be changed, use a copy of the node (clone)'
+        )
+    object.__setattr__(self, name, value)
+
+_clone_doc = """
+    Copy of the node with all its sub-nodes, is faster than copy.deepcopy.
+    Scalars are shared, lists, tuples and dicts are copied, other objects are copied with deepcopy.
+    :param share_leaves: don't copy immutable leaves (Constant, NullConstant, Star), the copy shares them with the node
+    """
+
+
+def _make_clone(cls, shallow=False):
+    # code of clone which copies every slot of the class without loops and lookups of the names
+    #   shallow: values of the slots are not copied (is used by replace)
+    lines = [
+        'def clone(self, share_leaves=False):',
+        '    node = new(cls)',
+        '    node._hash = None',
+    ]
+    for name in cls._slot_names:
+        lines += [
+            '    try:',
+            f'        value = self.{name}',
+            '    except AttributeError:',
+            '        pass',
+            '    else:',
+        ]
+        if shallow or name in cls._clone_shared:
+            lines.append(f'        node.{name} = value')
+        else:
+            lines.append(
+                f'        node.{name} = value if type(value) in scalar_types else clone_value(value, share_leaves)'
+            )
+    lines.append('    return node')
+
+    namespace = {'cls': cls, 'new': object.__new__, 'scalar_types': _scalar_types, 'clone_value': clone_value}
+    exec('\n'.join(lines), namespace)
+    clone = namespace['clone']
+    if shallow:
+        clone.__qualname__ = f'{cls.__qualname__}._shallow_copy'
+        return clone
+    clone.__qualname__ = f'{cls.__qualname__}.clone'
+    clone.__doc__ = _clone_doc
+    clone.generated = True
+    return clone
+
+
+def clone_value(value, share_leaves=False):
+    """
+    Copy of the value which can contain AST nodes (see ASTNode.clone)
+    """
+    value_type = type(value)
+    if value_type in _scalar_types:
+        return value
+    if isinstance(value, ASTNode):
+        if share_leaves and value._shareable:
+            return value
+        return value.clone(share_leaves)
+    if value_type is list or value_type is FrozenList:
+        return [item if type(item) in _scalar_types else clone_value(item, share_leaves) for item in value]
+    if value_type is tuple:
+        return tuple([item if type(item) in _scalar_types else clone_value(item, share_leaves) for item in value])
+    if value_type is dict:
+        return {key: clone_value(item, share_leaves) for key, item in value.items()}
+    return copy.deepcopy(value)
+
+
+def _value_hash(value):
+    # hash of a scalar, it is also a hash of the plain Constant with this value
+    try:
+        return hash((type(value), value))
+    except TypeError:
+        return hash(type(value))
+
+
+def _as_scalar(value):
+    # plain constant is replaced by its value, other values are returned as is
+    if isinstance(value, ASTNode):
+        scalar = value._scalar_value()
+        if scalar is not _missing:
+            return scalar
+    return value
+
+
+def structural_equal(first, second):
+    """
+    Compares two values which can contain AST nodes, field by field and without recursion,
+    stops on the first difference.
+    Nodes of different classes are not equal (except ConstantList and Tuple with the same items),
+    scalars are equal only if they have the same type.
+    Plain constants are equal to their values only in lists of values (fields from _eq_scalar_fields)
+    """
+    # items of the stack: (first value, second value, values are in a list of values)
+    stack = [(first, second, False)]
+    while stack:
+        a, b, scalars = stack.pop()
+        if a is b:
+            continue
+        if scalars:
+            a = _as_scalar(a)
+            b = _as_scalar(b)
+            if a is b:
+                continue
+        if isinstance(a, ASTNode):
+            if not isinstance(b, ASTNode):
+                return False
+            if a._eq_class is not b._eq_class:
+                return False
+            if a._hash is not None and b._hash is not None and a._hash != b._hash:
+                return False
+            for name_a, name_b in zip(a._eq_fields, b._eq_fields):
+                stack.append((
+                    getattr(a, name_a, _missing),
+                    getattr(b, name_b, _missing),
+                    name_a in a._eq_scalar_fields or name_b in b._eq_scalar_fields,
+                ))
+        elif isinstance(b, ASTNode):
+            return False
+        elif type(a) in _list_types:
+            if type(b) not in _list_types or len(a) != len(b):
+                return False
+            stack.extend((item_a, item_b, scalars) for item_a, item_b in zip(a, b))
+        elif type(a) is dict:
+            if type(b) is not dict or a.keys() != b.keys():
+                return False
+            stack.extend((item, b[key], scalars) for key, item in a.items())
+        elif type(a) is not type(b) or a != b:
+            return False
+    return True
+
+
+def structural_hash(value):
+    """
+    Hash of the value which can contain AST nodes, is consistent with structural_equal.
+    Is calculated without recursion, hashes of frozen nodes are taken from the nodes
+    """
+    # post-order traversal: the item is pushed again with the count of its children after them
+    results = []
+    stack = [(value, None, False)]
+    while stack:
+        item, count, scalars = stack.pop()
+        if count is not None:
+            children = results[len(results) - count:]
+            del results[len(results) - count:]
+            if isinstance(item, ASTNode):
+                result = hash((item._eq_class, *children))
+            elif type(item) is dict:
+                result = hash(frozenset(zip(item.keys(), children)))
+            else:
+                result = hash((list, *children))
+            results.append(result)
+        elif isinstance(item, ASTNode):
+            if scalars:
+                scalar = item._scalar_value()
+                if scalar is not _missing:
+                    results.append(_value_hash(scalar))
+                    continue
+            if item._hash is not None:
+                results.append(item._hash)
+                continue
+            stack.append((item, len(item._eq_fields), False))
+            stack.extend(
+                (getattr(item, name, _missing), None, name in item._eq_scalar_fields)
+                for name in reversed(item._eq_fields)
+            )
+        elif type(item) in _list_types:
+            stack.append((item, len(item), False))
+            stack.extend((child, None, scalars) for child in reversed(item))
+        elif type(item) is dict:
+            stack.append((item, len(item), False))
+            stack.extend((child, None, scalars) for child in reversed(list(item.values())))
+        else:
+            results.append(_value_hash(item))
+    return results[0]
 
 
 class ASTNode:
+    # nodes don't have __dict__: every attribute of the node has to be declared in __slots__ of its class
+    __slots__ = (
+        'alias',
+        'parentheses',
+        # position of the node in the text of the query (sly.yacc.Span), is set by parse_sql(..., spans=True)
+        'span',
+        # QueryFingerprint of the query, is set by parse_sql when query statistics is enabled (set_query_stats)
+        'fingerprint',
+        # cached structural hash, is set only for frozen nodes (see freeze)
+        '_hash',
+    )
+
+    # defaults of attributes, they are omitted in serialized AST
+    _defaults = {'alias': None, 'parentheses': False, 'span': None, 'fingerprint': None, '_hash': None}
+
+    # attributes which are not compared by __eq__ and are not used in __hash__
+    _non_structural = ('span', 'fingerprint')
+
+    # attributes with lists of values: plain constants in them are equal to their values
+    _eq_scalar_fields = ()
+
+    # attributes which are not copied by clone: the copy refers to the same objects
+    _clone_shared = ('span', 'fingerprint')
+
+    # node is immutable leaf, it can be shared between copies of AST (clone with share_leaves)
+    _shareable = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        _init_fields(cls)
+
     def __init__(self, alias=None, parentheses=False):
         self.alias = alias
         self.parentheses = parentheses
+        self.span = None
+        self.fingerprint = None
+        self._hash = None
 
         if self.alias and len(self.alias.parts) > 1:
             raise ParsingException('Alias can not contain multiple parts (dots).')
 
+    def __getstate__(self):
+        # attributes which are set and differ from defaults
+        defaults = self._defaults
+        state = {}
+        for name in self._slot_names:
+            value = getattr(self, name, _missing)
+            if value is not _missing and defaults.get(name, _missing) is not value:
+                state[name] = value
+        return state
+
+    def __setstate__(self, state):
+        for name, value in self._defaults.items():
+            setattr(self, name, value)
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def replace(self, **fields):
+        """
+        Returns shallow copy of the node with new values of the fields, the node itself is not changed
+        """
+        node = self._shallow_copy()
+        for name, value in fields.items():
+            setattr(node, name, value)
+        return node
+
+    def freeze(self):
+        """
+        Calculates and caches structural hashes of the node and of all its sub-nodes.
+        Frozen nodes must not be modified after that, copies of the nodes (clone, copy.deepcopy) are not frozen
+        """
+        nodes = []
+        stack = [self]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, ASTNode):
+                if item._hash is not None:
+                    continue
+                nodes.append(item)
+                stack.extend(getattr(item, name, None) for name in item._eq_fields)
+            elif type(item) in (list, tuple):
+                stack.extend(item)
+            elif type(item) is dict:
+                stack.extend(item.values())
+        # children first: their hashes are used for the parents
+        for node in reversed(nodes):
+            # cached hash doesn't change the node: interned leaves can be frozen too
+            object.__setattr__(node, '_hash', structural_hash(node))
+        return self
+
+    @property
+    def frozen(self):
+        return self._hash is not None
+
+    def _scalar_value(self):
+        # in lists of values the node is equal to the scalar value if it returns the value (plain Constant)
+        return _missing
+
     def maybe_add_alias(self, some_str, alias=True):
         if self.alias and alias:
             return f'{some_str} AS {self.alias.to_string(alias=False)}'
@@ -34,19 +380,28 @@ class ASTNode:
         return self.maybe_add_alias(self.maybe_add_parentheses(self.get_string()), alias=alias)
 
     def copy(self):
-        return copy.deepcopy(self)
+        return self.clone()
 
     def __str__(self):
         return self.to_string()
 
     def __eq__(self, other):
+        if self is other:
+            return True
         if isinstance(other, ASTNode):
-            return self.to_tree() == other.to_tree() and to_single_line(str(self)) == to_single_line(str(other))
-        else:
-            return False
+            return structural_equal(self, other)
+        return False
+
+    def __hash__(self):
+        if self._hash is not None:
+            return self._hash
+        return structural_hash(self)
 
     def __repr__(self):
         sql = self.to_string().replace('\n', ' ')
         if len(sql) > 500:
             sql = sql[:500] + '...'
         return f'{self.__class__.__name__}:<{sql}>'
+
+
+_init_fields(ASTNode)
@@ -31,6 +31,8 @@ class TableColumn():
 
 
 class CreateTable(ASTNode):
+    __slots__ = ('name', 'is_replace', 'from_select', 'columns', 'if_not_exists')
+
     def __init__(self,
                  name,
                  from_select=None,
@@ -2,10 +2,19 @@ from mindsdb_sql.parser.ast.base import ASTNode
 from mindsdb_sql.parser.utils import indent
 from mindsdb_sql.parser.ast.create import TableColumn
 from mindsdb_sql.parser.ast.select.identifier import Identifier
-from mindsdb_sql.parser.ast.select.constant import Constant
+from mindsdb_sql.parser.ast.select.constant import Constant, NullConstant, is_plain_constant
+
 
 class Insert(ASTNode):
 
+    __slots__ = ('table', 'values', 'from_select', 'is_plain', 'columns')
+
+    # is_plain only shows how values are stored
+    _non_structural = ASTNode._non_structural + ('is_plain',)
+
+    # plain rows contain values instead of constants
+    _eq_scalar_fields = ('values',)
+
     def __init__(self,
                  table,
                  columns=None,
@@ -43,7 +52,10 @@ class Insert(ASTNode):
     def to_value(self, val):
         if isinstance(val, ASTNode) :
             return val.to_string()
-        return repr(val)
+        # plain value
+        if val is None:
+            return NullConstant().to_string()
+        return Constant(val).to_string()
 
     def to_tree(self, *args, level=0, **kwargs):
         ind = indent(level)
@@ -98,3 +110,28 @@ class Insert(ASTNode):
             from_select_str = ''
 
         return f'INSERT INTO {str(self.table)}{columns_str} {values_str}{from_select_str}'
+
+
+class InsertValues:
+    """
+    Rows of INSERT VALUES collected by parser.
+    While all values are plain constants, rows are kept as lists of python values (like in Insert with is_plain)
+    """
+
+    def __init__(self):
+        self.rows = []
+        self.is_plain = True
+
+    def add_row(self, row):
+        if self.is_plain:
+            if all(is_plain_constant(value, null=True) for value in row):
+                self.rows.append([value.value for value in row])
+                return
+
+            # not plain anymore: restore constants in previous rows
+            self.rows = [
+                [NullConstant() if value is None else Constant(value) for value in row2]
+                for row2 in self.rows
+            ]
+            self.is_plain = False
+        self.rows.append(row)
@@ -6,7 +6,7 @@ from .star import Star
 from .identifier import Identifier
 from .join import Join
 from .type_cast import TypeCast
-from .tuple import Tuple
+from .tuple import Tuple, ConstantList, make_tuple
 from .operation import (Operation, BinaryOperation, UnaryOperation, BetweenOperation,
                         Function, WindowFunction, Object, Interval, Exists, NotExists)
 from .order_by import OrderBy
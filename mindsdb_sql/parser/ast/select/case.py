@@ -4,6 +4,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class Case(ASTNode):
+    __slots__ = ('rules', 'default')
+
     def __init__(self, rules, default=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -3,6 +3,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class CommonTableExpression(ASTNode):
+    __slots__ = ('name', 'columns', 'query')
+
     def __init__(self, name, query, columns=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.name = name
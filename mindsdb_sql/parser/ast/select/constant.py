@@ -1,9 +1,30 @@
 import datetime as dt
-from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast.base import ASTNode, leaf_setattr
 from mindsdb_sql.parser.utils import indent
 
 
+def value_to_string(value, with_quotes=True):
+    if isinstance(value, str) and with_quotes:
+        val = value.replace("'", "\\'")
+        out_str = f"\'{val}\'"
+    elif isinstance(value, bool):
+        out_str = 'TRUE' if value else 'FALSE'
+    elif isinstance(value, (dt.date, dt.datetime, dt.timedelta)):
+        out_str = "'{}'".format(str(value).replace("'", "''"))
+    else:
+        out_str = str(value)
+    return out_str
+
+
 class Constant(ASTNode):
+    # __weakref__: constants can be interned (see parser.intern)
+    __slots__ = ('value', 'with_quotes', '__weakref__')
+
+    _shareable = True
+
+    # interned node can't be changed
+    __setattr__ = leaf_setattr
+
     def __init__(self, value, with_quotes=True, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.value = value
@@ -14,19 +35,18 @@ class Constant(ASTNode):
         return indent(level) + f'Constant(value={repr(self.value)}{alias_str})'
 
     def get_string(self, *args, **kwargs):
-        if isinstance(self.value, str) and self.with_quotes:
-            val = self.value.replace("'", "\\'")
-            out_str = f"\'{val}\'"
-        elif isinstance(self.value, bool):
-            out_str = 'TRUE' if self.value else 'FALSE'
-        elif isinstance(self.value, (dt.date, dt.datetime, dt.timedelta)):
-            out_str = "'{}'".format(str(self.value).replace("'", "''"))
-        else:
-            out_str = str(self.value)
-        return out_str
+        return value_to_string(self.value, self.with_quotes)
+
+    def _scalar_value(self):
+        # plain constant is equal to its value in the lists of values (items of ConstantList, rows of Insert)
+        if is_plain_constant(self, null=True):
+            return self.value
+        return super()._scalar_value()
 
 
 class NullConstant(Constant):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(value=None, *args, **kwargs)
 
@@ -37,7 +57,24 @@ class NullConstant(Constant):
         return 'NULL'
 
 
+def is_plain_constant(node, null=False):
+    """
+    Constant which can be stored as its value in lists of values (ConstantList, rows of plain Insert):
+    without alias and parentheses, with quotes.
+    :param null: NullConstant is also plain (it is restored from None)
+    """
+    node_type = type(node)
+    return (
+        (node_type is Constant or null and node_type is NullConstant)
+        and node.alias is None
+        and not node.parentheses
+        and node.with_quotes
+    )
+
+
 class Last(Constant):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         self.value = 'last'
         super().__init__(self.value)
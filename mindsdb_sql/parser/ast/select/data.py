@@ -6,6 +6,8 @@ from mindsdb_sql.parser.utils import indent
 
 class Data(ASTNode):
 
+    __slots__ = ('data',)
+
     def __init__(self, data: List[dict], *args, **kwargs):
         super().__init__(*args, **kwargs)
 
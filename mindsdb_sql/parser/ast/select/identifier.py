@@ -1,7 +1,7 @@
 import re
 from copy import copy, deepcopy
 
-from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast.base import ASTNode, leaf_setattr
 from mindsdb_sql.parser.utils import indent
 from mindsdb_sql.parser.ast.select import Star
 
@@ -35,6 +35,17 @@ def get_reserved_words():
 
 
 class Identifier(ASTNode):
+    # sub_select: select which is replaced by the identifier, is set by planner
+    # __weakref__: identifiers can be interned (see parser.intern)
+    __slots__ = ('parts', 'sub_select', '__weakref__')
+
+    _defaults = dict(ASTNode._defaults, sub_select=None)
+
+    _non_structural = ASTNode._non_structural + ('sub_select',)
+
+    # interned node can't be changed
+    __setattr__ = leaf_setattr
+
     def __init__(self, path_str=None, parts=None, *args, **kwargs):
         super().__init__(*args, **kwargs)
         assert path_str or parts, "Either path_str or parts must be provided for an Identifier"
@@ -46,6 +57,7 @@ class Identifier(ASTNode):
             parts = path_str_to_parts(path_str)
         assert isinstance(parts, list)
         self.parts = parts
+        self.sub_select = None
 
     @classmethod
     def from_path_str(self, value, *args, **kwargs):
@@ -80,7 +92,7 @@ class Identifier(ASTNode):
         identifier = Identifier(parts=copy(self.parts))
         identifier.alias = deepcopy(self.alias)
         identifier.parentheses = self.parentheses
-        if hasattr(self, 'sub_select'):
+        if self.sub_select is not None:
             identifier.sub_select = deepcopy(self.sub_select)
         return identifier
 
@@ -88,6 +100,6 @@ class Identifier(ASTNode):
         identifier = Identifier(parts=copy(self.parts))
         identifier.alias = deepcopy(self.alias)
         identifier.parentheses = self.parentheses
-        if hasattr(self, 'sub_select'):
+        if self.sub_select is not None:
             identifier.sub_select = deepcopy(self.sub_select)
         return identifier
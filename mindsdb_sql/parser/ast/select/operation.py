@@ -1,14 +1,25 @@
-from mindsdb_sql.parser.ast.base import ASTNode
+import copy
+
+from mindsdb_sql.parser.ast.base import ASTNode, clone_value
 from mindsdb_sql.exceptions import ParsingException
 from mindsdb_sql.parser.utils import indent
 
 
 class Operation(ASTNode):
+    # _orig_node: operation from which the node was copied, is set by planner
+    __slots__ = ('op', 'args', '_orig_node')
+
+    _defaults = dict(ASTNode._defaults, _orig_node=None)
+
+    _non_structural = ASTNode._non_structural + ('_orig_node',)
+    _clone_shared = ASTNode._clone_shared + ('_orig_node',)
+
     def __init__(self, op, args, *args_, **kwargs):
         super().__init__(*args_, **kwargs)
 
         self.op = ' '.join(op.lower().split())
         self.args = list(args)
+        self._orig_node = None
         self.assert_arguments()
 
     def assert_arguments(self):
@@ -31,6 +42,8 @@ class Operation(ASTNode):
 
 
 class BetweenOperation(Operation):
+    __slots__ = ()
+
     def __init__(self, *args, **kwargs):
         super().__init__(op='between', *args, **kwargs)
 
@@ -39,17 +52,135 @@ class BetweenOperation(Operation):
         return f'{arg_strs[0]} BETWEEN {arg_strs[1]} AND {arg_strs[2]}'
 
 
+def _restore_binary_operations(kinds, items):
+    """
+    Builds nested binary operations from postfix list of BinaryOperation._to_postfix
+    """
+    stack = []
+    for kind, item in zip(kinds, items):
+        if kind:
+            cls, state = item
+            node = cls.__new__(cls)
+            node.__setstate__(state)
+            right = stack.pop()
+            node.args = [stack.pop(), right]
+            item = node
+        stack.append(item)
+    return stack[0]
+
+
 class BinaryOperation(Operation):
+    """
+    Long generated conditions (a = 1 OR a = 2 OR ...) are deep trees of binary operations:
+    rendering, copying and serialization of nested binary operations don't use recursion
+    """
+
+    __slots__ = ()
+
     def get_string(self, *args, **kwargs):
-        arg_strs = []
-        for arg in self.args:
-            arg_str = arg.to_string()
-            # if isinstance(arg, BinaryOperation) or isinstance(arg, BetweenOperation):
-            #     # to parens
-            #     arg_str = f'({arg_str})'
-            arg_strs.append(arg_str)
+        # nested operations without parentheses and alias are rendered in place
+        parts = []
+        stack = [(False, self)]
+        while stack:
+            is_text, item = stack.pop()
+            if is_text:
+                parts.append(item)
+            elif item is self or (type(item) is BinaryOperation and not item.parentheses and not item.alias):
+                stack.append((False, item.args[1]))
+                stack.append((True, f' {item.op.upper()} '))
+                stack.append((False, item.args[0]))
+            else:
+                parts.append(item.to_string())
+        return ''.join(parts)
 
-        return f'{arg_strs[0]} {self.op.upper()} {arg_strs[1]}'
+    def to_tree(self, *args, level=0, **kwargs):
+        parts = []
+        stack = [(False, self, level)]
+        while stack:
+            is_text, item, level = stack.pop()
+            if is_text:
+                parts.append(item)
+            elif item is self or type(item) is BinaryOperation:
+                ind = indent(level)
+                ind1 = indent(level + 1)
+                stack.append((True, f'\n{ind1})\n{ind})', None))
+                for i in range(len(item.args) - 1, -1, -1):
+                    stack.append((False, item.args[i], level + 2))
+                    if i > 0:
+                        stack.append((True, ',\n', None))
+                stack.append((True, f'{ind}{item.__class__.__name__}(op={repr(item.op)},\n{ind1}args=(\n', None))
+            else:
+                parts.append(item.to_tree(level=level))
+        return ''.join(parts)
+
+    def get_operands(self):
+        """
+        Returns operands of the chain of nested operations with the same operator (and alias is not set),
+        from left to right: for a AND (b AND c) it is [a, b, c]
+        """
+        operands = []
+        stack = [self.args[1], self.args[0]]
+        while stack:
+            item = stack.pop()
+            if type(item) is BinaryOperation and item.op == self.op and not item.alias:
+                stack.append(item.args[1])
+                stack.append(item.args[0])
+            else:
+                operands.append(item)
+        return operands
+
+    def _to_postfix(self):
+        # nested binary operations in postfix order: kinds - 1 for operation, 0 for other node
+        kinds = bytearray()
+        items = []
+        stack = [(self, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                kinds.append(1)
+                state = node.__getstate__()
+                del state['args']
+                items.append((type(node), state))
+            elif isinstance(node, BinaryOperation):
+                stack.append((node, True))
+                stack.append((node.args[1], False))
+                stack.append((node.args[0], False))
+            else:
+                kinds.append(0)
+                items.append(node)
+        return bytes(kinds), items
+
+    def __reduce_ex__(self, protocol):
+        return _restore_binary_operations, self._to_postfix()
+
+    def __copy__(self):
+        node = self.__class__.__new__(self.__class__)
+        node.__setstate__(self.__getstate__())
+        return node
+
+    def __deepcopy__(self, memo):
+        kinds, items = self._to_postfix()
+        items = [
+            (item[0], copy.deepcopy(item[1], memo)) if kind else copy.deepcopy(item, memo)
+            for kind, item in zip(kinds, items)
+        ]
+        return _restore_binary_operations(kinds, items)
+
+    def clone(self, share_leaves=False):
+        if not isinstance(self.args[0], BinaryOperation) and not isinstance(self.args[1], BinaryOperation):
+            return self._clone_fields(share_leaves)
+
+        # nested operations are copied without recursion
+        kinds, items = self._to_postfix()
+        shared = self._clone_shared
+        items = [
+            (item[0], {
+                name: value if name in shared else clone_value(value, share_leaves)
+                for name, value in item[1].items()
+            }) if kind else clone_value(item, share_leaves)
+            for kind, item in zip(kinds, items)
+        ]
+        return _restore_binary_operations(kinds, items)
 
     def assert_arguments(self):
         if len(self.args) != 2:
@@ -57,6 +188,8 @@ class BinaryOperation(Operation):
 
 
 class UnaryOperation(Operation):
+    __slots__ = ()
+
     def get_string(self, *args, **kwargs):
         return f'{self.op} {self.args[0].to_string()}'
 
@@ -66,6 +199,8 @@ class UnaryOperation(Operation):
 
 
 class Function(Operation):
+    __slots__ = ('distinct', 'from_arg', 'namespace')
+
     def __init__(self, *args, distinct=False, from_arg=None, namespace=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.distinct = distinct
@@ -98,6 +233,8 @@ class Function(Operation):
 
 
 class WindowFunction(ASTNode):
+    __slots__ = ('function', 'partition', 'order_by')
+
     def __init__(self, function, partition=None, order_by=None, alias=None):
         super().__init__()
         self.function = function
@@ -147,6 +284,8 @@ class WindowFunction(ASTNode):
 
 
 class Object(ASTNode):
+    __slots__ = ('type', 'params')
+
     def __init__(self, type, params=None, **kwargs):
         super().__init__(**kwargs)
 
@@ -172,6 +311,7 @@ class Object(ASTNode):
 
 
 class Interval(Operation):
+    __slots__ = ()
 
     def __init__(self, info):
         super().__init__(op='interval', args=[info, ])
@@ -188,12 +328,16 @@ class Interval(Operation):
 
 
 class Exists(Operation):
+    __slots__ = ('query',)
+
     def __init__(self, query):
         self.query = query
         super().__init__(op='exists', args=[query])
 
 
 class NotExists(Operation):
+    __slots__ = ('query',)
+
     def __init__(self, query):
         self.query = query
         super().__init__(op='not exists', args=[query])
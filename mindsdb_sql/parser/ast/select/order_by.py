@@ -3,6 +3,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class OrderBy(ASTNode):
+    __slots__ = ('field', 'direction', 'nulls')
+
     def __init__(self, field, direction='default', nulls='default', *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.field = field
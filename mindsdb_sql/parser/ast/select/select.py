@@ -5,6 +5,11 @@ from mindsdb_sql.parser.ast.select.operation import Object
 
 class Select(ASTNode):
 
+    __slots__ = (
+        'targets', 'distinct', 'from_table', 'where', 'group_by', 'having', 'order_by', 'limit', 'offset',
+        'cte', 'mode', 'modifiers', 'using',
+    )
+
     def __init__(self,
                  targets,
                  distinct=False,
@@ -1,8 +1,16 @@
-from mindsdb_sql.parser.ast import ASTNode
+from mindsdb_sql.parser.ast.base import ASTNode, leaf_setattr
 from mindsdb_sql.parser.utils import indent
 
 
 class Star(ASTNode):
+    # __weakref__: star can be interned (see parser.intern)
+    __slots__ = ('__weakref__',)
+
+    _shareable = True
+
+    # interned node can't be changed
+    __setattr__ = leaf_setattr
+
     def __init__(self, *args, **kwargs):
         if 'alias' in kwargs:
             from mindsdb_sql import ParsingException
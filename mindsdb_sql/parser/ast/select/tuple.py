@@ -1,8 +1,16 @@
+import copy
+
 from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.ast.select.constant import Constant, value_to_string, is_plain_constant
 from mindsdb_sql.parser.utils import indent
 
 
 class Tuple(ASTNode):
+    __slots__ = ('items',)
+
+    # items are compared as values: Tuple is equal to ConstantList with the same values
+    _eq_scalar_fields = ('items',)
+
     def __init__(self, items, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.items = items
@@ -19,3 +27,88 @@ class Tuple(ASTNode):
             item_strs.append(str(item))
 
         return f'({", ".join(item_strs)})'
+
+
+class ConstantList(Tuple):
+    """
+    Tuple of constants stored as a plain list of their values, is created by parser for lists of literals
+    like IN (1, 2, ...). Constant nodes for the items are created only when items are requested:
+    until then traversals, copies and render work with values directly
+    """
+
+    # _items: items which were requested or set, values are not used after that
+    __slots__ = ('values', '_items')
+
+    _defaults = dict(Tuple._defaults, _items=None)
+
+    # is equal to Tuple with the same items
+    _eq_class = Tuple
+    _eq_fields = ('alias', 'parentheses', '_eq_items')
+    _eq_scalar_fields = ('_eq_items',)
+
+    def __init__(self, values, *args, **kwargs):
+        ASTNode.__init__(self, *args, **kwargs)
+        self.values = values
+        self._items = None
+
+    @property
+    def items(self):
+        if self._items is None:
+            self._items = [Constant(value) for value in self.values]
+        return self._items
+
+    @items.setter
+    def items(self, items):
+        self._items = items
+
+    @property
+    def _eq_items(self):
+        # values are compared with the items without creating of constants
+        if self._items is None:
+            return self.values
+        return self._items
+
+    def get_values(self):
+        """
+        Returns list of values or None if the items were replaced by something except constants
+        """
+        if self._items is None:
+            return self.values
+        for item in self._items:
+            if not is_plain_constant(item):
+                return None
+        return [item.value for item in self._items]
+
+    def to_tree(self, *args, level=0, **kwargs):
+        if self._items is not None:
+            return super().to_tree(*args, level=level, **kwargs)
+        item_trees = ','.join([f'Constant(value={value!r})' for value in self.values])
+        return indent(level) + f'Tuple(items=({item_trees}))'
+
+    def get_string(self, *args, **kwargs):
+        if self._items is not None:
+            return super().get_string(*args, **kwargs)
+        return f'({", ".join([value_to_string(value) for value in self.values])})'
+
+    def __deepcopy__(self, memo):
+        node = self.__class__.__new__(self.__class__)
+        memo[id(self)] = node
+        state = self.__getstate__()
+        for key, value in state.items():
+            if key == 'values':
+                # values are immutable: numbers, strings and booleans
+                state[key] = list(value)
+            else:
+                state[key] = copy.deepcopy(value, memo)
+        node.__setstate__(state)
+        return node
+
+
+def make_tuple(items):
+    """
+    Returns ConstantList if all items are plain constants, otherwise Tuple
+    """
+    for item in items:
+        if not is_plain_constant(item):
+            return Tuple(items=items)
+    return ConstantList([item.value for item in items])
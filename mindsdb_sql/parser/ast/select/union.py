@@ -4,6 +4,8 @@ from mindsdb_sql.parser.utils import indent
 
 class Union(ASTNode):
 
+    __slots__ = ('left', 'right', 'unique')
+
     def __init__(self,
                  left,
                  right,
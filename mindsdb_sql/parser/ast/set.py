@@ -4,6 +4,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class Set(ASTNode):
+    __slots__ = ('category', 'name', 'value', 'params', 'scope', 'set_list')
+
     def __init__(self,
                  category=None,
                  name=None,
@@ -0,0 +1,51 @@
+"""
+Generates python modules with LR tables of the parsers.
+
+Parsers load the tables from these modules at import time instead of building them
+(if the grammar wasn't changed after generation). It is done during build of the package:
+
+    python -m mindsdb_sql.parser.build_tables [--output-dir build/lib]
+
+By default modules are written into the source tree.
+"""
+import argparse
+import os
+
+from sly.yacc import lrtable_to_data, write_lrtable_module
+
+import mindsdb_sql
+
+
+def get_parsers():
+    from mindsdb_sql.parser.parser import SQLParser
+    from mindsdb_sql.parser.dialects.mysql.parser import MySQLParser
+    from mindsdb_sql.parser.dialects.mindsdb.parser import MindsDBParser
+
+    return [SQLParser, MySQLParser, MindsDBParser]
+
+
+def build_tables(output_dir=None):
+    if output_dir is None:
+        # directory which contains mindsdb_sql package
+        output_dir = os.path.dirname(os.path.dirname(os.path.abspath(mindsdb_sql.__file__)))
+
+    filenames = []
+    for parser_cls in get_parsers():
+        filename = os.path.join(output_dir, *parser_cls.tablesmodule.split('.')) + '.py'
+        write_lrtable_module(
+            filename,
+            name=f'{parser_cls.__module__}.{parser_cls.__qualname__}',
+            signature=parser_cls._signature,
+            data=lrtable_to_data(parser_cls._lrtable)
+        )
+        filenames.append(filename)
+    return filenames
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Generate LR tables modules of the parsers')
+    arg_parser.add_argument('--output-dir', help='Root directory of the package, source tree by default')
+    args = arg_parser.parse_args()
+
+    for filename in build_tables(args.output_dir):
+        print(f'written {filename}')
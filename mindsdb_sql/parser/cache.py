@@ -0,0 +1,113 @@
+import pickle
+import threading
+from collections import OrderedDict
+
+
+class ParseCache:
+    """
+    LRU cache of parsed queries, keyed by dialect and text of the query.
+
+    ASTs are stored serialized: every hit returns a new tree and callers are free to modify it.
+    Size of serialized AST is also used to limit memory of the cache.
+
+    In shared mode ASTs are stored frozen and every hit returns the same tree without copying.
+    The tree must not be modified (the planner doesn't modify queries), use clone() to get a changeable copy.
+
+    :param max_size: max count of queries in cache
+    :param max_memory: max total size (in bytes) of stored queries and ASTs, None - without limit
+    :param shared: return cached ASTs without copying
+    """
+
+    def __init__(self, max_size=1000, max_memory=None, shared=False):
+        self.max_size = max_size
+        self.max_memory = max_memory
+        self.shared = shared
+
+        self._items = OrderedDict()  # (dialect, sql): (size, serialized ast or frozen ast in shared mode)
+        self._memory = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, sql, dialect):
+        """
+        Returns copy of cached AST (cached AST itself in shared mode) or None if query isn't in cache
+        """
+        key = (dialect, sql)
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        if self.shared:
+            return item[1]
+        return pickle.loads(item[1])
+
+    def put(self, sql, dialect, ast):
+        key = (dialect, sql)
+        data = pickle.dumps(ast, protocol=pickle.HIGHEST_PROTOCOL)
+        # size of serialized AST is used in shared mode too
+        size = len(sql) + len(data)
+        if self.shared:
+            data = ast.freeze()
+
+        if self.max_memory is not None and size > self.max_memory:
+            # is not fit into cache at all
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._memory -= old[0]
+
+            self._items[key] = (size, data)
+            self._memory += size
+
+            while (
+                len(self._items) > self.max_size
+                or (self.max_memory is not None and self._memory > self.max_memory)
+            ):
+                _, item = self._items.popitem(last=False)
+                self._memory -= item[0]
+                self.evictions += 1
+
+    def invalidate(self, sql=None, dialect=None):
+        """
+        Removes queries from cache:
+        - sql and dialect are set: one query
+        - only sql or dialect is set: all queries with this text or dialect
+        - nothing is set: all queries
+        """
+        with self._lock:
+            if sql is not None and dialect is not None:
+                keys = [(dialect, sql)]
+            else:
+                keys = [
+                    key for key in self._items
+                    if (dialect is None or key[0] == dialect)
+                    and (sql is None or key[1] == sql)
+                ]
+            for key in keys:
+                item = self._items.pop(key, None)
+                if item is not None:
+                    self._memory -= item[0]
+
+    def clear(self):
+        self.invalidate()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'memory': self._memory,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def __len__(self):
+        return len(self._items)
@@ -7,6 +7,8 @@ class CreateAgent(ASTNode):
     Node for creating a new agent
     """
 
+    __slots__ = ('name', 'model', 'params', 'if_not_exists')
+
     def __init__(self, name, model, params, if_not_exists=False, *args, **kwargs):
         """
         Parameters:
@@ -44,6 +46,8 @@ class UpdateAgent(ASTNode):
     Node for updating an agent
     """
 
+    __slots__ = ('name', 'params')
+
     def __init__(self, name, updated_params, *args, **kwargs):
         """
         Parameters:
@@ -74,6 +78,8 @@ class DropAgent(ASTNode):
     Node for dropping an agent
     """
 
+    __slots__ = ('name', 'if_exists')
+
     def __init__(self, name, if_exists=False, *args, **kwargs):
         """
         Parameters:
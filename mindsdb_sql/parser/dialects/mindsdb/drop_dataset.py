@@ -3,6 +3,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class DropDataset(Drop):
+    __slots__ = ('name', 'if_exists')
+
     def __init__(self,
                  name,
                  if_exists=False,
@@ -0,0 +1,426 @@
+from mindsdb_sql.parser.ast import (
+    Select, Identifier, Star, Constant, NullConstant, Parameter, Function, BinaryOperation, UnaryOperation,
+    Operation, OrderBy, Join, make_tuple
+)
+from mindsdb_sql.parser.utils import JoinType
+
+"""
+Hand-written parser of the most used subset of SELECT for tokens of MindsDBLexer:
+
+    SELECT [DISTINCT] columns [FROM tables [JOIN table [ON expr]]...] [WHERE expr] [GROUP BY exprs] [HAVING expr]
+      [ORDER BY terms] [LIMIT int [, int]] [OFFSET int]
+
+Expressions are parsed by precedence climbing with the same precedence of operators as in MindsDBParser.
+It produces the same AST as MindsDBParser. Anything outside of the subset (including syntax errors)
+is not parsed: the query is passed to MindsDBParser.
+"""
+
+
+class _Unsupported(Exception):
+    pass
+
+
+# keywords which are names (the 'id' rule of MindsDBParser) and have no other meaning in the subset
+NAME_TOKENS = frozenset([
+    'ID',
+    'AGENT', 'BEGIN', 'BINARY', 'CHANNEL', 'CHARSET', 'CODE', 'COLLATION', 'COLUMNS', 'COMMIT', 'COMMITTED',
+    'DATASET', 'DATASETS', 'DATABASES', 'DATASOURCE', 'DATASOURCES', 'DEFAULT', 'ENGINE', 'EXTENDED', 'FIELDS',
+    'FUNCTION', 'GLOBAL', 'HANDLERS', 'HORIZON', 'HOSTS', 'INDEX', 'INDEXES', 'INTEGRATION', 'INTEGRATIONS',
+    'ISOLATION', 'KEYS', 'KNOWLEDGE_BASES', 'LEVEL', 'LOGS', 'MASTER', 'ML_ENGINES', 'MODEL', 'MODELS', 'MUTEX',
+    'ONLY', 'OPEN', 'PARAMETERS', 'PERSIST', 'PREDICT', 'PREDICTOR', 'PREDICTORS', 'PRIVILEGES', 'PROCEDURE',
+    'PROCESSLIST', 'PROFILES', 'PUBLICATION', 'PUBLICATIONS', 'REPEATABLE', 'REPLACE', 'REPLICA', 'REPLICAS',
+    'RETRAIN', 'ROLLBACK', 'SCHEMA', 'SCHEMAS', 'SERIALIZABLE', 'SESSION', 'SLAVE', 'START', 'STATUS', 'STORAGE',
+    'STREAM', 'STREAMS', 'TABLE', 'TABLES', 'TRAIN', 'TRANSACTION', 'TRIGGERS', 'UNCOMMITTED', 'VARIABLES',
+    'VIEW', 'VIEWS', 'WARNINGS',
+])
+
+# after the dot all keywords of the 'id' rule are names
+PART_NAME_TOKENS = NAME_TOKENS | {
+    'ALL', 'CAST', 'CREATE', 'DATABASE', 'DATE', 'ENGINES', 'INTERVAL', 'LAST', 'LATEST', 'OFFSET', 'PLUGINS',
+}
+
+# precedence of binary operators, the same as in MindsDBParser
+BINARY_LEVELS = {
+    'OR': 1,
+    'AND': 2,
+    # 3: unary NOT
+    'EQUALS': 4, 'NEQUALS': 4,
+    'LESS': 5, 'LEQ': 5, 'GREATER': 5, 'GEQ': 5, 'IN': 5, 'NOT_IN': 5, 'IS': 5, 'IS_NOT': 5,
+    'LIKE': 5, 'NOT_LIKE': 5,
+    'PLUS': 7, 'MINUS': 7,
+    'STAR': 8, 'DIVIDE': 8,
+    # 9: unary minus
+}
+UNOT_LEVEL = 3
+UMINUS_LEVEL = 9
+
+# not associative operators: a < b < c is an error
+NONASSOC_LEVEL = 5
+
+JOIN_CLAUSES = {
+    ('JOIN',),
+    ('LEFT', 'JOIN'),
+    ('RIGHT', 'JOIN'),
+    ('INNER', 'JOIN'),
+    ('FULL', 'JOIN'),
+    ('CROSS', 'JOIN'),
+    ('OUTER', 'JOIN'),
+    ('LEFT', 'OUTER', 'JOIN'),
+    ('FULL', 'OUTER', 'JOIN'),
+}
+JOIN_START_TOKENS = frozenset(clause[0] for clause in JOIN_CLAUSES)
+
+# nesting of expressions (parentheses, functions, unary operators) parsed by recursion,
+#   more deeply nested expressions are passed to MindsDBParser: it doesn't use recursion
+MAX_EXPR_DEPTH = 100
+
+
+class _SelectParser:
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        # types of the tokens, None after the end
+        self.types = [token.type for token in tokens]
+        self.types.append(None)
+        self.pos = 0
+        # depth of nested calls of expr
+        self.depth = 0
+
+    def next_type(self):
+        return self.types[self.pos]
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, token_type):
+        if self.types[self.pos] != token_type:
+            raise _Unsupported
+        return self.take()
+
+    def parse(self):
+        self.expect('SELECT')
+        if self.next_type() == 'DISTINCT':
+            self.pos += 1
+            select = Select(targets=self.result_columns(), distinct=True)
+        else:
+            select = Select(targets=self.result_columns())
+
+        if self.next_type() == 'FROM':
+            self.pos += 1
+            select.from_table = self.from_tables()
+
+        if self.next_type() == 'WHERE':
+            self.pos += 1
+            select.where = self.condition(select)
+
+        if self.next_type() == 'GROUP_BY':
+            self.pos += 1
+            select.group_by = self.expr_list(select)
+
+        if self.next_type() == 'HAVING':
+            self.pos += 1
+            # it doesn't require FROM
+            select.having = self.condition()
+
+        if self.next_type() == 'ORDER_BY':
+            self.pos += 1
+            if select.from_table is None:
+                raise _Unsupported
+            select.order_by = self.ordering_terms()
+
+        if self.next_type() == 'LIMIT':
+            self.pos += 1
+            limit = self.integer_constant()
+            if self.next_type() == 'COMMA':
+                self.pos += 1
+                select.offset = limit
+                limit = self.integer_constant()
+            select.limit = limit
+
+        if self.next_type() == 'OFFSET':
+            self.pos += 1
+            if select.offset is not None:
+                raise _Unsupported
+            select.offset = self.integer_constant()
+
+        if self.next_type() is not None:
+            raise _Unsupported
+        return select
+
+    # -- clauses --
+
+    def result_columns(self):
+        columns = [self.result_column()]
+        while self.next_type() == 'COMMA':
+            self.pos += 1
+            columns.append(self.result_column())
+        return columns
+
+    def result_column(self):
+        if self.next_type() == 'STAR':
+            self.pos += 1
+            column = Star()
+        else:
+            column = self.expr(0)
+
+        token_type = self.next_type()
+        if token_type == 'AS':
+            self.pos += 1
+            token_type = self.next_type()
+            if token_type == 'QUOTE_STRING':
+                column.alias = Identifier(self.take().value.strip('\''))
+            else:
+                column.alias = self.alias()
+        elif token_type == 'ID':
+            column.alias = self.alias()
+        elif token_type == 'QUOTE_STRING':
+            column.alias = Identifier(self.take().value.strip('\''))
+        return column
+
+    def alias(self):
+        if self.next_type() not in NAME_TOKENS:
+            raise _Unsupported
+        alias = Identifier.from_path_str(self.take().value)
+        if self.next_type() == 'DOT':
+            raise _Unsupported
+        return alias
+
+    def from_tables(self):
+        table = self.from_table()
+        token_type = self.next_type()
+        if token_type == 'COMMA':
+            while self.next_type() == 'COMMA':
+                self.pos += 1
+                table = Join(left=table, right=self.from_table(), join_type=JoinType.INNER_JOIN, implicit=True)
+            if self.next_type() in JOIN_START_TOKENS:
+                # implicit and explicit joins can't be mixed
+                raise _Unsupported
+
+        while self.next_type() in JOIN_START_TOKENS:
+            words = []
+            while self.next_type() in ('LEFT', 'RIGHT', 'INNER', 'FULL', 'CROSS', 'OUTER', 'JOIN'):
+                words.append(self.take())
+                if words[-1].type == 'JOIN':
+                    break
+            if tuple(token.type for token in words) not in JOIN_CLAUSES:
+                raise _Unsupported
+            join_type = ' '.join([token.value for token in words])
+
+            right = self.from_table()
+            if self.next_type() == 'ON':
+                self.pos += 1
+                table = Join(left=table, right=right, join_type=join_type, condition=self.expr(0))
+            else:
+                table = Join(left=table, right=right, join_type=join_type)
+            if self.next_type() == 'COMMA':
+                raise _Unsupported
+        return table
+
+    def from_table(self):
+        table = self.identifier()
+        token_type = self.next_type()
+        if token_type == 'LPAREN' or isinstance(table.parts[-1], Star):
+            # native query
+            raise _Unsupported
+        if token_type == 'AS':
+            self.pos += 1
+            table.alias = self.alias()
+        elif token_type == 'ID':
+            table.alias = self.alias()
+        return table
+
+    def condition(self, select=None):
+        if select is not None and select.from_table is None:
+            raise _Unsupported
+        node = self.expr(0)
+        if not isinstance(node, Operation):
+            raise _Unsupported
+        return node
+
+    def ordering_terms(self):
+        terms = []
+        while True:
+            term = OrderBy(field=self.expr(0), direction='default')
+            while True:
+                token_type = self.next_type()
+                if token_type == 'DESC' or token_type == 'ASC':
+                    self.pos += 1
+                    term.direction = token_type
+                elif token_type == 'NULLS_FIRST' or token_type == 'NULLS_LAST':
+                    term.nulls = self.take().value
+                else:
+                    break
+            terms.append(term)
+            if self.next_type() != 'COMMA':
+                return terms
+            self.pos += 1
+
+    def integer_constant(self):
+        return Constant(value=int(self.expect('INTEGER').value))
+
+    # -- expressions --
+
+    def expr_list(self, select=None):
+        if select is not None and select.from_table is None:
+            raise _Unsupported
+        items = [self.expr(0)]
+        while self.next_type() == 'COMMA':
+            self.pos += 1
+            items.append(self.expr(0))
+        return items
+
+    def expr(self, min_level):
+        if self.depth >= MAX_EXPR_DEPTH:
+            raise _Unsupported
+        self.depth += 1
+        left = self.prefix()
+        nonassoc = False
+        while True:
+            token_type = self.types[self.pos]
+            level = BINARY_LEVELS.get(token_type)
+            if level is None or level < min_level:
+                self.depth -= 1
+                return left
+            if nonassoc and level == NONASSOC_LEVEL:
+                raise _Unsupported
+            op = self.take().value
+            # operators are left associative
+            right = self.expr(level + 1)
+            left = BinaryOperation(op=op, args=(left, right))
+            nonassoc = level == NONASSOC_LEVEL
+
+    def prefix(self):
+        token_type = self.types[self.pos]
+
+        if token_type in NAME_TOKENS:
+            node = self.identifier()
+            if self.next_type() == 'LPAREN':
+                return self.function(node)
+            return node
+
+        if token_type == 'INTEGER':
+            return Constant(value=int(self.take().value))
+        if token_type == 'QUOTE_STRING':
+            return Constant(value=str(self.take().value.strip('\'')))
+        if token_type == 'FLOAT':
+            return Constant(value=float(self.take().value))
+        if token_type == 'NULL':
+            self.pos += 1
+            return NullConstant()
+        if token_type == 'TRUE' or token_type == 'FALSE':
+            self.pos += 1
+            return Constant(value=token_type == 'TRUE')
+        if token_type == 'PARAMETER':
+            return Parameter(value=self.take().value)
+
+        if token_type == 'LPAREN':
+            self.pos += 1
+            if self.next_type() == 'SELECT':
+                raise _Unsupported
+            node = self.expr(0)
+            if self.next_type() == 'COMMA':
+                items = [node]
+                while self.next_type() == 'COMMA':
+                    self.pos += 1
+                    items.append(self.expr(0))
+                self.expect('RPAREN')
+                return make_tuple(items)
+            self.expect('RPAREN')
+            node.parentheses = True
+            return node
+
+        if token_type == 'MINUS':
+            # minus before number is the part of the constant: - - 1 is Constant(1)
+            end = self.pos
+            while self.types[end] == 'MINUS':
+                end += 1
+            if self.types[end] in ('INTEGER', 'FLOAT'):
+                node = self.tokens[end]
+                value = int(node.value) if self.types[end] == 'INTEGER' else float(node.value)
+                for _ in range(end - self.pos):
+                    value = -value
+                self.pos = end + 1
+                return Constant(value)
+            if self.types[end] in ('QUOTE_STRING', 'NULL', 'TRUE', 'FALSE'):
+                raise _Unsupported
+            op = self.take().value
+            return UnaryOperation(op=op, args=(self.expr(UMINUS_LEVEL + 1),))
+
+        if token_type == 'NOT':
+            op = self.take().value
+            return UnaryOperation(op=op, args=(self.expr(UNOT_LEVEL + 1),))
+
+        raise _Unsupported
+
+    def identifier(self):
+        if self.types[self.pos] not in NAME_TOKENS:
+            raise _Unsupported
+        node = Identifier.from_path_str(self.take().value)
+        while self.types[self.pos] == 'DOT':
+            self.pos += 1
+            token_type = self.types[self.pos]
+            if token_type in PART_NAME_TOKENS:
+                node.parts += Identifier.from_path_str(self.take().value).parts
+            elif token_type == 'STAR':
+                self.pos += 1
+                node.parts.append(Star())
+                break
+            else:
+                raise _Unsupported
+        return node
+
+    def function(self, identifier):
+        self.pos += 1  # LPAREN
+        token_type = self.next_type()
+        if token_type == 'DISTINCT':
+            self.pos += 1
+            args = self.expr_list()
+            self.expect('RPAREN')
+            return Function(op=identifier.parts[0], distinct=True, args=args)
+
+        if token_type == 'RPAREN':
+            args = []
+        elif token_type == 'STAR':
+            self.pos += 1
+            args = [Star()]
+        else:
+            args = self.expr_list()
+        self.expect('RPAREN')
+
+        namespace = None
+        if len(identifier.parts) > 1:
+            namespace = identifier.parts[0]
+        return Function(op=identifier.parts[-1], args=args, namespace=namespace)
+
+
+def parse_select(tokens):
+    """
+    Parses the query by the fast path
+    :param tokens: list of tokens of MindsDBLexer
+    :return: Select or None if the query is not in the supported subset
+    """
+    if not tokens or tokens[0].type != 'SELECT':
+        return None
+    try:
+        return _SelectParser(tokens).parse()
+    except _Unsupported:
+        return None
+
+
+class FastSelectParser:
+    """
+    Parser of MindsDB dialect which parses simple SELECTs by parse_select
+    and other queries by MindsDBParser
+    """
+
+    def __init__(self, parser):
+        self.parser = parser
+
+    def parse(self, tokens):
+        tokens = list(tokens)
+        ast = parse_select(tokens)
+        if ast is None:
+            ast = self.parser.parse(iter(tokens))
+        return ast
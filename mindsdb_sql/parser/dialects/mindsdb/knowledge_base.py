@@ -6,6 +6,8 @@ class CreateKnowledgeBase(ASTNode):
     """
     Create a new knowledge base
     """
+
+    __slots__ = ('name', 'model', 'storage', 'params', 'if_not_exists', 'from_query')
     def __init__(
         self,
         name,
@@ -83,6 +85,8 @@ class DropKnowledgeBase(ASTNode):
     """
     Delete a knowledge base
     """
+
+    __slots__ = ('name', 'if_exists')
     def __init__(self, name, if_exists=False, *args, **kwargs):
         """
         Args:
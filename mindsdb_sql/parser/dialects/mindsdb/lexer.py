@@ -2,6 +2,8 @@ import re
 from sly import Lexer
 from sly.lex import LexError
 
+from mindsdb_sql.parser.scanners import scan_string, scan_backtick, scan_comment, lex_error
+
 """
 Unfortunately we can't inherit from base SQLLexer, because the order of rules is important.
 If we do, like in MySQL lexer, the new rules like `DATASOURCE = r'\bDATASOURCE\b'` are added to the end of the rule list.
@@ -10,8 +12,23 @@ as a string.
 """
 class MindsDBLexer(Lexer):
     reflags = re.IGNORECASE
-    ignore = ' \t\r'
-    ignore_multi_comment = r'/\*[\s\S]*?\*/'
+    # keywords are found by lookup of the matched word
+    keyword_lookup = True
+    ignore = ' \t\n\r'
+
+    # strings, comments and identifiers in backticks are found by scanners: not closed tokens
+    #   make the regex engine backtrack
+    @_(r'/\*')
+    def ignore_multi_comment(self, t):
+        end = scan_comment(self, t.index)
+        if end is None:
+            # not closed comment: it is division
+            t.type = 'DIVIDE'
+            t.value = '/'
+            self.index = t.index + 1
+            return t
+        self.index = end
+
     ignore_line_comment = r'--[^\n]*'
 
     tokens = {
@@ -305,8 +322,14 @@ class MindsDBLexer(Lexer):
     TRUE = r'\bTRUE\b'
     FALSE = r'\bFALSE\b'
 
-    @_(r'(?:([a-zA-Z_$0-9]*[a-zA-Z_$]+[a-zA-Z_$0-9]*)|(?:`([^`]+)`))')
+    @_(r'[a-zA-Z_$0-9]*[a-zA-Z_$]+[a-zA-Z_$0-9]*', r'`')
     def ID(self, t):
+        if t.value == '`':
+            end = scan_backtick(self, t.index)
+            if end is None:
+                return lex_error(self, t)
+            t.value = self.text[t.index:end]
+            self.index = end
         return t
 
     @_(r'\d+\.\d+')
@@ -317,20 +340,24 @@ class MindsDBLexer(Lexer):
     def INTEGER(self, t):
         return t
 
-    @_(r"'(?:\\.|[^'])*(?:''(?:\\.|[^'])*)*'")
+    @_(r"'")
     def QUOTE_STRING(self, t):
-        t.value = t.value.replace('\\"', '"').replace("\\'", "'").replace("''", "'")
+        end = scan_string(self, t.index)
+        if end is None:
+            return lex_error(self, t)
+        self.index = end
+        t.value = self.text[t.index:end].replace('\\"', '"').replace("\\'", "'").replace("''", "'")
         return t
 
-    @_(r'"(?:\\.|[^"])*"')
+    @_(r'"')
     def DQUOTE_STRING(self, t):
-        t.value = t.value.replace('\\"', '"').replace("\\'", "'")
+        end = scan_string(self, t.index)
+        if end is None:
+            return lex_error(self, t)
+        self.index = end
+        t.value = self.text[t.index:end].replace('\\"', '"').replace("\\'", "'")
         return t
 
-    @_(r'\n+')
-    def ignore_newline(self, t):
-        self.lineno += len(t.value)
-
     @_(r'@[a-zA-Z_.$]+',
        r"@'[a-zA-Z_.$][^']*'",
        r"@`[a-zA-Z_.$][^`]*`",
@@ -364,23 +391,14 @@ class MindsDBLexer(Lexer):
         return t
 
     def error(self, t):
-
-        # convert to lines
-        lines = []
-        shift = 0
-        error_line = 0
-        error_index = 0
-        for i, line in enumerate(self.text.split('\n')):
-            if 0 <= t.index - shift < len(line):
-                error_line = i
-                error_index = t.index - shift
-            lines.append(line)
-            shift += len(line) + 1
+        lines = t.lines
+        error_line = lines.lineno(t.index)
+        error_index = lines.column(t.index)
 
         msgs = [f'Illegal character {t.value[0]!r}:']
         # show error code
-        for line in lines[error_line - 1: error_line + 1]:
-            msgs.append('>' + line)
+        for lineno in range(max(error_line - 1, lines.first_lineno), error_line + 1):
+            msgs.append('>' + lines.line(lineno))
 
         msgs.append('-' * (error_index + 1) + '^')
 
@@ -18,16 +18,15 @@ from mindsdb_sql.parser.dialects.mindsdb.latest import Latest
 from mindsdb_sql.parser.dialects.mindsdb.evaluate import Evaluate
 from mindsdb_sql.parser.dialects.mindsdb.knowledge_base import CreateKnowledgeBase, DropKnowledgeBase
 from mindsdb_sql.parser.dialects.mindsdb.skills import CreateSkill, DropSkill, UpdateSkill
-from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.exceptions import ParsingException, UnexpectedTokenException
 from mindsdb_sql.parser.dialects.mindsdb.lexer import MindsDBLexer
 from mindsdb_sql.parser.dialects.mindsdb.retrain_predictor import RetrainPredictor
 from mindsdb_sql.parser.dialects.mindsdb.finetune_predictor import FinetunePredictor
 from mindsdb_sql.parser.logger import ParserLogger
-from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType, tokens_to_string
+from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType, raw_query_to_string, get_tables_cachedir
 
-all_tokens_list = MindsDBLexer.tokens.copy()
-all_tokens_list.remove('RPAREN')
-all_tokens_list.remove('LPAREN')
+# sorted: order of the rules has to be the same in every run
+all_tokens_list = sorted(MindsDBLexer.tokens - {'RPAREN', 'LPAREN'})
 
 """
 Unfortunately the rules are not iherited from base SQLParser, because it just doesn't work with Sly due to metaclass magic.
@@ -36,6 +35,8 @@ Unfortunately the rules are not iherited from base SQLParser, because it just do
 
 class MindsDBParser(Parser):
     log = ParserLogger()
+    tablesmodule = 'mindsdb_sql.parser.dialects.mindsdb.parsetab'
+    cachedir = get_tables_cachedir()
     tokens = MindsDBLexer.tokens
 
     precedence = (
@@ -209,7 +210,7 @@ class MindsDBParser(Parser):
     @_('CREATE TRIGGER identifier ON identifier LPAREN raw_query RPAREN')
     @_('CREATE TRIGGER identifier ON identifier COLUMNS column_list LPAREN raw_query RPAREN')
     def create_trigger(self, p):
-        query_str = tokens_to_string(p.raw_query)
+        query_str = raw_query_to_string(p.raw_query)
 
         columns = None
         if hasattr(p, 'column_list'):
@@ -238,10 +239,10 @@ class MindsDBParser(Parser):
        )
     def create_job(self, p):
         if hasattr(p, 'raw_query0'):
-            query_str = tokens_to_string(p.raw_query0)
-            if_query_str = tokens_to_string(p.raw_query1)
+            query_str = raw_query_to_string(p.raw_query0)
+            if_query_str = raw_query_to_string(p.raw_query1)
         else:
-            query_str = tokens_to_string(p.raw_query)
+            query_str = raw_query_to_string(p.raw_query)
             if_query_str = None
 
         job_schedule = getattr(p, 'job_schedule', {})
@@ -620,19 +621,23 @@ class MindsDBParser(Parser):
         columns = getattr(p, 'column_list', None)
         return Insert(table=p.identifier, columns=columns, from_select=p.select)
 
-    @_('INSERT INTO identifier LPAREN column_list RPAREN VALUES expr_list_set',
-       'INSERT INTO identifier VALUES expr_list_set')
+    @_('INSERT INTO identifier LPAREN column_list RPAREN VALUES insert_values',
+       'INSERT INTO identifier VALUES insert_values')
     def insert(self, p):
         columns = getattr(p, 'column_list', None)
-        return Insert(table=p.identifier, columns=columns, values=p.expr_list_set)
+        return Insert(table=p.identifier, columns=columns, values=p.insert_values.rows,
+                      is_plain=p.insert_values.is_plain)
 
-    @_('expr_list_set COMMA expr_list_set')
-    def expr_list_set(self, p):
-        return p.expr_list_set0 + p.expr_list_set1
+    @_('insert_values COMMA LPAREN expr_list RPAREN')
+    def insert_values(self, p):
+        p.insert_values.add_row(p.expr_list)
+        return p.insert_values
 
     @_('LPAREN expr_list RPAREN')
-    def expr_list_set(self, p):
-        return [p.expr_list]
+    def insert_values(self, p):
+        values = InsertValues()
+        values.add_row(p.expr_list)
+        return values
 
     # DESCRIBE
 
@@ -668,7 +673,7 @@ class MindsDBParser(Parser):
     @_('CREATE VIEW if_not_exists_or_empty identifier create_view_from_table_or_nothing AS LPAREN raw_query RPAREN',
        'CREATE VIEW if_not_exists_or_empty identifier create_view_from_table_or_nothing LPAREN raw_query RPAREN')
     def create_view(self, p):
-        query_str = tokens_to_string(p.raw_query)
+        query_str = raw_query_to_string(p.raw_query)
 
         return CreateView(name=p.identifier,
                           from_table=p.create_view_from_table_or_nothing,
@@ -824,7 +829,7 @@ class MindsDBParser(Parser):
     def create_predictor(self, p):
         query_str = None
         if hasattr(p, 'raw_query'):
-            query_str = tokens_to_string(p.raw_query)
+            query_str = raw_query_to_string(p.raw_query)
 
         if hasattr(p, 'identifier'):
             # single identifier field
@@ -855,7 +860,7 @@ class MindsDBParser(Parser):
 
         query_str = None
         if hasattr(p, 'raw_query'):
-            query_str = tokens_to_string(p.raw_query)
+            query_str = raw_query_to_string(p.raw_query)
 
         if hasattr(p, 'identifier'):
             # single identifier field
@@ -893,7 +898,7 @@ class MindsDBParser(Parser):
     def create_predictor(self, p):
         query_str = None
         if hasattr(p, 'raw_query'):
-            query_str = tokens_to_string(p.raw_query)
+            query_str = raw_query_to_string(p.raw_query)
 
         if hasattr(p, 'identifier'):
             # single identifier field
@@ -915,7 +920,7 @@ class MindsDBParser(Parser):
     def create_predictor(self, p):
         query_str = None
         if hasattr(p, 'raw_query'):
-            query_str = tokens_to_string(p.raw_query)
+            query_str = raw_query_to_string(p.raw_query)
 
         if hasattr(p, 'identifier'):
             # single identifier field
@@ -945,7 +950,7 @@ class MindsDBParser(Parser):
 
         return Evaluate(
             name=name,
-            query_str=tokens_to_string(p.raw_query),
+            query_str=raw_query_to_string(p.raw_query),
             using=using
         )
 
@@ -1221,7 +1226,7 @@ class MindsDBParser(Parser):
     def from_table(self, p):
         query = NativeQuery(
             integration=p.identifier,
-            query=tokens_to_string(p.raw_query)
+            query=raw_query_to_string(p.raw_query)
         )
         return query
 
@@ -1492,8 +1497,8 @@ class MindsDBParser(Parser):
 
     @_('LPAREN enumeration RPAREN')
     def expr(self, p):
-        tup = Tuple(items=p.enumeration)
-        return tup
+        # lists of literals are stored compactly as ConstantList
+        return make_tuple(p.enumeration)
 
     @_('STAR')
     def star(self, p):
@@ -1558,7 +1563,9 @@ class MindsDBParser(Parser):
 
     @_('enumeration COMMA expr')
     def enumeration(self, p):
-        return p.enumeration + [p.expr]
+        # the list is extended in place: copying it for every item is quadratic
+        p.enumeration.append(p.expr)
+        return p.enumeration
 
     @_('expr COMMA expr')
     def enumeration(self, p):
@@ -1827,15 +1834,15 @@ class MindsDBParser(Parser):
 
     @_('LPAREN raw_query RPAREN')
     def raw_query(self, p):
-        return [p._slice[0]] + p[1] + [p._slice[2]]
+        return p.raw_query[0], p._slice[0].index, p._slice[2].end
 
     @_('raw_query LPAREN RPAREN')
     def raw_query(self, p):
-        return p[0] + [p._slice[1], p._slice[2]]
+        return p.raw_query[0], p.raw_query[1], p._slice[2].end
 
     @_('raw_query raw_query')
     def raw_query(self, p):
-        return p[0] + p[1]
+        return p.raw_query0[0], p.raw_query0[1], p.raw_query1[2]
 
     @_('variable')
     def table_or_subquery(self, p):
@@ -1882,26 +1889,13 @@ class MindsDBParser(Parser):
 
     @_(*all_tokens_list)
     def raw_query(self, p):
-        return p._slice
+        token = p._slice[0]
+        return token.text, token.index, token.end
 
     @_('')
     def empty(self, p):
         pass
 
     def error(self, p, expected_tokens=None):
-
-        if not hasattr(self, 'used_tokens'):
-            # failback mode if user has another sly version module installed
-            if p:
-                raise ParsingException(f"Syntax error at token {p.type}: \"{p.value}\"")
-            else:
-                raise ParsingException("Syntax error at EOF")
-
-        # save error info for future usage
-        self.error_info = dict(
-            tokens=self.used_tokens.copy() + list(self.tokens),
-            bad_token=p,
-            expected_tokens=expected_tokens
-        )
-        # don't raise exception
-        return
+        # stop at the first error, the details are used by error handling in parse_sql
+        raise UnexpectedTokenException(p, expected_tokens)
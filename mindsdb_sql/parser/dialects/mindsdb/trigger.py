@@ -5,6 +5,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class CreateTrigger(ASTNode):
+    __slots__ = ('name', 'table', 'query_str', 'columns')
+
     def __init__(self,
                  name,
                  table,
@@ -50,6 +52,8 @@ class CreateTrigger(ASTNode):
 
 
 class DropTrigger(Drop):
+    __slots__ = ('name',)
+
     def __init__(self,
                  name,
                  *args, **kwargs):
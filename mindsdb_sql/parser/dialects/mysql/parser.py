@@ -3,13 +3,15 @@ from mindsdb_sql.parser.parser import SQLParser
 from mindsdb_sql.parser.ast import *
 from mindsdb_sql.parser.dialects.mysql.lexer import MySQLLexer
 from mindsdb_sql.exceptions import ParsingException
-from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType
+from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType, get_tables_cachedir
 
 """
 Unfortunately the rules are not iherited from base SQLParser, because it just doesn't work with Sly due to metaclass magic.
 """
 class MySQLParser(SQLParser):
     log = ParserLogger()
+    tablesmodule = 'mindsdb_sql.parser.dialects.mysql.parsetab'
+    cachedir = get_tables_cachedir()
     tokens = MySQLLexer.tokens
 
     precedence = (
@@ -391,19 +393,23 @@ class MySQLParser(SQLParser):
         columns = getattr(p, 'result_columns', None)
         return Insert(table=p.from_table, columns=columns, from_select=p.select)
 
-    @_('INSERT INTO from_table LPAREN result_columns RPAREN VALUES expr_list_set')
-    @_('INSERT INTO from_table VALUES expr_list_set')
+    @_('INSERT INTO from_table LPAREN result_columns RPAREN VALUES insert_values')
+    @_('INSERT INTO from_table VALUES insert_values')
     def insert(self, p):
         columns = getattr(p, 'result_columns', None)
-        return Insert(table=p.from_table, columns=columns, values=p.expr_list_set)
+        return Insert(table=p.from_table, columns=columns, values=p.insert_values.rows,
+                      is_plain=p.insert_values.is_plain)
 
-    @_('expr_list_set COMMA expr_list_set')
-    def expr_list_set(self, p):
-        return p.expr_list_set0 + p.expr_list_set1
+    @_('insert_values COMMA LPAREN expr_list RPAREN')
+    def insert_values(self, p):
+        p.insert_values.add_row(p.expr_list)
+        return p.insert_values
 
     @_('LPAREN expr_list RPAREN')
-    def expr_list_set(self, p):
-        return [p.expr_list]
+    def insert_values(self, p):
+        values = InsertValues()
+        values.add_row(p.expr_list)
+        return values
 
     # DESCRIBE
 
@@ -843,8 +849,8 @@ class MySQLParser(SQLParser):
 
     @_('LPAREN enumeration RPAREN')
     def expr(self, p):
-        tup = Tuple(items=p.enumeration)
-        return tup
+        # lists of literals are stored compactly as ConstantList
+        return make_tuple(p.enumeration)
 
     @_('STAR')
     def star(self, p):
@@ -899,7 +905,9 @@ class MySQLParser(SQLParser):
 
     @_('enumeration COMMA expr')
     def enumeration(self, p):
-        return p.enumeration + [p.expr]
+        # the list is extended in place: copying it for every item is quadratic
+        p.enumeration.append(p.expr)
+        return p.enumeration
 
     @_('expr COMMA expr')
     def enumeration(self, p):
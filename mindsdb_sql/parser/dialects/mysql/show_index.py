@@ -3,6 +3,8 @@ from mindsdb_sql.parser.utils import indent
 
 
 class ShowIndex(Show):
+    __slots__ = ('table', 'db')
+
     def __init__(self,
                  table,
                  db=None,
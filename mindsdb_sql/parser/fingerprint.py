@@ -0,0 +1,101 @@
+from collections import namedtuple
+from hashlib import blake2b
+
+from sly.lex import LexError
+
+# key: stable hash of the normalized query, query: normalized text
+QueryFingerprint = namedtuple('QueryFingerprint', ['key', 'query'])
+
+# tokens which are replaced with placeholder
+CONSTANT_TOKENS = frozenset(['INTEGER', 'FLOAT', 'QUOTE_STRING', 'DQUOTE_STRING', 'PARAMETER'])
+
+# tokens of the list in IN (...) which is replaced with one placeholder
+LIST_TOKENS = CONSTANT_TOKENS | {'COMMA', 'MINUS', 'PLUS', 'NULL', 'TRUE', 'FALSE'}
+
+
+def fingerprint_tokens(tokens, rest=None):
+    """
+    Fingerprint of the query from tokens of MindsDBLexer.
+    Constants are replaced with '?', lists of constants in IN (...) - with '(...)' regardless of their length,
+    keywords are upper-cased and whitespaces between tokens are ignored
+    :param tokens: list of tokens
+    :param rest: text of the query after the tokens which can't be lexed, is used as is
+    :return: QueryFingerprint
+    """
+    types = []
+    parts = []
+    i = 0
+    count = len(tokens)
+    while i < count:
+        token = tokens[i]
+        token_type = token.type
+
+        if token_type in CONSTANT_TOKENS:
+            # type of the constant doesn't matter
+            types.append('CONSTANT')
+            parts.append('?')
+        elif token_type == 'ID':
+            # case of identifiers is kept
+            types.append(token_type)
+            parts.append(token.value)
+        else:
+            # multiword keywords can contain different whitespaces
+            types.append(token_type)
+            parts.append(' '.join(token.value.split()).upper())
+
+        if token_type in ('IN', 'NOT_IN') and i + 1 < count and tokens[i + 1].type == 'LPAREN':
+            end = i + 2
+            while end < count and tokens[end].type in LIST_TOKENS:
+                end += 1
+            if end > i + 2 and end < count and tokens[end].type == 'RPAREN':
+                types.append('LIST')
+                parts.append('(...)')
+                i = end + 1
+                continue
+        i += 1
+
+    if rest:
+        types.append('ERROR')
+        parts.append(rest)
+
+    query = ' '.join(parts)
+    data = '\x1f'.join(types) + '\x1e' + '\x1f'.join(parts)
+    key = blake2b(data.encode('utf-8', 'surrogatepass'), digest_size=8).hexdigest()
+    return QueryFingerprint(key, query)
+
+
+def fingerprint(sql):
+    """
+    Fingerprint of the text of the query, see fingerprint_tokens.
+    Query is lexed by MindsDBLexer for all dialects; the part which can't be lexed is used as is
+    """
+    from mindsdb_sql.parser.dialects.mindsdb.lexer import MindsDBLexer
+
+    lexer = MindsDBLexer()
+    tokens = []
+    rest = None
+    try:
+        for token in lexer.tokenize(sql):
+            tokens.append(token)
+    except LexError as e:
+        rest = e.text
+    return fingerprint_tokens(tokens, rest)
+
+
+def node_fingerprint(node):
+    """
+    Fingerprint of AST: it is set by parse_sql when query statistics is enabled or computed from text of the AST.
+    The result is saved in the node
+    """
+    result = getattr(node, 'fingerprint', None)
+    if result is None:
+        try:
+            result = fingerprint(node.to_string())
+        except Exception:
+            # AST can't be rendered
+            result = fingerprint_tokens([], f'<{type(node).__name__}>')
+        try:
+            node.fingerprint = result
+        except AttributeError:
+            pass
+    return result
@@ -0,0 +1,283 @@
+import threading
+import weakref
+
+from mindsdb_sql.parser.ast.base import ASTNode, FrozenList, _scalar_types, mark_interned
+from mindsdb_sql.parser.ast.select.constant import Constant, NullConstant
+from mindsdb_sql.parser.ast.select.identifier import Identifier
+from mindsdb_sql.parser.ast.select.star import Star
+
+
+def _leaf_key(node):
+    # key of the leaf for the table, None if the node can't be interned:
+    #   it isn't a leaf or has attributes which are not compared (span, sub_select)
+    cls = type(node)
+    if node.span is not None or node.fingerprint is not None:
+        return None
+
+    if node.alias is None:
+        alias = None
+    else:
+        alias = _leaf_key(node.alias)
+        if alias is None:
+            return None
+
+    if cls is Identifier:
+        if node.sub_select is not None:
+            return None
+        parts = []
+        for part in node.parts:
+            if type(part) is str:
+                parts.append(part)
+            elif type(part) is Star:
+                parts.append(Star)
+            else:
+                return None
+        return cls, tuple(parts), node.parentheses, alias
+
+    if cls is Constant or cls is NullConstant:
+        value = node.value
+        value_type = type(value)
+        if value_type is float:
+            # 0.0 and -0.0 are equal but rendered differently
+            value = repr(value)
+        try:
+            hash(value)
+        except TypeError:
+            return None
+        return cls, value_type, value, node.with_quotes, node.parentheses, alias
+
+    if cls is Star:
+        return cls, node.parentheses, alias
+
+    return None
+
+
+class InternTable:
+    """
+    Table of interned leaves of AST: Identifier, Constant, NullConstant and Star.
+    Equal leaves of the interned trees are replaced with one shared node, so ASTs kept in caches share them
+    and equal leaves are compared by identity.
+
+    The table keeps weak references: a leaf is removed from the table when it isn't used by any AST.
+    Interned leaves can't be modified (TypeError is raised): they can be replaced in the tree or copied with clone().
+    Lists of parts of interned identifiers (and their aliases) are FrozenList, they can't be changed in place.
+
+    :param per_dialect: separate table for every dialect, otherwise one table is used for all dialects
+    :param plans: intern leaves of the plan steps in the planner, it is useful when plans are kept
+    """
+
+    def __init__(self, per_dialect=False, plans=True):
+        self.per_dialect = per_dialect
+        self.plans = plans
+
+        self._tables = {}  # dialect: {key: leaf}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _get_table(self, dialect):
+        if not self.per_dialect:
+            dialect = None
+        table = self._tables.get(dialect)
+        if table is None:
+            table = weakref.WeakValueDictionary()
+            self._tables[dialect] = table
+        return table
+
+    def _intern_leaf(self, table, node, copy=False):
+        # copy: the node belongs to other tree, the copy is added to the table
+        key = _leaf_key(node)
+        if key is None:
+            return node
+        leaf = table.get(key)
+        if leaf is None:
+            if copy:
+                node = node.clone()
+            _freeze_leaf(node)
+            table[key] = node
+            self.misses += 1
+            return node
+        self.hits += 1
+        return leaf
+
+    def intern(self, node, dialect=None):
+        """
+        Returns interned leaf equal to the node, the node itself is interned if there is no such leaf yet.
+        Other nodes are returned as is
+        """
+        if type(node) not in _leaf_types:
+            return node
+        with self._lock:
+            return self._intern_leaf(self._get_table(dialect), node)
+
+    def intern_tree(self, tree, dialect=None, copy_on_write=False):
+        """
+        Replaces leaves of the tree with interned leaves.
+        Lists, tuples and dicts of nodes are also traversed, other objects are kept as is.
+
+        :param tree: AST node or list of nodes
+        :param dialect: dialect of the tree, is used if the table is per dialect
+        :param copy_on_write: don't modify the tree: nodes and lists on the path to replaced leaves are copied,
+            leaves of the tree are not added to the table (their copies are added)
+        :return: the tree (interned leaf if the tree is a leaf), or its changed copy for copy_on_write
+        """
+        with self._lock:
+            table = self._get_table(dialect)
+            if copy_on_write:
+                return self._intern_copy(table, tree)
+            return self._intern_in_place(table, tree)
+
+    def _intern_in_place(self, table, tree):
+        # leaves are replaced in their parents, other nodes and containers are traversed without recursion
+        if type(tree) in _leaf_types:
+            return self._intern_leaf(table, tree)
+        if type(tree) is tuple:
+            return self._intern_copy(table, tree)
+        stack = [tree]
+        while stack:
+            item = stack.pop()
+            item_type = type(item)
+            if item_type is list:
+                fields = enumerate(item)
+            elif item_type is dict:
+                fields = item.items()
+            else:
+                # ASTNode
+                fields = ((name, getattr(item, name, None)) for name in _field_names(item))
+
+            changes = []
+            for name, value in fields:
+                value_type = type(value)
+                if value_type in _leaf_types:
+                    leaf = self._intern_leaf(table, value)
+                    if leaf is not value:
+                        changes.append((name, leaf))
+                elif value_type is tuple:
+                    # tuple can't be changed
+                    value2 = self._intern_copy(table, value)
+                    if value2 is not value:
+                        changes.append((name, value2))
+                elif value_type is list or value_type is dict or isinstance(value, ASTNode):
+                    stack.append(value)
+
+            for name, value in changes:
+                if item_type is list or item_type is dict:
+                    item[name] = value
+                else:
+                    setattr(item, name, value)
+        return tree
+
+    def _intern_copy(self, table, tree):
+        # post-order traversal without recursion: an item is pushed again with its fields after its children,
+        #   results of the children are collected in values. Scalar fields are skipped
+        values = []
+        stack = [(tree, None)]
+        while stack:
+            item, fields = stack.pop()
+            item_type = type(item)
+
+            if fields is not None:
+                count = len(fields)
+                children = values[len(values) - count:]
+                del values[len(values) - count:]
+                changes = [(key, child) for (key, old), child in zip(fields, children) if child is not old]
+                if changes:
+                    item = _copy_with_changes(item, changes)
+                values.append(item)
+                continue
+
+            if item_type in _leaf_types:
+                values.append(self._intern_leaf(table, item, copy=True))
+                continue
+
+            if item_type is list or item_type is tuple:
+                fields = enumerate(item)
+            elif item_type is dict:
+                fields = item.items()
+            elif isinstance(item, ASTNode):
+                fields = ((name, getattr(item, name, None)) for name in _field_names(item))
+            else:
+                values.append(item)
+                continue
+
+            fields = [(key, value) for key, value in fields if type(value) not in _scalar_types]
+            if not fields:
+                values.append(item)
+                continue
+            stack.append((item, fields))
+            stack.extend((value, None) for _, value in reversed(fields))
+
+        return values[0]
+
+    def clear(self):
+        with self._lock:
+            self._tables = {}
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+    def __len__(self):
+        return sum(len(table) for table in list(self._tables.values()))
+
+
+_leaf_types = frozenset([Identifier, Constant, NullConstant, Star])
+
+
+def _freeze_leaf(node):
+    # interned leaf, its alias and parts of identifiers can't be changed
+    while node is not None:
+        if type(node) is Identifier:
+            node.parts = FrozenList(node.parts)
+            for part in node.parts:
+                if type(part) is Star:
+                    mark_interned(part)
+        mark_interned(node)
+        node = node.alias
+
+
+def _copy_with_changes(item, changes):
+    # copy of the node or the container with replaced fields (items)
+    if isinstance(item, ASTNode):
+        return item.replace(**dict(changes))
+    item_type = type(item)
+    items = dict(item) if item_type is dict else list(item)
+    for key, value in changes:
+        items[key] = value
+    if item_type is tuple:
+        return tuple(items)
+    return items
+
+
+def _field_names(node):
+    # slots which can contain sub-nodes, span and fingerprint are skipped
+    cls = type(node)
+    names = _field_names_cache.get(cls)
+    if names is None:
+        names = tuple(name for name in cls._slot_names if name not in cls._clone_shared)
+        _field_names_cache[cls] = names
+    return names
+
+
+_field_names_cache = {}
+
+
+_intern_table = None
+
+
+def set_intern_table(table):
+    """
+    Enables interning of leaves of AST in parse_sql and in the planner (nodes of the plan steps)
+    :param table: InternTable object, None disables interning
+    """
+    global _intern_table
+    _intern_table = table
+
+
+def get_intern_table():
+    return _intern_table
@@ -1,10 +1,26 @@
 import re
 from sly import Lexer
 
+from mindsdb_sql.parser.scanners import scan_backtick, scan_comment, lex_error
+
 class SQLLexer(Lexer):
     reflags = re.IGNORECASE
+    # keywords are found by lookup of the matched word
+    keyword_lookup = True
     ignore = ' \t\n\r'
-    ignore_multi_comment = r'/\*[\s\S]*?\*/'
+
+    # comments and identifiers in backticks are found by scanners
+    @_(r'/\*')
+    def ignore_multi_comment(self, t):
+        end = scan_comment(self, t.index)
+        if end is None:
+            # not closed comment: it is division
+            t.type = 'DIVIDE'
+            t.value = '/'
+            self.index = t.index + 1
+            return t
+        self.index = end
+
     ignore_line_comment = r'--[^\n]*'
 
     tokens = {
@@ -218,8 +234,14 @@ class SQLLexer(Lexer):
     TRUE = r'\bTRUE\b'
     FALSE = r'\bFALSE\b'
 
-    @_(r'(?:([a-zA-Z_$0-9]*[a-zA-Z_$]+[a-zA-Z_$0-9]*)|(?:`([^`]+)`))')
+    @_(r'[a-zA-Z_$0-9]*[a-zA-Z_$]+[a-zA-Z_$0-9]*', r'`')
     def ID(self, t):
+        if t.value == '`':
+            end = scan_backtick(self, t.index)
+            if end is None:
+                return lex_error(self, t)
+            t.value = self.text[t.index:end]
+            self.index = end
         return t
 
     @_(r'\d+\.\d*')
@@ -237,7 +259,3 @@ class SQLLexer(Lexer):
     @_(r'"[^"]*"')
     def DQUOTE_STRING(self, t):
         return t
-
-    @_(r'\n+')
-    def ignore_newline(self, t):
-        self.lineno += len(t.value)
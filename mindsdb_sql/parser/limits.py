@@ -0,0 +1,51 @@
+from mindsdb_sql.exceptions import ParsingException
+
+
+class ParseLimits:
+    """
+    Limits of the parsed query. ParsingException is raised as soon as a limit is exceeded:
+    length is checked before lexing, count of tokens and nesting depth - while the query is lexed.
+
+    :param max_length: max length of the text of the query, None - without limit
+    :param max_tokens: max count of tokens in the query, None - without limit
+    :param max_depth: max nesting depth of parentheses, brackets and braces, None - without limit
+    """
+
+    opening_tokens = frozenset(['LPAREN', 'LBRACKET', 'LBRACE'])
+    closing_tokens = frozenset(['RPAREN', 'RBRACKET', 'RBRACE'])
+
+    def __init__(self, max_length=None, max_tokens=None, max_depth=None):
+        self.max_length = max_length
+        self.max_tokens = max_tokens
+        self.max_depth = max_depth
+
+    def check_length(self, sql):
+        if self.max_length is not None and len(sql) > self.max_length:
+            raise ParsingException(f'Query is too long: {len(sql)} characters, the limit is {self.max_length}')
+
+    def tokenize(self, lexer, sql):
+        """
+        Returns list of tokens of the query
+        """
+        self.check_length(sql)
+
+        max_tokens = self.max_tokens
+        max_depth = self.max_depth
+        if max_tokens is None and max_depth is None:
+            return list(lexer.tokenize(sql))
+
+        tokens = []
+        depth = 0
+        for token in lexer.tokenize(sql):
+            tokens.append(token)
+            if max_tokens is not None and len(tokens) > max_tokens:
+                raise ParsingException(f'Query has too many tokens, the limit is {max_tokens}')
+
+            if token.type in self.opening_tokens:
+                depth += 1
+                if max_depth is not None and depth > max_depth:
+                    raise ParsingException(f'Query is nested too deeply at position {token.index}, '
+                                           f'the limit is {max_depth}')
+            elif token.type in self.closing_tokens:
+                depth -= 1
+        return tokens
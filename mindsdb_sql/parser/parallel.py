@@ -0,0 +1,39 @@
+import pickle
+
+from mindsdb_sql.exceptions import ParsingException
+
+
+def dump_asts(items):
+    # AST nodes are stored in compact format: attributes equal to defaults (alias, parentheses, ...)
+    #   are omitted by ASTNode.__getstate__, nested binary operations are stored as flat list
+    return pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_asts(data):
+    return pickle.loads(data)
+
+
+def init_worker(dialect):
+    # load parser tables once per worker process
+    from mindsdb_sql import get_lexer_parser_pool
+    with get_lexer_parser_pool(dialect).acquire():
+        pass
+
+
+def parse_chunk(sqls, dialect):
+    """
+    Parses queries in worker process
+    :return: serialized list of ASTs or ParsingException for queries with errors
+    """
+    from mindsdb_sql import parse_sql
+
+    results = []
+    for sql in sqls:
+        try:
+            results.append(parse_sql(sql, dialect))
+        except ParsingException as e:
+            results.append(e)
+        except Exception as e:
+            # errors of lexer
+            results.append(ParsingException(str(e)))
+    return dump_asts(results)
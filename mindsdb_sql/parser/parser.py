@@ -4,11 +4,13 @@ from mindsdb_sql.parser.ast import *
 from mindsdb_sql.exceptions import ParsingException
 from mindsdb_sql.parser.lexer import SQLLexer
 from mindsdb_sql.parser.logger import ParserLogger
-from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType
+from mindsdb_sql.parser.utils import ensure_select_keyword_order, JoinType, get_tables_cachedir
 
 
 class SQLParser(Parser):
     log = ParserLogger()
+    tablesmodule = 'mindsdb_sql.parser.parsetab'
+    cachedir = get_tables_cachedir()
     tokens = SQLLexer.tokens
 
     precedence = (
@@ -217,19 +219,23 @@ class SQLParser(Parser):
         columns = getattr(p, 'result_columns', None)
         return Insert(table=p.from_table, columns=columns, from_select=p.select)
 
-    @_('INSERT INTO from_table LPAREN result_columns RPAREN VALUES expr_list_set',
-       'INSERT INTO from_table VALUES expr_list_set')
+    @_('INSERT INTO from_table LPAREN result_columns RPAREN VALUES insert_values',
+       'INSERT INTO from_table VALUES insert_values')
     def insert(self, p):
         columns = getattr(p, 'result_columns', None)
-        return Insert(table=p.from_table, columns=columns, values=p.expr_list_set)
+        return Insert(table=p.from_table, columns=columns, values=p.insert_values.rows,
+                      is_plain=p.insert_values.is_plain)
 
-    @_('expr_list_set COMMA expr_list_set')
-    def expr_list_set(self, p):
-        return p.expr_list_set0 + p.expr_list_set1
+    @_('insert_values COMMA LPAREN expr_list RPAREN')
+    def insert_values(self, p):
+        p.insert_values.add_row(p.expr_list)
+        return p.insert_values
 
     @_('LPAREN expr_list RPAREN')
-    def expr_list_set(self, p):
-        return [p.expr_list]
+    def insert_values(self, p):
+        values = InsertValues()
+        values.add_row(p.expr_list)
+        return values
 
     # DESCRIBE
 
@@ -598,8 +604,8 @@ class SQLParser(Parser):
 
     @_('LPAREN enumeration RPAREN')
     def expr(self, p):
-        tup = Tuple(items=p.enumeration)
-        return tup
+        # lists of literals are stored compactly as ConstantList
+        return make_tuple(p.enumeration)
 
     @_('STAR')
     def star(self, p):
@@ -654,7 +660,9 @@ class SQLParser(Parser):
 
     @_('enumeration COMMA expr')
     def enumeration(self, p):
-        return p.enumeration + [p.expr]
+        # the list is extended in place: copying it for every item is quadratic
+        p.enumeration.append(p.expr)
+        return p.enumeration
 
     @_('expr COMMA expr')
     def enumeration(self, p):
@@ -0,0 +1,103 @@
+"""
+Linear time scanners for the lexers: quoted strings, backtick identifiers and multiline comments.
+
+Lexer rules match only the first char(s) and call the scanner to find the end of the token,
+long or not closed tokens can't make the regex engine backtrack.
+Scanners keep results which are used again for the same text in the lexer object (lexer.text is checked).
+"""
+import re
+
+# the first way of regex quote(?:\\.|[^quote])*(?:quote quote(?:\\.|[^quote])*)*quote:
+#   backslash escapes the next char (except newline), two quotes continue the string.
+#   Alternatives don't overlap: the regex doesn't backtrack more than the length of the string
+QUOTE_STRING_RE = re.compile(r"'(?:[^'\\]|\\[^\n]|\\(?![^\n])|'')*'(?!')")
+DQUOTE_STRING_RE = re.compile(r'"(?:[^"\\]|\\[^\n]|\\(?![^\n]))*"')
+
+
+def _get_memo(lexer, name):
+    # results of scanner for the current text of the lexer
+    memo = getattr(lexer, '_scanner_memo', None)
+    if memo is None or memo[0] is not lexer.text:
+        memo = (lexer.text, {})
+        lexer._scanner_memo = memo
+    return memo[1].setdefault(name, {})
+
+
+def _backtrack_string(lexer, start):
+    """
+    The string isn't closed in the first way: find the end in the order of regex backtracking.
+
+    For every position i of the text: ends[i] - the end of the match of the rest of the string from i or 0.
+    The value depends only on the position, so it is computed once for the text, from the end of the text
+    """
+    text = lexer.text
+    quote = text[start]
+    pairs = quote == '\''
+    n = len(text)
+
+    memo = _get_memo(lexer, quote)
+    if not memo:
+        memo['ends'] = [0] * (n + 2)
+        memo['from'] = n
+    ends = memo['ends']
+
+    # continue from the last computed position
+    for i in range(memo['from'] - 1, start, -1):
+        char = text[i]
+        if char == quote:
+            end = ends[i + 2] if pairs and i + 1 < n and text[i + 1] == quote else 0
+            ends[i] = end or i + 1
+        else:
+            end = ends[i + 2] if char == '\\' and i + 1 < n and text[i + 1] != '\n' else 0
+            ends[i] = end or ends[i + 1]
+    memo['from'] = min(memo['from'], start + 1)
+    return ends[start + 1] or None
+
+
+def scan_string(lexer, start):
+    """
+    Returns the end of the string in single or double quotes at position start of lexer.text,
+    None if the string isn't closed. The result is the same as of regexes:
+        '(?:\\.|[^'])*(?:''(?:\\.|[^'])*)*'
+        "(?:\\.|[^"])*"
+    """
+    regex = QUOTE_STRING_RE if lexer.text[start] == '\'' else DQUOTE_STRING_RE
+    match = regex.match(lexer.text, start)
+    if match is not None:
+        return match.end()
+    return _backtrack_string(lexer, start)
+
+
+def scan_backtick(lexer, start):
+    """
+    Returns the end of the identifier in backticks: `([^`]+)`, None if it isn't closed or empty
+    """
+    end = lexer.text.find('`', start + 1)
+    if end <= start + 1:
+        return None
+    return end + 1
+
+
+def scan_comment(lexer, start):
+    """
+    Returns the end of the comment: /\\*[\\s\\S]*?\\*/, None if it isn't closed
+    """
+    memo = _get_memo(lexer, '*/')
+    # there is no end of comment after this position
+    not_found = memo.get('not_found')
+    if not_found is not None and start >= not_found:
+        return None
+
+    end = lexer.text.find('*/', start + 2)
+    if end == -1:
+        memo['not_found'] = start
+        return None
+    return end + 2
+
+
+def lex_error(lexer, t):
+    # the same as in sly when no rule matches the input
+    lexer.index = t.index
+    t.type = 'ERROR'
+    t.value = lexer.text[t.index:]
+    return lexer.error(t)
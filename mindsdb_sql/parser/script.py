@@ -0,0 +1,180 @@
+import codecs
+import re
+
+from sly.yacc import Span
+
+
+# chars which could change the meaning of semicolon
+SPECIAL_RE = re.compile(r"""[;()'"`]|--|/\*""")
+
+# strings are the same as in lexers, but without backtracking: the match can't become shorter on truncated text
+QUOTE_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'", re.DOTALL)
+DQUOTE_STRING_RE = re.compile(r'"(?:[^"\\]|\\.)*"', re.DOTALL)
+
+
+class ScriptReader:
+    """
+    Reads text of the script by chunks from:
+    - string
+    - file object or mmap (text or binary)
+    - iterable of strings or bytes
+    """
+
+    def __init__(self, source, encoding='utf-8'):
+        self.decoder = codecs.getincrementaldecoder(encoding)()
+        self.source = None
+        self.chunks = None
+
+        if isinstance(source, str):
+            self.chunks = iter([source])
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self.chunks = iter([bytes(source)])
+        elif hasattr(source, 'read'):
+            self.source = source
+        else:
+            self.chunks = iter(source)
+
+    def decode(self, data, final=False):
+        if isinstance(data, str):
+            return data
+        return self.decoder.decode(data, final)
+
+    def read(self, size):
+        """
+        Returns at least size chars (if they are available), empty string at the end of the script
+        """
+        if self.source is not None:
+            data = self.decode(self.source.read(size))
+            if not data:
+                return self.decode(b'', final=True)
+            return data
+
+        parts = []
+        length = 0
+        for chunk in self.chunks:
+            chunk = self.decode(chunk)
+            parts.append(chunk)
+            length += len(chunk)
+            if length >= size:
+                break
+        else:
+            parts.append(self.decode(b'', final=True))
+        return ''.join(parts)
+
+
+def split_script(source, chunk_size=1024 ** 2, encoding='utf-8'):
+    """
+    Splits script to statements by semicolons which are not inside strings, comments or parentheses.
+    The script is read by chunks, only the current statement is kept in memory.
+    Statements without content (empty or only comments) are skipped.
+
+    :param source: string, file object, mmap or iterable of strings/bytes
+    :param chunk_size: size of the chunk to read
+    :param encoding: encoding of binary input
+    :return: generator of (text of statement, Span in the script)
+    """
+    reader = ScriptReader(source, encoding)
+
+    buffer = ''
+    offset = 0  # offset of the buffer in the script
+    lineno = 1  # line of the buffer start
+    stmt_start = 0  # start of current statement in buffer
+    pos = 0  # scanning position in buffer
+    depth = 0  # depth of parentheses
+    content = None  # [start, end] of statement without spaces and comments around it
+    eof = False
+
+    def add_content(start, end):
+        nonlocal content
+        if content is None:
+            content = [start, end]
+        else:
+            content[1] = max(content[1], end)
+
+    def add_gap(start, end):
+        # text between special chars
+        gap = buffer[start:end]
+        if gap and not gap.isspace():
+            add_content(start + len(gap) - len(gap.lstrip()), start + len(gap.rstrip()))
+
+    def make_statement():
+        start, end = content
+        span = Span(offset + start, offset + end, lineno + buffer.count('\n', stmt_start, start))
+        return buffer[start:end], span
+
+    while True:
+        match = SPECIAL_RE.search(buffer, pos)
+        if match is not None:
+            start = match.start()
+            add_gap(pos, start)
+
+            char = match.group()
+            end = None
+            if char == ';':
+                if depth == 0:
+                    if content is not None:
+                        yield make_statement()
+                    lineno += buffer.count('\n', stmt_start, start + 1)
+                    stmt_start = pos = start + 1
+                    content = None
+                    continue
+                end = start + 1
+            elif char == '(':
+                depth += 1
+                end = start + 1
+            elif char == ')':
+                depth = max(depth - 1, 0)
+                end = start + 1
+            elif char == "'" or char == '"':
+                regex = QUOTE_STRING_RE if char == "'" else DQUOTE_STRING_RE
+                match = regex.match(buffer, start)
+                # string at the end of the buffer can be continued: 'a''b'
+                if match is not None and (match.end() < len(buffer) or eof):
+                    end = match.end()
+            elif char == '`':
+                end = buffer.find('`', start + 1)
+                end = end + 1 if end != -1 else None
+            elif char == '--':
+                end = buffer.find('\n', start)
+                if end == -1:
+                    end = None
+            else:
+                end = buffer.find('*/', start + 2)
+                end = end + 2 if end != -1 else None
+
+            if end is None and eof:
+                # not closed string or comment, it is the rest of the script
+                end = len(buffer)
+
+            if end is not None:
+                if char not in ('--', '/*'):
+                    add_content(start, end)
+                pos = end
+                continue
+
+            # more data is needed
+            pos = start
+        else:
+            # the last char could be the start of comment
+            end = max(pos, len(buffer) - 1)
+            add_gap(pos, end)
+            pos = end
+            if eof:
+                add_gap(pos, len(buffer))
+
+        if eof:
+            if content is not None:
+                yield make_statement()
+            return
+
+        # drop processed statements and read more: size of the buffer is at least doubled
+        #   to not rescan the long statement many times
+        offset += stmt_start
+        pos -= stmt_start
+        if content is not None:
+            content = [content[0] - stmt_start, content[1] - stmt_start]
+        data = reader.read(max(chunk_size, len(buffer) - stmt_start))
+        buffer = buffer[stmt_start:] + data
+        stmt_start = 0
+        if not data:
+            eof = True
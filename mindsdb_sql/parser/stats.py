@@ -0,0 +1,174 @@
+import heapq
+import threading
+import time
+from contextlib import contextmanager
+
+from mindsdb_sql.parser.fingerprint import node_fingerprint
+
+
+class _PhaseStats:
+    __slots__ = ('count', 'errors', 'total_time', 'max_time')
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+
+
+class _Entry:
+    __slots__ = ('query', 'total_time', 'phases')
+
+    def __init__(self, query):
+        self.query = query
+        self.total_time = 0.0
+        self.phases = {}
+
+
+class QueryStats:
+    """
+    Statistics of queries aggregated by fingerprint (see parser.fingerprint):
+    for every phase (parse, plan, render) count of calls, errors, total and max time in seconds.
+
+    Is filled by parse_sql, QueryPlanner.from_query and SqlalchemyRender.get_string when it is enabled
+    by set_query_stats.
+    Memory is bounded: when count of fingerprints exceeds max_size, 5% of fingerprints with
+    the least total time are removed, the most expensive ones are kept.
+
+    :param max_size: max count of fingerprints
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+
+        self._items = {}  # fingerprint key: _Entry
+        self._lock = threading.Lock()
+
+        self.evictions = 0
+
+    def record(self, fingerprint, phase, elapsed, error=False):
+        """
+        Adds one call of the phase
+        :param fingerprint: QueryFingerprint of the query
+        :param phase: name of the phase
+        :param elapsed: time of the call in seconds
+        :param error: call raised an exception
+        """
+        with self._lock:
+            entry = self._items.get(fingerprint.key)
+            if entry is None:
+                if len(self._items) >= self.max_size:
+                    self._evict()
+                entry = _Entry(fingerprint.query)
+                self._items[fingerprint.key] = entry
+
+            stats = entry.phases.get(phase)
+            if stats is None:
+                stats = entry.phases[phase] = _PhaseStats()
+            stats.count += 1
+            if error:
+                stats.errors += 1
+            stats.total_time += elapsed
+            if elapsed > stats.max_time:
+                stats.max_time = elapsed
+            entry.total_time += elapsed
+
+    def _evict(self):
+        count = max(self.max_size // 20, 1)
+        items = self._items
+        for key in heapq.nsmallest(count, items, key=lambda key: items[key].total_time):
+            del items[key]
+            self.evictions += 1
+
+    @contextmanager
+    def measure(self, phase, node):
+        """
+        Records time of the block as a call of the phase for AST node
+        """
+        # fingerprint is computed before the phase: the phase can change the node
+        fingerprint = node_fingerprint(node)
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self.record(fingerprint, phase, time.perf_counter() - start, error=True)
+            raise
+        self.record(fingerprint, phase, time.perf_counter() - start)
+
+    @staticmethod
+    def _to_dict(key, entry):
+        phases = {
+            phase: {
+                'count': stats.count,
+                'errors': stats.errors,
+                'total_time': stats.total_time,
+                'max_time': stats.max_time,
+            }
+            for phase, stats in entry.phases.items()
+        }
+        return {
+            'fingerprint': key,
+            'query': entry.query,
+            'count': max(stats['count'] for stats in phases.values()),
+            'errors': sum(stats['errors'] for stats in phases.values()),
+            'total_time': entry.total_time,
+            'phases': phases,
+        }
+
+    def get(self, fingerprint):
+        """
+        Returns statistics of the fingerprint (QueryFingerprint or its key) as dict or None:
+          fingerprint, query - normalized text,
+          count - count of calls of the most called phase, errors - count of errors of all phases,
+          total_time - time of all phases, phases - {phase: {count, errors, total_time, max_time}}
+        """
+        key = getattr(fingerprint, 'key', fingerprint)
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            return self._to_dict(key, entry)
+
+    def top(self, limit=10, phase=None):
+        """
+        Returns statistics (see get) of fingerprints with the max total time
+        :param limit: count of fingerprints, None - all
+        :param phase: order by time of the phase, None - by time of all phases
+        """
+        def get_time(item):
+            entry = item[1]
+            if phase is None:
+                return entry.total_time
+            stats = entry.phases.get(phase)
+            return stats.total_time if stats is not None else 0.0
+
+        with self._lock:
+            items = list(self._items.items())
+            if limit is None:
+                items.sort(key=get_time, reverse=True)
+            else:
+                items = heapq.nlargest(limit, items, key=get_time)
+            return [self._to_dict(key, entry) for key, entry in items]
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self):
+        return len(self._items)
+
+
+_query_stats = None
+
+
+def set_query_stats(stats):
+    """
+    Enables statistics of queries in parse_sql, QueryPlanner.from_query and SqlalchemyRender.get_string
+    :param stats: QueryStats object, None disables statistics
+    """
+    global _query_stats
+    _query_stats = stats
+
+
+def get_query_stats():
+    return _query_stats
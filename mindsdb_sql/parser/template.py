@@ -0,0 +1,262 @@
+import pickle
+import threading
+from collections import OrderedDict
+
+from sly.lex import Token
+
+from mindsdb_sql.parser.ast import ASTNode, Constant, ConstantList
+
+
+# literal tokens which are replaced with slots in template and
+# functions to get value of Constant from value of the token (the same as in grammar)
+LITERAL_TOKENS = {
+    'INTEGER': int,
+    'FLOAT': float,
+    'QUOTE_STRING': lambda value: value.strip('\''),
+    'DQUOTE_STRING': lambda value: value.strip('\"'),
+}
+
+# base for probe numbers, they have to be unique for the query
+PROBE_NUMBER = 10 ** 15
+
+
+def probe_value(token_type, num):
+    """
+    Returns value of the token which will be placed instead of the literal to find the slot in AST.
+    Strings have spaces and mixed case to detect if grammar transforms them
+    """
+    if token_type == 'INTEGER':
+        return str(PROBE_NUMBER + num)
+    if token_type == 'FLOAT':
+        return f'{PROBE_NUMBER + num}.5'
+    quote = '\'' if token_type == 'QUOTE_STRING' else '\"'
+    return f'{quote} \x00Slot{num}\x00 {quote}'
+
+
+def find_values(node, values):
+    """
+    Walks over AST and finds all places where values are used
+    :param node: AST
+    :param values: dict {(type, value): slot number}
+    :return: dict {slot number: list of (object, attribute name or index in list or None, negated)}
+    """
+    found = {}
+    visited = set()
+
+    def check(value, obj, attr):
+        value_type = type(value)
+        if value_type not in (int, float, str):
+            return
+        num = values.get((value_type, value))
+        if num is not None:
+            found.setdefault(num, []).append((obj, attr, False))
+        elif value_type is not str:
+            num = values.get((value_type, -value))
+            if num is not None:
+                found.setdefault(num, []).append((obj, attr, True))
+
+    # without recursion: AST of long conditions is deep
+    stack = [node]
+    while stack:
+        obj = stack.pop()
+        if isinstance(obj, (list, tuple, set)):
+            for item in obj:
+                stack.append(item)
+                check(item, obj, None)
+        elif isinstance(obj, dict):
+            for key, item in obj.items():
+                stack.append(key)
+                stack.append(item)
+                check(key, obj, None)
+                check(item, obj, None)
+        elif isinstance(obj, ASTNode):
+            if id(obj) in visited:
+                continue
+            visited.add(id(obj))
+            for attr, item in obj.__getstate__().items():
+                if attr == 'values' and type(obj) is ConstantList:
+                    # values of constants in the list
+                    for i, value in enumerate(item):
+                        check(value, item, i)
+                    continue
+                stack.append(item)
+                check(item, obj, attr)
+    return found
+
+
+class QueryTemplate:
+    """
+    Parsed query where constants from literals of the query are replaced by slots
+
+    :param data: serialized tuple (ast, list of slot places): place is Constant or (list of ConstantList values, index)
+    :param slots: for every literal token: (position in list of slot places, negated)
+    """
+
+    def __init__(self, data, slots):
+        self.data = data
+        self.slots = slots
+
+    def bind(self, values):
+        ast, places = pickle.loads(self.data)
+        for (pos, negated), value in zip(self.slots, values):
+            if negated:
+                value = -value
+            place = places[pos]
+            if type(place) is tuple:
+                items, i = place
+                items[i] = value
+            else:
+                place.value = value
+        return ast
+
+
+class TemplateCache:
+    """
+    Cache of parsed statement templates.
+
+    Queries with the same tokens but different literals (numbers and strings) have the same template:
+    the template is parsed once and for other queries the AST is cloned from it and constants are filled
+    with literals of the query, LALR parser is not used.
+
+    Literals which are not turned into constants by grammar (like identifiers in double quotes,
+    parameters in USING or text of a view) make the template not bindable, such queries are always parsed.
+
+    :param max_size: max count of templates in cache
+    """
+
+    def __init__(self, max_size=1000):
+        self.max_size = max_size
+
+        self._items = OrderedDict()  # key: QueryTemplate or None if template is not bindable
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.not_bindable = 0
+
+    @staticmethod
+    def get_key(tokens, dialect):
+        """
+        Fingerprint of the token stream: values of the literals are replaced by slots
+        """
+        return (dialect,) + tuple(
+            (token.type, None) if token.type in LITERAL_TOKENS else (token.type, token.value)
+            for token in tokens
+        )
+
+    @staticmethod
+    def get_values(tokens):
+        return [
+            LITERAL_TOKENS[token.type](token.value)
+            for token in tokens
+            if token.type in LITERAL_TOKENS
+        ]
+
+    def parse(self, tokens, parser, dialect):
+        """
+        Returns AST of the query using cached template or parser
+        :param tokens: list of tokens of the query
+        :param parser: parser of the dialect, used to create template
+        """
+        key = self.get_key(tokens, dialect)
+
+        with self._lock:
+            exists = key in self._items
+            if exists:
+                template = self._items[key]
+                self._items.move_to_end(key)
+                if template is None:
+                    self.not_bindable += 1
+                else:
+                    self.hits += 1
+            else:
+                self.misses += 1
+
+        if exists:
+            if template is None:
+                return parser.parse(iter(tokens))
+            return template.bind(self.get_values(tokens))
+
+        ast = parser.parse(iter(tokens))
+        template = self.make_template(tokens, parser, ast)
+
+        with self._lock:
+            self._items[key] = template
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return ast
+
+    def make_template(self, tokens, parser, ast):
+        """
+        Parses the query with probe values instead of literals and finds constants for them in AST.
+        Returns None if template can't be used for the query
+        """
+        probe_tokens = []
+        probes = {}
+        for token in tokens:
+            if token.type in LITERAL_TOKENS:
+                token2 = Token()
+                token2.type = token.type
+                token2.id = token.id
+                token2.value = probe_value(token.type, len(probes))
+                token2.lines = token.lines
+                token2.index = token.index
+                token2.end = token.end
+                token2.text = token.text
+
+                value = LITERAL_TOKENS[token.type](token2.value)
+                probes[(type(value), value)] = len(probes)
+                token = token2
+            probe_tokens.append(token)
+
+        if len(probes) == 0:
+            return None
+
+        try:
+            probe_ast = parser.parse(iter(probe_tokens))
+        except Exception:
+            return None
+
+        # every literal have to be used once: as the value of Constant or the item of ConstantList
+        found = find_values(probe_ast, probes)
+        places = []
+        slots = []
+        for num in range(len(probes)):
+            found_places = found.get(num, [])
+            if len(found_places) != 1:
+                return None
+            obj, attr, negated = found_places[0]
+            if type(obj) is Constant and attr == 'value':
+                place = obj
+            elif type(obj) is list and type(attr) is int:
+                place = (obj, attr)
+            else:
+                return None
+            slots.append((len(places), negated))
+            places.append(place)
+
+        template = QueryTemplate(pickle.dumps((probe_ast, places), protocol=pickle.HIGHEST_PROTOCOL), slots)
+
+        # check the template against the parsed query
+        try:
+            if template.bind(self.get_values(tokens)) != ast:
+                return None
+        except Exception:
+            return None
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'size': len(self._items),
+                'hits': self.hits,
+                'misses': self.misses,
+                'not_bindable': self.not_bindable,
+            }
+
+    def __len__(self):
+        return len(self._items)
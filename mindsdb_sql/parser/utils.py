@@ -1,6 +1,18 @@
+import os
+
 from mindsdb_sql.exceptions import ParsingException
 
 
+def get_tables_cachedir():
+    # directory to cache parser tables between runs
+    #   can be changed with MINDSDB_SQL_CACHE_DIR env variable, empty value disables caching
+    cachedir = os.environ.get('MINDSDB_SQL_CACHE_DIR')
+    if cachedir is None:
+        cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+        cachedir = os.path.join(cache_home, 'mindsdb_sql')
+    return cachedir or None
+
+
 def indent(level):
     return '  ' * level
 
@@ -59,33 +71,7 @@ def to_single_line(text):
     return text
 
 
-def tokens_to_string(tokens):
-    # converts list of token (after lexer) to original string
-
-    line_num = tokens[0].lineno
-    shift = tokens[0].index
-    last_pos = 0
-    content, line = '', ''
-
-    for token in tokens:
-        if token.lineno != line_num:
-            # go to new line
-            content += line + '\n'
-            line = ''
-            line_num = token.lineno
-
-            # because sly parser store only absolute position index:
-            #   memorizing last token index to shift next lne
-            shift = last_pos + 1
-
-        # filling space between tokens
-        line += ' '*(token.index - shift - len(line))
-
-        # add token
-        line += token.value
-
-        last_pos = token.index + len(token.value)
-
-    # last line
-    content += line
-    return content
+def raw_query_to_string(raw_query):
+    # raw query is kept by parser as position in original text: (text, start, end)
+    text, start, end = raw_query
+    return text[start:end]
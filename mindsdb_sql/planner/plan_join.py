@@ -1,5 +1,4 @@
 from typing import List
-import copy
 from dataclasses import dataclass, field
 
 from mindsdb_sql.exceptions import PlanningException
@@ -68,7 +67,7 @@ class PlanJoin:
         # send join to integration as is?
         integration_to_send = self.check_single_integration(query)
         if integration_to_send:
-            self.planner.prepare_integration_select(integration_to_send, query)
+            query = self.planner.prepare_integration_select(integration_to_send, query)
 
             last_step = self.planner.plan.add_step(FetchDataframeStep(integration=integration_to_send, query=query))
             return last_step
@@ -91,8 +90,14 @@ class PlanJoinTablesQuery:
 
         self.partition = None
 
+        # conditions which are executed by models, they are replaced with 0=0 in the query: {id(node): node}
+        self.excluded_conditions = None
+
     def plan(self, query):
         self.tables_idx = {}
+        self.excluded_conditions = {}
+        # planning changes fields of the query: use shallow copy
+        query = query.replace()
         join_step = self.plan_join_tables(query)
 
         if (
@@ -106,9 +111,7 @@ class PlanJoinTablesQuery:
                 or len(query.targets) != 1
                 or not isinstance(query.targets[0], Star)
         ):
-            query2 = copy.deepcopy(query)
-            query2.from_table = None
-            query2.using = None
+            query2 = query.replace(from_table=None, using=None)
             sup_select = QueryStep(query2, from_table=join_step.result)
             self.planner.plan.add_step(sup_select)
             return sup_select
@@ -116,7 +119,7 @@ class PlanJoinTablesQuery:
 
     def resolve_table(self, table):
         # gets integration for table and name to access to it
-        table = copy.deepcopy(table)
+        table = table.clone()
         # get possible table aliases
         aliases = []
         if table.alias is not None:
@@ -137,12 +140,10 @@ class PlanJoinTablesQuery:
             else:
                 integration = self.planner.default_namespace
 
-        if integration is None and not hasattr(table, 'sub_select'):
+        if integration is None and table.sub_select is None:
             raise PlanningException(f'Integration not found for: {table}')
 
-        sub_select = getattr(table, 'sub_select', None)
-
-        return TableInfo(integration, table, aliases, conditions=[], sub_select=sub_select)
+        return TableInfo(integration, table, aliases, conditions=[], sub_select=table.sub_select)
 
     def get_table_for_column(self, column: Identifier):
 
@@ -207,7 +208,7 @@ class PlanJoinTablesQuery:
 
         # checked, find table and store condition
 
-        node2 = copy.deepcopy(node)
+        node2 = node.clone()
 
         arg1 = node2.args[col_idx]
 
@@ -263,10 +264,11 @@ class PlanJoinTablesQuery:
 
         # plan all nested selects in 'where'
         find_selects = self.planner.get_nested_selects_plan_fnc(self.planner.default_namespace, force=True)
-        query_in.targets = query_traversal(query_in.targets, find_selects)
-        query_traversal(query_in.where, find_selects)
+        query_in.targets = query_traversal(query_in.targets, find_selects, copy_on_write=True)
+        query_in.where = query_traversal(query_in.where, find_selects, copy_on_write=True) or query_in.where
 
-        query = copy.deepcopy(query_in)
+        # the query isn't modified: changed nodes are copied
+        query = query_in
 
         # replace sub selects, with identifiers with links to original selects
         def replace_subselects(node, **args):
@@ -281,7 +283,9 @@ class PlanJoinTablesQuery:
                 node2.sub_select = node
                 return node2
 
-        query_traversal(query.from_table, replace_subselects)
+        from_table = query_traversal(query.from_table, replace_subselects, copy_on_write=True)
+        if from_table is not None:
+            query = query.replace(from_table=from_table)
 
         # get all join tables, form join sequence
         join_sequence = self.get_join_sequence(query.from_table)
@@ -297,9 +301,15 @@ class PlanJoinTablesQuery:
                     # # replace identifies name
                     col_parts = list(table_info.aliases[-1])
                     col_parts.append(node.parts[-1])
-                    node.parts = col_parts
+                    if col_parts != node.parts:
+                        return node.replace(parts=col_parts)
 
-        query_traversal(query, _check_identifiers)
+        from_table = query.from_table
+        query = query_traversal(query, _check_identifiers, copy_on_write=True) or query
+        if query.from_table is not from_table:
+            # join conditions were changed: get sequence from the new query
+            self.tables_idx = {}
+            join_sequence = self.get_join_sequence(query.from_table)
 
         self.check_query_conditions(query)
 
@@ -328,27 +338,35 @@ class PlanJoinTablesQuery:
                 step_right = self.step_stack.pop()
                 step_left = self.step_stack.pop()
 
-                new_join = copy.deepcopy(item)
-
                 # TODO
-                new_join.left = Identifier('tab1')
-                new_join.right = Identifier('tab2')
-                new_join.implicit = False
+                new_join = item.replace(
+                    left=Identifier('tab1'),
+                    right=Identifier('tab2'),
+                    implicit=False,
+                    condition=self.exclude_conditions(item.condition),
+                )
 
                 step = self.add_plan_step(JoinStep(left=step_left.result, right=step_right.result, query=new_join))
 
                 self.step_stack.append(step)
 
-        query_in.where = query.where
+        query_in.where = self.exclude_conditions(query.where)
 
         self.close_partition()
         return self.step_stack.pop()
 
+    def exclude_conditions(self, node):
+        # returns condition where excluded conditions are replaced with 0=0, the condition itself is not changed
+        def _exclude_condition(node, **kwargs):
+            if id(node) in self.excluded_conditions:
+                return node.replace(args=[Constant(0), Constant(0)])
+
+        return query_traversal(node, _exclude_condition, copy_on_write=True) or node
+
     def process_subselect(self, item):
         # is sub select
-        item.sub_select.alias = None
-        item.sub_select.parentheses = False
-        step = self.planner.plan_select(item.sub_select)
+        sub_select = item.sub_select.replace(alias=None, parentheses=False)
+        step = self.planner.plan_select(sub_select)
 
         where = filters_to_bin_op(item.conditions)
 
@@ -384,7 +402,7 @@ class PlanJoinTablesQuery:
                     if self.get_table_for_column(col.field).table != item.table:
                         order_by = False
                         break
-                    col = copy.deepcopy(col)
+                    col = col.clone()
                     col.field.parts = [col.field.parts[-1]]
                     order_by.append(col)
 
@@ -435,7 +453,7 @@ class PlanJoinTablesQuery:
                 return
 
             # exclude condition
-            node.args = [Constant(0), Constant(0)]
+            self.excluded_conditions[id(node)] = node
 
         query_traversal(model_table.join_condition, _check_conditions)
         return columns_map
@@ -471,7 +489,7 @@ class PlanJoinTablesQuery:
                         row_dict[el.args[0].parts[-1]] = el.args[1].value
 
                     # exclude condition
-                    el._orig_node.args = [Constant(0), Constant(0)]
+                    self.excluded_conditions[id(el._orig_node)] = el._orig_node
 
         # params for model
         model_params = None
@@ -1,8 +1,7 @@
-import copy
-
 from mindsdb_sql import Latest, OrderBy, NullConstant
 from mindsdb_sql.exceptions import PlanningException
 from mindsdb_sql.parser.ast import (Select, Identifier, BetweenOperation, Join, Star, BinaryOperation, Constant)
+from mindsdb_sql.parser.ast.base import clone_value
 from mindsdb_sql.planner import utils
 from mindsdb_sql.planner.steps import (JoinStep, LimitOffsetStep, MultipleSteps, MapReduceStep,
                                        ApplyTimeseriesPredictorStep)
@@ -17,6 +16,8 @@ class PlanJoinTSPredictorQuery:
         self.planner = planner
 
     def adapt_dbt_query(self, query, integration):
+        # the query is changed: use copy
+        query = query.clone()
         orig_query = query
 
         join = query.from_table
@@ -196,7 +197,7 @@ class PlanJoinTSPredictorQuery:
         if len(predictor_group_by_names) > 0:
             allowed_columns += [i.lower() for i in predictor_group_by_names]
 
-        no_time_filter_query = copy.deepcopy(query)
+        no_time_filter_query = query.clone()
 
         preparation_where = no_time_filter_query.where
 
@@ -223,7 +224,7 @@ class PlanJoinTSPredictorQuery:
                 condition = order_field_not_null
             return condition
 
-        preparation_where2 = copy.deepcopy(preparation_where)
+        preparation_where2 = clone_value(preparation_where)
         preparation_where = add_order_not_null(preparation_where)
 
         # Obtain integration selects
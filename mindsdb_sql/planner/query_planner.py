@@ -1,13 +1,13 @@
-import copy
-
 from mindsdb_sql.exceptions import PlanningException
 from mindsdb_sql.parser import ast
+from mindsdb_sql.parser.stats import get_query_stats
+from mindsdb_sql.parser.intern import get_intern_table
 from mindsdb_sql.parser.ast import (Select, Identifier, Join, Star, BinaryOperation, Constant, Union, CreateTable,
                                     Function, Insert,
                                     Update, NativeQuery, Parameter, Delete)
 from mindsdb_sql.planner import utils
 from mindsdb_sql.planner.query_plan import QueryPlan
-from mindsdb_sql.planner.steps import (FetchDataframeStep, ProjectStep, ApplyPredictorStep,
+from mindsdb_sql.planner.steps import (PlanStep, FetchDataframeStep, ProjectStep, ApplyPredictorStep,
                                        ApplyPredictorRowStep, UnionStep, GetPredictorColumns, SaveToTable,
                                        InsertToTable, UpdateToTable, SubSelectStep,
                                        DeleteStep, DataStep, CreateTableStep)
@@ -26,8 +26,11 @@ class QueryPlanner:
                  integrations: list = None,
                  predictor_namespace=None,
                  predictor_metadata: list = None,
-                 default_namespace: str = None):
+                 default_namespace: str = None,
+                 dialect: str = 'mindsdb'):
         self.query = query
+        # dialect of the query: leaves of the plan are interned into its table (see InternTable(per_dialect=True))
+        self.dialect = dialect
         self.plan = QueryPlan()
 
         _projects = set()
@@ -124,33 +127,31 @@ class QueryPlanner:
         # replacement for 'utils.recursively_disambiguate_*' functions from utils
         #   main purpose: make tests working (don't change planner outputs)
         # can be removed in future (with adapting the tests) except 'cut integration part' block
+        # returns changed query, the query itself is not modified: changed identifiers and their parents are copied
 
         def _prepare_integration_select(node, is_table, is_target, parent_query, **kwargs):
             if not isinstance(node, Identifier):
                 return
 
-            # cut integration part
-            if len(node.parts) > 1 and node.parts[0].lower() == database:
-                node.parts.pop(0)
+            parts = node.parts
+            alias = node.alias
 
-            if not hasattr(parent_query, 'from_table'):
-                return
+            # cut integration part
+            if len(parts) > 1 and parts[0].lower() == database:
+                parts = parts[1:]
 
-            table = parent_query.from_table
-            if not is_table:
+            if hasattr(parent_query, 'from_table') and not is_table:
                 # add table name or alias for identifiers
-                if isinstance(table, Join):
-                    # skip for join
-                    return
-
+                #   skip for join
                 # keep column name for target
-                if is_target:
-                    if node.alias is None:
-                        last_part = node.parts[-1]
-                        if isinstance(last_part, str):
-                            node.alias = Identifier(parts=[node.parts[-1]])
+                if not isinstance(parent_query.from_table, Join) and is_target and alias is None:
+                    if isinstance(parts[-1], str):
+                        alias = Identifier(parts=[parts[-1]])
+
+            if parts is not node.parts or alias is not node.alias:
+                return node.replace(parts=parts, alias=alias)
 
-        query_traversal(query, _prepare_integration_select)
+        return query_traversal(query, _prepare_integration_select, copy_on_write=True) or query
 
     def get_integration_select_step(self, select):
         if isinstance(select.from_table, NativeQuery):
@@ -158,12 +159,11 @@ class QueryPlanner:
         else:
             integration_name, table = self.resolve_database_table(select.from_table)
 
-        fetch_df_select = copy.deepcopy(select)
-        self.prepare_integration_select(integration_name, fetch_df_select)
+        fetch_df_select = self.prepare_integration_select(integration_name, select)
 
         # remove predictor params
         if fetch_df_select.using is not None:
-            fetch_df_select.using = None
+            fetch_df_select = fetch_df_select.replace(using=None)
 
         return FetchDataframeStep(integration=integration_name, query=fetch_df_select)
 
@@ -240,7 +240,7 @@ class QueryPlanner:
                 ):
                     # need to execute in planner
 
-                    node.parentheses = False
+                    node = node.replace(parentheses=False)
                     last_step = self.plan_select(node)
 
                     node2 = Parameter(last_step.result)
@@ -271,8 +271,10 @@ class QueryPlanner:
         is_api_db = self.integrations.get(main_integration, {}).get('class_type') == 'api'
 
         find_selects = self.get_nested_selects_plan_fnc(main_integration, force=is_api_db)
-        query.targets = query_traversal(query.targets, find_selects)
-        query_traversal(query.where, find_selects)
+        targets = query_traversal(query.targets, find_selects, copy_on_write=True)
+        where = query_traversal(query.where, find_selects, copy_on_write=True)
+        if targets is not query.targets or where is not None:
+            query = query.replace(targets=targets, where=query.where if where is None else where)
 
         # get info of updated query
         query_info = self.get_query_info(query)
@@ -295,8 +297,6 @@ class QueryPlanner:
 
         # replace functions in conditions
 
-        query2 = query.copy()
-
         skipped_conditions = []
         def replace_functions(node, **kwargs):
             if not isinstance(node, BinaryOperation):
@@ -312,15 +312,14 @@ class QueryPlanner:
             if arg1.namespace is not None:
                 # clear
                 skipped_conditions.append(node)
-                node.args = [Constant(0), Constant(0)]
-                node.op = '='
-
-        query_traversal(query2.where, replace_functions)
+                return node.replace(args=[Constant(0), Constant(0)], op='=')
 
-        query2.targets = [Star()]
+        where = query_traversal(query.where, replace_functions, copy_on_write=True)
 
         # don't do aggregate
-        query2.having = None
+        query2 = query.replace(targets=[Star()], having=None, where=query.where if where is None else where)
+        # the query is changed only in the copy
+        query = query.replace()
 
         if query.group_by is not None:
             # if aggregation exists, do order and limit in subquery
@@ -353,8 +352,7 @@ class QueryPlanner:
         prev_step = self.plan_integration_select(query2)
 
         # clear limit and where
-        query.limit = None
-        query.where = None
+        query = query.replace(limit=None, where=None)
         return self.plan_sub_select(query, prev_step)
 
     def plan_nested_select(self, select):
@@ -378,9 +376,14 @@ class QueryPlanner:
         return self.plan_mdb_nested_select(select)
 
     def plan_integration_nested_select(self, select, integration_name):
-        fetch_df_select = copy.deepcopy(select)
-        deepest_select = get_deepest_select(fetch_df_select)
-        self.prepare_integration_select(integration_name, deepest_select)
+        # selects on the path to the deepest select are copied
+        path = [select]
+        while path[-1] is not get_deepest_select(path[-1]):
+            path.append(path[-1].from_table)
+
+        fetch_df_select = self.prepare_integration_select(integration_name, path.pop())
+        while path:
+            fetch_df_select = path.pop().replace(from_table=fetch_df_select)
         return self.plan.add_step(FetchDataframeStep(integration=integration_name, query=fetch_df_select))
 
     def plan_mdb_nested_select(self, select):
@@ -394,16 +397,14 @@ class QueryPlanner:
         # if subselect_alias is not None:
         #     subselect_alias = subselect_alias.parts[0]
 
-        select2 = copy.deepcopy(select.from_table)
-        select2.parentheses = False
-        select2.alias = None
+        select2 = select.from_table.replace(parentheses=False, alias=None)
         self.plan_select(select2)
         last_step = self.plan.steps[-1]
 
         return self.plan_sub_select(select, last_step)
 
     def get_predictor_namespace_and_name_from_identifier(self, identifier):
-        new_identifier = copy.deepcopy(identifier)
+        new_identifier = identifier.clone()
 
         info = self.get_predictor(identifier)
         namespace = info['integration_name']
@@ -462,9 +463,7 @@ class QueryPlanner:
         return project_step
 
     def plan_predictor(self, query, table, predictor_namespace, predictor):
-        int_select = copy.deepcopy(query)
-        int_select.targets = [Star()]  # TODO why not query.targets?
-        int_select.from_table = table
+        int_select = query.replace(targets=[Star()], from_table=table)  # TODO why not query.targets?
 
         predictor_alias = None
         if predictor.alias is not None:
@@ -509,7 +508,9 @@ class QueryPlanner:
         # find subselects
         main_integration, _ = self.resolve_database_table(table)
         find_selects = self.get_nested_selects_plan_fnc(main_integration, force=True)
-        query_traversal(int_select.where, find_selects)
+        where = query_traversal(int_select.where, find_selects, copy_on_write=True)
+        if where is not None:
+            int_select.where = where
 
         # split conditions
         query_traversal(int_select.where, split_filters)
@@ -635,9 +636,8 @@ class QueryPlanner:
             last_step = self.plan_select(query.from_select, integration=integration_name)
 
         # plan sub-select first
-        update_command = copy.deepcopy(query)
         # clear subselect
-        update_command.from_select = None
+        update_command = query.replace(from_select=None)
 
         table = query.table
         self.plan.add_step(UpdateToTable(
@@ -654,13 +654,13 @@ class QueryPlanner:
         is_api_db = self.integrations.get(main_integration, {}).get('class_type') == 'api'
 
         find_selects = self.get_nested_selects_plan_fnc(main_integration, force=is_api_db)
-        query_traversal(query.where, find_selects)
+        where = query_traversal(query.where, find_selects, copy_on_write=True) or query.where
 
-        self.prepare_integration_select(main_integration, query.where)
+        where = self.prepare_integration_select(main_integration, where)
 
         return self.plan.add_step(DeleteStep(
             table=query.table,
-            where=query.where
+            where=where
         ))
 
     def plan_select(self, query, integration=None):
@@ -706,8 +706,7 @@ class QueryPlanner:
             else:
                 table_name = None
 
-            query2 = copy.deepcopy(query)
-            query2.from_table = None
+            query2 = query.replace(from_table=None)
             sup_select = SubSelectStep(query2, prev_step.result, table_name=table_name, add_absent_cols=add_absent_cols)
             self.plan.add_step(sup_select)
             return sup_select
@@ -725,11 +724,18 @@ class QueryPlanner:
 
     # method for compatibility
     def from_query(self, query=None):
-        self.plan = QueryPlan()
-
         if query is None:
             query = self.query
 
+        stats = get_query_stats()
+        if stats is None:
+            return self._plan_query(query)
+        with stats.measure('plan', query):
+            return self._plan_query(query)
+
+    def _plan_query(self, query):
+        self.plan = QueryPlan()
+
         if isinstance(query, Select):
             self.plan_select(query)
         elif isinstance(query, Union):
@@ -745,8 +751,27 @@ class QueryPlanner:
         else:
             raise PlanningException(f'Unsupported query type {type(query)}')
 
+        intern_table = get_intern_table()
+        if intern_table is not None and intern_table.plans:
+            for step in self.plan.steps:
+                self.intern_step(intern_table, step)
+
         return self.plan
 
+    def intern_step(self, intern_table, step):
+        # replaces leaves in AST of the step with interned leaves,
+        #   AST of the steps can share nodes with the query: it is not modified, changed nodes are copied
+        for name, value in vars(step).items():
+            if isinstance(value, PlanStep):
+                self.intern_step(intern_table, value)
+            elif isinstance(value, list) and len(value) > 0 and isinstance(value[0], PlanStep):
+                for step2 in value:
+                    self.intern_step(intern_table, step2)
+            else:
+                value2 = intern_table.intern_tree(value, self.dialect, copy_on_write=True)
+                if value2 is not value:
+                    setattr(step, name, value2)
+
     def prepare_steps(self, query):
         statement_planner = PreparedStatementPlanner(self)
 
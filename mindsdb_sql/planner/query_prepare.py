@@ -1,4 +1,3 @@
-import copy
 from mindsdb_sql.parser import ast
 from mindsdb_sql.exceptions import PlanningException
 from mindsdb_sql.planner import steps
@@ -458,7 +457,7 @@ class PreparedStatementPlanner():
 
         self.planner.query = query
 
-        query = copy.deepcopy(query)
+        query = query.clone()
 
         params = utils.get_query_params(query)
 
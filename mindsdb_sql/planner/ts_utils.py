@@ -6,88 +6,130 @@ from mindsdb_sql.parser.ast import Identifier, Operation, BinaryOperation, Betwe
 def find_time_filter(op, time_column_name):
     if not op:
         return
-    if op.op == 'and':
-        left = find_time_filter(op.args[0], time_column_name)
-        right = find_time_filter(op.args[1], time_column_name)
-        if left and right:
-            raise PlanningException('Can provide only one filter by predictor order_by column, found two')
-
-        return left or right
-    elif ((isinstance(op.args[0], Identifier) and op.args[0].parts[-1].lower() == time_column_name.lower()) or
-          (isinstance(op.args[1], Identifier) and op.args[1].parts[-1].lower() == time_column_name.lower())):
-        return op
+    # conditions joined by AND are checked without recursion: the chain can be long
+    found = None
+    stack = [op]
+    while stack:
+        op = stack.pop()
+        if op.op == 'and':
+            stack.append(op.args[1])
+            stack.append(op.args[0])
+        elif ((isinstance(op.args[0], Identifier) and op.args[0].parts[-1].lower() == time_column_name.lower()) or
+              (isinstance(op.args[1], Identifier) and op.args[1].parts[-1].lower() == time_column_name.lower())):
+            if found is not None:
+                raise PlanningException('Can provide only one filter by predictor order_by column, found two')
+            found = op
+    return found
+
+
+def is_time_filter(op, time_filter):
+    # operations with different operators are not equal: they are not compared by text
+    if isinstance(op, Operation) and isinstance(time_filter, Operation) and op.op != time_filter.op:
+        return False
+    return op == time_filter
 
 
 def replace_time_filter(op, time_filter, new_filter):
-    if op == time_filter:
+    if is_time_filter(op, time_filter):
         return new_filter
-    if isinstance(op, BinaryOperation):
-        op.args[0] = replace_time_filter(op.args[0], time_filter, new_filter)
-        op.args[1] = replace_time_filter(op.args[1], time_filter, new_filter)
+    stack = [op]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, BinaryOperation):
+            for i, arg in enumerate(node.args):
+                if is_time_filter(arg, time_filter):
+                    node.args[i] = new_filter
+                else:
+                    stack.append(arg)
     return op
 
 
 def find_and_remove_time_filter(op, time_filter):
-    if isinstance(op, BinaryOperation) or isinstance(op, BetweenOperation):
-        if op == time_filter:
-            return None
-        elif op.op == 'and':
-            # TODO maybe OR operation too?
-
-            # next level
-            left_arg = find_and_remove_time_filter(op.args[0], time_filter)
-            right_arg = find_and_remove_time_filter(op.args[1], time_filter)
+    # the condition is not modified, changed AND operations are copied
+    # AND operations are processed in postfix order without recursion,
+    #   results of processed operations are in the values stack
+    values = []
+    stack = [(op, False)]
+    while stack:
+        op, expanded = stack.pop()
+        if expanded:
+            right_arg = values.pop()
+            left_arg = values.pop()
 
             # if found in one arg return other
             if left_arg is None:
-                return right_arg
-            if right_arg is None:
-                return left_arg
-
-            op.args = [left_arg, right_arg]
-            return op
-
-    return op
+                values.append(right_arg)
+            elif right_arg is None:
+                values.append(left_arg)
+            elif left_arg is op.args[0] and right_arg is op.args[1]:
+                values.append(op)
+            else:
+                # operation can be shared with other queries: it is copied
+                values.append(op.replace(args=[left_arg, right_arg]))
+
+        elif isinstance(op, BinaryOperation) or isinstance(op, BetweenOperation):
+            if is_time_filter(op, time_filter):
+                values.append(None)
+            elif op.op == 'and':
+                # TODO maybe OR operation too?
+
+                # next level
+                stack.append((op, True))
+                stack.append((op.args[1], False))
+                stack.append((op.args[0], False))
+            else:
+                values.append(op)
+        else:
+            values.append(op)
+
+    return values[0]
 
 
 def validate_ts_where_condition(op, allowed_columns, allow_and=True):
     """Error if the where condition caontains invalid ops, is nested or filters on some column that's not time or partition"""
     if not op:
         return
-    allowed_ops = ['and', '>', '>=', '=', '<', '<=', 'between', 'in']
-    if not allow_and:
-        allowed_ops.remove('and')
-    if op.op not in allowed_ops:
-        raise PlanningException(
-            f'For time series predictors only the following operations are allowed in WHERE: {str(allowed_ops)}, found instead: {str(op)}.')
-
-    for arg in op.args:
-        if isinstance(arg, Identifier):
-            if arg.parts[-1].lower() not in allowed_columns:
-                raise PlanningException(
-                    f'For time series predictor only the following columns are allowed in WHERE: {str(allowed_columns)}, found instead: {str(arg)}.')
-            # remove alias
-            arg.parts = [arg.parts[-1]]
-
-    if isinstance(op.args[0], Operation):
-        validate_ts_where_condition(op.args[0], allowed_columns, allow_and=True)
-    if isinstance(op.args[1], Operation):
-        validate_ts_where_condition(op.args[1], allowed_columns, allow_and=True)
+    stack = [(op, allow_and)]
+    while stack:
+        op, allow_and = stack.pop()
+        allowed_ops = ['and', '>', '>=', '=', '<', '<=', 'between', 'in']
+        if not allow_and:
+            allowed_ops.remove('and')
+        if op.op not in allowed_ops:
+            raise PlanningException(
+                f'For time series predictors only the following operations are allowed in WHERE: {str(allowed_ops)}, found instead: {str(op)}.')
+
+        for arg in op.args:
+            if isinstance(arg, Identifier):
+                if arg.parts[-1].lower() not in allowed_columns:
+                    raise PlanningException(
+                        f'For time series predictor only the following columns are allowed in WHERE: {str(allowed_columns)}, found instead: {str(arg)}.')
+                # remove alias
+                arg.parts = [arg.parts[-1]]
+
+        # nested operations are checked without recursion, in the same order
+        if isinstance(op.args[1], Operation):
+            stack.append((op.args[1], True))
+        if isinstance(op.args[0], Operation):
+            stack.append((op.args[0], True))
 
 
 def recursively_check_join_identifiers_for_ambiguity(item, aliased_fields=None):
-    if item is None:
-        return
-    elif isinstance(item, Identifier):
-        if len(item.parts) == 1:
-            if aliased_fields is not None and item.parts[0] in aliased_fields:
-                # is alias
-                return
-            raise PlanningException(f'Ambigous identifier {str(item)}, provide table name for operations on a join.')
-    elif isinstance(item, Operation):
-        recursively_check_join_identifiers_for_ambiguity(item.args, aliased_fields=aliased_fields)
-    elif isinstance(item, OrderBy):
-        recursively_check_join_identifiers_for_ambiguity(item.field, aliased_fields=aliased_fields)
-    elif isinstance(item, list):
-        for arg in item:
-            recursively_check_join_identifiers_for_ambiguity(arg, aliased_fields=aliased_fields)
+    # without recursion: operations can be deeply nested
+    stack = [item]
+    while stack:
+        item = stack.pop()
+        if item is None:
+            continue
+        elif isinstance(item, Identifier):
+            if len(item.parts) == 1:
+                if aliased_fields is not None and item.parts[0] in aliased_fields:
+                    # is alias
+                    continue
+                raise PlanningException(f'Ambigous identifier {str(item)}, provide table name for operations on a join.')
+        elif isinstance(item, Operation):
+            stack.append(item.args)
+        elif isinstance(item, OrderBy):
+            stack.append(item.field)
+        elif isinstance(item, list):
+            stack.extend(reversed(item))
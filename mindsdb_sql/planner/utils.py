@@ -24,7 +24,7 @@ from mindsdb_sql.parser import ast
 
 
 def get_predictor_name_identifier(identifier):
-    new_identifier = copy.deepcopy(identifier)
+    new_identifier = identifier.clone()
     if len(new_identifier.parts) > 1:
         new_identifier.parts.pop(0)
     return new_identifier
@@ -41,38 +41,46 @@ def disambiguate_predictor_column_identifier(identifier, predictor):
     return new_identifier
 
 def recursively_extract_column_values(op, row_dict, predictor):
-    if isinstance(op, BinaryOperation) and op.op == '=':
-        id = op.args[0]
-        value = op.args[1]
-
-        # if (
-        #     isinstance(value, UnaryOperation)
-        #     and value.op == '-'
-        #     and isinstance(value.args[0], Constant)
-        # ):
-        #     value = Constant(-value.args[0].value)
-
-        if not (
-                isinstance(id, Identifier)
-                and
-                (isinstance(value, Constant) or isinstance(value, Parameter))
-        ):
-            raise PlanningException(f'The WHERE clause for selecting from a predictor'
-                                    f' must contain pairs \'Identifier(...) = Constant(...)\','
-                                    f' found instead: {id.to_tree()}, {value.to_tree()}')
-
-        id = disambiguate_predictor_column_identifier(id, predictor)
-
-        if str(id) in row_dict:
-            raise PlanningException(f'Multiple values provided for {str(id)}')
-        if isinstance(value, Constant):
-            value = value.value
-        row_dict[str(id)] = value
-    elif isinstance(op, BinaryOperation) and op.op == 'and':
-        recursively_extract_column_values(op.args[0], row_dict, predictor)
-        recursively_extract_column_values(op.args[1], row_dict, predictor)
-    else:
-        raise PlanningException(f'Only \'and\' and \'=\' operations allowed in WHERE clause, found: {op.to_tree()}')
+    # conditions joined by AND are extracted without recursion: the chain can be long
+    stack = [op]
+    while stack:
+        op = stack.pop()
+        if isinstance(op, BinaryOperation) and op.op == '=':
+            id = op.args[0]
+            value = op.args[1]
+
+            # if (
+            #     isinstance(value, UnaryOperation)
+            #     and value.op == '-'
+            #     and isinstance(value.args[0], Constant)
+            # ):
+            #     value = Constant(-value.args[0].value)
+
+            if not (
+                    isinstance(id, Identifier)
+                    and
+                    (isinstance(value, Constant) or isinstance(value, Parameter))
+            ):
+                raise PlanningException(f'The WHERE clause for selecting from a predictor'
+                                        f' must contain pairs \'Identifier(...) = Constant(...)\','
+                                        f' found instead: {id.to_tree()}, {value.to_tree()}')
+
+            id = disambiguate_predictor_column_identifier(id, predictor)
+
+            if str(id) in row_dict:
+                raise PlanningException(f'Multiple values provided for {str(id)}')
+            if isinstance(value, Constant):
+                value = value.value
+            row_dict[str(id)] = value
+        elif isinstance(op, BinaryOperation) and op.op == 'and':
+            stack.append(op.args[1])
+            stack.append(op.args[0])
+        else:
+            # the condition can be long: only its beginning is shown
+            op_str = str(op)
+            if len(op_str) > 200:
+                op_str = op_str[:200] + '...'
+            raise PlanningException(f'Only \'and\' and \'=\' operations allowed in WHERE clause, found: {op_str}')
 
 
 def get_deepest_select(select):
@@ -81,224 +89,286 @@ def get_deepest_select(select):
     return get_deepest_select(select.from_table)
 
 
-def query_traversal(node, callback, is_table=False, is_target=False, parent_query=None):
+def query_traversal(node, callback, is_table=False, is_target=False, parent_query=None, copy_on_write=False):
     '''
     :param node: element
     :param callback: function applied to every element
     :param is_table: it is table in query
     :param is_target: it is the target in select
     :param parent_query: current query (select/update/create/...) where we are now
+    :param copy_on_write: don't modify the tree: the nodes on the path to replaced elements are copied,
+       unchanged sub-trees are shared by the original and the new tree. parent_query is an original node
     :return:
        new element if it is needed to be replaced
        or None to keep element and traverse over it
+       with copy_on_write: new tree if something was replaced in it, otherwise None
+    Items of ConstantList are not traversed while they are constants
     '''
+    # deep trees (long conditions) are traversed without recursion:
+    #   _traverse yields children and gets results of their traversal back
+    stack = [_traverse(node, callback, is_table=is_table, is_target=is_target, parent_query=parent_query,
+                       copy_on_write=copy_on_write)]
+    result = None
+    while True:
+        try:
+            child, kwargs = stack[-1].send(result)
+        except StopIteration as e:
+            stack.pop()
+            if not stack:
+                return e.value
+            result = e.value
+            continue
+        if type(child) in _leaf_types:
+            # nothing to traverse inside
+            result = callback(child, is_table=kwargs.get('is_table', False),
+                              is_target=kwargs.get('is_target', False), parent_query=kwargs['parent_query'])
+        else:
+            stack.append(_traverse(child, callback, copy_on_write=copy_on_write, **kwargs))
+            result = None
+
+
+# exact types of elements without children
+_leaf_types = frozenset([ast.Identifier, ast.Constant, ast.NullConstant, ast.Star, ast.Parameter])
+
+
+def _traverse_items(items, kwargs, flatten=False):
+    # traversal of the list of elements, returns new list if any element was replaced, otherwise None
+    #   flatten: element can be replaced by list of elements
+    array = None
+    for i, item in enumerate(items):
+        item2 = yield (item, kwargs)
+        if not item2:
+            if array is not None:
+                array.append(item)
+            continue
+        if array is None:
+            array = list(items[:i])
+        if flatten and isinstance(item2, list):
+            array.extend(item2)
+        else:
+            array.append(item2)
+    return array
+
+
+def _traverse(node, callback, is_table=False, is_target=False, parent_query=None, copy_on_write=False):
     # traversal query tree to find and replace nodes
+    #   traversal of a child is requested by: yield (child, kwargs)
+    #   replaced children are assigned to the node as soon as they are returned,
+    #   in copy_on_write mode they are collected in changes and applied to a copy at the end
 
     res = callback(node, is_table=is_table, is_target=is_target, parent_query=parent_query)
     if res is not None:
         # node is going to be replaced
         return res
 
+    changes = {}
+
+    def change(name, value):
+        if copy_on_write:
+            changes[name] = value
+        else:
+            # callbacks of the next children have to see the replaced field
+            setattr(node, name, value)
+
     if isinstance(node, ast.Select):
         if node.from_table is not None:
-            node_out = query_traversal(node.from_table, callback, is_table=True, parent_query=node)
+            node_out = (yield (node.from_table, dict(is_table=True, parent_query=node)))
             if node_out is not None:
-                node.from_table = node_out
+                change('from_table', node_out)
 
-        array = []
-        for node2 in node.targets:
-            node_out = query_traversal(node2, callback, parent_query=node, is_target=True) or node2
-            if isinstance(node_out, list):
-                array.extend(node_out)
-            else:
-                array.append(node_out)
-        node.targets = array
+        array = yield from _traverse_items(node.targets, dict(parent_query=node, is_target=True), flatten=True)
+        if array is not None:
+            change('targets', array)
 
         if node.cte is not None:
-            array = []
-            for cte in node.cte:
-                node_out = query_traversal(cte.query, callback, parent_query=node) or cte
-                array.append(node_out)
-            node.cte = array
+            array = yield from _traverse_items([cte.query for cte in node.cte], dict(parent_query=node))
+            if array is not None:
+                # replaced query is used instead of CTE
+                change('cte', [
+                    cte if item is cte.query else item
+                    for cte, item in zip(node.cte, array)
+                ])
 
         if node.where is not None:
-            node_out = query_traversal(node.where, callback, parent_query=node)
+            node_out = (yield (node.where, dict(parent_query=node)))
             if node_out is not None:
-                node.where = node_out
+                change('where', node_out)
 
         if node.group_by is not None:
-            array = []
-            for node2 in node.group_by:
-                node_out = query_traversal(node2, callback, parent_query=node) or node2
-                array.append(node_out)
-            node.group_by = array
+            array = yield from _traverse_items(node.group_by, dict(parent_query=node))
+            if array is not None:
+                change('group_by', array)
 
         if node.having is not None:
-            node_out = query_traversal(node.having, callback, parent_query=node)
+            node_out = (yield (node.having, dict(parent_query=node)))
             if node_out is not None:
-                node.having = node_out
+                change('having', node_out)
 
         if node.order_by is not None:
-            array = []
-            for node2 in node.order_by:
-                node_out = query_traversal(node2, callback, parent_query=node) or node2
-                array.append(node_out)
-            node.order_by = array
+            array = yield from _traverse_items(node.order_by, dict(parent_query=node))
+            if array is not None:
+                change('order_by', array)
 
     elif isinstance(node, ast.Union):
-        node_out = query_traversal(node.left, callback, parent_query=node)
+        node_out = (yield (node.left, dict(parent_query=node)))
         if node_out is not None:
-            node.left = node_out
-        node_out = query_traversal(node.right, callback, parent_query=node)
+            change('left', node_out)
+        node_out = (yield (node.right, dict(parent_query=node)))
         if node_out is not None:
-            node.right = node_out
+            change('right', node_out)
 
     elif isinstance(node, ast.Join):
-        node_out = query_traversal(node.right, callback, is_table=True, parent_query=parent_query)
+        node_out = (yield (node.right, dict(is_table=True, parent_query=parent_query)))
         if node_out is not None:
-            node.right = node_out
-        node_out = query_traversal(node.left, callback, is_table=True, parent_query=parent_query)
+            change('right', node_out)
+        node_out = (yield (node.left, dict(is_table=True, parent_query=parent_query)))
         if node_out is not None:
-            node.left = node_out
+            change('left', node_out)
         if node.condition is not None:
-            node_out = query_traversal(node.condition, callback, parent_query=parent_query)
+            node_out = (yield (node.condition, dict(parent_query=parent_query)))
             if node_out is not None:
-                node.condition = node_out
+                change('condition', node_out)
 
     elif isinstance(node, (ast.Function, ast.BinaryOperation, ast.UnaryOperation, ast.BetweenOperation,
                            ast.Exists, ast.NotExists)):
-        array = []
-        for arg in node.args:
-            node_out = query_traversal(arg, callback, parent_query=parent_query) or arg
-            array.append(node_out)
-        node.args = array
+        array = yield from _traverse_items(node.args, dict(parent_query=parent_query))
+        if array is not None:
+            change('args', array)
 
     elif isinstance(node, ast.WindowFunction):
-        query_traversal(node.function, callback, parent_query=parent_query)
+        yield node.function, dict(parent_query=parent_query)
         if node.partition is not None:
-            array = []
-            for node2 in node.partition:
-                node_out = query_traversal(node2, callback, parent_query=parent_query) or node2
-                array.append(node_out)
-            node.partition = array
+            array = yield from _traverse_items(node.partition, dict(parent_query=parent_query))
+            if array is not None:
+                change('partition', array)
         if node.order_by is not None:
-            array = []
-            for node2 in node.order_by:
-                node_out = query_traversal(node2, callback, parent_query=parent_query) or node2
-                array.append(node_out)
-            node.order_by = array
+            array = yield from _traverse_items(node.order_by, dict(parent_query=parent_query))
+            if array is not None:
+                change('order_by', array)
 
     elif isinstance(node, ast.TypeCast):
-        node_out = query_traversal(node.arg, callback, parent_query=parent_query)
+        node_out = (yield (node.arg, dict(parent_query=parent_query)))
         if node_out is not None:
-            node.arg = node_out
+            change('arg', node_out)
+
+    elif isinstance(node, ast.ConstantList) and node.get_values() is not None:
+        # only constants: they are not traversed
+        pass
 
     elif isinstance(node, ast.Tuple):
-        array = []
-        for node2 in node.items:
-            node_out = query_traversal(node2, callback, parent_query=parent_query) or node2
-            array.append(node_out)
-        node.items = array
+        array = yield from _traverse_items(node.items, dict(parent_query=parent_query))
+        if array is not None:
+            change('items', array)
 
     elif isinstance(node, ast.Insert):
         if node.table is not None:
-            node_out = query_traversal(node.table, callback, is_table=True, parent_query=node)
+            node_out = (yield (node.table, dict(is_table=True, parent_query=node)))
             if node_out is not None:
-                node.table = node_out
-
-        if node.values is not None:
-            rows = []
-            for row in node.values:
-                items = []
-                for item in row:
-                    item2 = query_traversal(item, callback, parent_query=node) or item
-                    items.append(item2)
-                rows.append(items)
-            node.values = rows
+                change('table', node_out)
+
+        if node.values is not None and not node.is_plain:
+            # plain values are not AST nodes
+            rows = None
+            for i, row in enumerate(node.values):
+                items = yield from _traverse_items(row, dict(parent_query=node))
+                if items is not None:
+                    if rows is None:
+                        rows = list(node.values)
+                    rows[i] = items
+            if rows is not None:
+                change('values', rows)
 
         if node.from_select is not None:
-            node_out = query_traversal(node.from_select, callback, parent_query=node)
+            node_out = (yield (node.from_select, dict(parent_query=node)))
             if node_out is not None:
-                node.from_select = node_out
+                change('from_select', node_out)
 
     elif isinstance(node, ast.Update):
         if node.table is not None:
-            node_out = query_traversal(node.table, callback, is_table=True, parent_query=node)
+            node_out = (yield (node.table, dict(is_table=True, parent_query=node)))
             if node_out is not None:
-                node.table = node_out
+                change('table', node_out)
 
         if node.where is not None:
-            node_out = query_traversal(node.where, callback, parent_query=node)
+            node_out = (yield (node.where, dict(parent_query=node)))
             if node_out is not None:
-                node.where = node_out
+                change('where', node_out)
 
         if node.update_columns is not None:
-            changes = {}
+            columns = None
             for k, v in node.update_columns.items():
-                v2 = query_traversal(v, callback, parent_query=node)
+                v2 = (yield (v, dict(parent_query=node)))
                 if v2 is not None:
-                    changes[k] = v2
-            if changes:
-                node.update_columns.update(changes)
+                    if columns is None:
+                        columns = dict(node.update_columns)
+                    columns[k] = v2
+            if columns is not None:
+                change('update_columns', columns)
 
         if node.from_select is not None:
-            node_out = query_traversal(node.from_select, callback, parent_query=node)
+            node_out = (yield (node.from_select, dict(parent_query=node)))
             if node_out is not None:
-                node.from_select = node_out
+                change('from_select', node_out)
 
     elif isinstance(node, ast.CreateTable):
-        array = []
         if node.columns is not None:
-            for node2 in node.columns:
-                node_out = query_traversal(node2, callback, parent_query=node) or node2
-                array.append(node_out)
-            node.columns = array
+            array = yield from _traverse_items(node.columns, dict(parent_query=node))
+            if array is not None:
+                change('columns', array)
 
         if node.name is not None:
-            node_out = query_traversal(node.name, callback, is_table=True, parent_query=node)
+            node_out = (yield (node.name, dict(is_table=True, parent_query=node)))
             if node_out is not None:
-                node.name = node_out
+                change('name', node_out)
 
         if node.from_select is not None:
-            node_out = query_traversal(node.from_select, callback, parent_query=node)
+            node_out = (yield (node.from_select, dict(parent_query=node)))
             if node_out is not None:
-                node.from_select = node_out
+                change('from_select', node_out)
 
     elif isinstance(node, ast.Delete):
         if node.where is not None:
-            node_out = query_traversal(node.where, callback, parent_query=node)
+            node_out = (yield (node.where, dict(parent_query=node)))
             if node_out is not None:
-                node.where = node_out
+                change('where', node_out)
 
     elif isinstance(node, ast.OrderBy):
         if node.field is not None:
-            node_out = query_traversal(node.field, callback, parent_query=parent_query)
+            node_out = (yield (node.field, dict(parent_query=parent_query)))
             if node_out is not None:
-                node.field = node_out
+                change('field', node_out)
 
     elif isinstance(node, ast.Case):
-        rules = []
-        for condition, result in node.rules:
-            condition2 = query_traversal(condition, callback, parent_query=parent_query)
-            result2 = query_traversal(result, callback, parent_query=parent_query)
-
-            condition = condition if condition2 is None else condition2
-            result = result if result2 is None else result2
-            rules.append([condition, result])
-        node.rules = rules
-        default = query_traversal(node.default, callback, parent_query=parent_query)
+        rules = None
+        for i, (condition, result) in enumerate(node.rules):
+            condition2 = (yield (condition, dict(parent_query=parent_query)))
+            result2 = (yield (result, dict(parent_query=parent_query)))
+            if condition2 is not None or result2 is not None:
+                if rules is None:
+                    rules = list(node.rules)
+                rules[i] = [
+                    condition if condition2 is None else condition2,
+                    result if result2 is None else result2,
+                ]
+        if rules is not None:
+            change('rules', rules)
+        default = (yield (node.default, dict(parent_query=parent_query)))
         if default is not None:
-            node.default = default
+            change('default', default)
 
     elif isinstance(node, list):
-        array = []
-        for node2 in node:
-            node_out = query_traversal(node2, callback, parent_query=parent_query) or node2
-            array.append(node_out)
+        array = yield from _traverse_items(node, dict(parent_query=parent_query))
+        if array is None:
+            # list is always returned
+            return node if copy_on_write else list(node)
         return array
 
-    # keep original node
-    return None
+    if not changes:
+        # keep original node
+        return None
+
+    # new node is returned as replacement to the parent: the parent is copied too
+    return node.replace(**changes)
 
 
 def convert_join_to_list(join):
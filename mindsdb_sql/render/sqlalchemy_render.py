@@ -8,9 +8,11 @@ from sqlalchemy.orm import aliased
 from sqlalchemy.dialects import mysql, postgresql, sqlite, mssql, oracle
 from sqlalchemy.schema import CreateTable, DropTable
 from sqlalchemy.sql import ColumnElement
+from sqlalchemy.sql.elements import Grouping, ClauseList
 from sqlalchemy.sql import functions as sa_fnc
 
 from mindsdb_sql.parser import ast
+from mindsdb_sql.parser.stats import get_query_stats
 
 
 sa_type_names = [
@@ -175,22 +177,33 @@ class SqlalchemyRender:
                 "or": sa.or_,
             }
 
+            op = t.op.lower()
+            if op in functions:
+                # chain of conditions is one clause list: it is rendered without recursion
+                return self.to_boolean_clause(t, functions[op])
+
             arg0 = self.to_expression(t.args[0])
-            arg1 = self.to_expression(t.args[1])
+            if op in ('in', 'not in') and isinstance(t.args[1], ast.ConstantList) \
+                    and self.is_single_type(t.args[1].get_values()):
+                # all values in one expanding parameter, it is rendered in bulk
+                arg1 = sa.bindparam(None, t.args[1].get_values(), expanding=True)
+            else:
+                arg1 = self.to_expression(t.args[1])
 
-            op = t.op.lower()
             if op in ('in', 'not in'):
                 if isinstance(arg1, sa.sql.selectable.ColumnClause):
                     raise NotImplementedError(f'Required list argument for: {op}')
+            elif isinstance(arg1, list):
+                # tuple is compared as a row: (a, b) = (1, 2)
+                arg1 = sa.tuple_(*arg1)
+            if isinstance(arg0, list):
+                arg0 = sa.tuple_(*arg0)
 
             method = methods.get(op)
             if method is not None:
                 sa_op = getattr(arg0, method)
 
                 col = sa_op(arg1)
-            elif t.op.lower() in functions:
-                func = functions[t.op.lower()]
-                col = func(arg0, arg1)
             else:
                 col = arg0.op(t.op)(arg1)
 
@@ -269,6 +282,8 @@ class SqlalchemyRender:
                 self.to_expression(i)
                 for i in t.items
             ]
+            if t.alias:
+                col = Grouping(ClauseList(*col)).label(self.get_alias(t.alias))
         elif isinstance(t, ast.Variable):
             col = sa.column(t.to_string(), is_literal=True)
         elif isinstance(t, ast.Latest):
@@ -287,6 +302,17 @@ class SqlalchemyRender:
 
         return col
 
+    def to_boolean_clause(self, t, func):
+        col = func(*[self.to_expression(arg) for arg in t.get_operands()])
+        if t.alias:
+            col = col.label(self.get_alias(t.alias))
+        return col
+
+    @staticmethod
+    def is_single_type(values):
+        # type of expanding parameter is taken from the first value
+        return values is not None and len(set(map(type, values))) == 1
+
     def prepare_case(self, t: ast.Case):
         conditions = []
         for condition, result in t.rules:
@@ -714,7 +740,12 @@ class SqlalchemyRender:
         :param with_failback:  switch to standard render in case of error
         :return:
         """
-        sql, _ = self.get_exec_params(ast_query, with_failback=with_failback, with_params=False)
+        stats = get_query_stats()
+        if stats is None:
+            sql, _ = self.get_exec_params(ast_query, with_failback=with_failback, with_params=False)
+            return sql
+        with stats.measure('render', ast_query):
+            sql, _ = self.get_exec_params(ast_query, with_failback=with_failback, with_params=False)
         return sql
 
     def get_exec_params(self, ast_query, with_failback=True, with_params=True):
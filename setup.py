@@ -1,4 +1,17 @@
+import subprocess
+import sys
+
 import setuptools
+from setuptools.command.build_py import build_py
+
+
+class BuildPyWithParserTables(build_py):
+    # generate LR tables of the parsers and ship them with the package
+
+    def run(self):
+        super().run()
+        subprocess.check_call([sys.executable, '-m', 'mindsdb_sql.parser.build_tables',
+                               '--output-dir', self.build_lib])
 
 about = {}
 with open("mindsdb_sql/__about__.py") as fp:
@@ -19,6 +32,7 @@ setuptools.setup(
     description=about['__description__'],
     packages=setuptools.find_packages(exclude=('tests*',)),
     install_requires=requirements,
+    cmdclass={'build_py': BuildPyWithParserTables},
     classifiers=[
         "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
@@ -31,10 +31,12 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # -----------------------------------------------------------------------------
 
-__all__ = ['Lexer', 'LexerStateChange', 'Token']
+__all__ = ['Lexer', 'LexerStateChange', 'Token', 'LineIndex']
 
 import re
 import copy
+import threading
+from bisect import bisect_left
 
 class LexError(Exception):
     '''
@@ -69,11 +71,127 @@ class LexerStateChange(Exception):
         self.newstate = newstate
         self.tok = tok
 
+# Integer ids of token types. They are shared by all lexers and parsers, so
+# a parser can use the id from any lexer to index its tables
+_token_ids = {}
+_token_ids_lock = threading.Lock()
+
+def token_id(name):
+    '''
+    Returns integer id of the token type, the first id is 1
+    '''
+    tid = _token_ids.get(name)
+    if tid is None:
+        with _token_ids_lock:
+            tid = _token_ids.get(name)
+            if tid is None:
+                tid = _token_ids[name] = len(_token_ids) + 1
+    return tid
+
+# rule of the lexer which is a keyword: \bNAME\b
+_keyword_rule_re = re.compile(r'\\b([A-Za-z_][A-Za-z0-9_]*)\\b')
+# the first word of the rule: \bNAME...
+_keyword_prefix_re = re.compile(r'\\b([A-Za-z_][A-Za-z0-9_]*)')
+
+# the rule for all words in lexers with keyword_lookup
+_KEYWORD = '_keyword'
+_word_pattern = r'\b[^\W\d]\w*'
+
+
+def _group_token_ids(regex):
+    # token ids by the index of the matched group of the regex
+    group_ids = [None] * (regex.groups + 1)
+    for tokname, index in regex.groupindex.items():
+        group_ids[index] = token_id(tokname)
+    return group_ids
+
+
+class LineIndex(object):
+    '''
+    Line numbers and columns of offsets in the text.
+    Offsets of newlines are found at the first request, once for the text,
+    then every request is a binary search.
+    lineno is the number of the line at offset start.
+    '''
+    __slots__ = ('text', 'first_lineno', 'start', '_newlines', '_first_line_start')
+
+    def __init__(self, text, lineno=1, start=0):
+        self.text = text
+        self.first_lineno = lineno
+        self.start = start
+        self._newlines = None
+
+    def _build(self):
+        text = self.text
+        newlines = []
+        pos = text.find('\n', self.start)
+        while pos != -1:
+            newlines.append(pos)
+            pos = text.find('\n', pos + 1)
+        self._newlines = newlines
+        self._first_line_start = text.rfind('\n', 0, self.start) + 1
+        return newlines
+
+    def lineno(self, index):
+        '''
+        Line number of the offset
+        '''
+        newlines = self._newlines
+        if newlines is None:
+            newlines = self._build()
+        return self.first_lineno + bisect_left(newlines, index)
+
+    def line_start(self, lineno):
+        '''
+        Offset of the first char of the line
+        '''
+        newlines = self._newlines
+        if newlines is None:
+            newlines = self._build()
+        i = lineno - self.first_lineno
+        if i <= 0:
+            return self._first_line_start
+        return newlines[min(i, len(newlines)) - 1] + 1
+
+    def line(self, lineno):
+        '''
+        Text of the line without newline
+        '''
+        start = self.line_start(lineno)
+        end = self.text.find('\n', start)
+        return self.text[start:] if end == -1 else self.text[start:end]
+
+    def column(self, index):
+        '''
+        Offset from the beginning of the line, starting from 0
+        '''
+        return index - self.line_start(self.lineno(index))
+
 class Token(object):
     '''
     Representation of a single token.
+    id is integer id of the type (see token_id)
+    text is the whole input of the lexer: text[index:end] is the source of the token
+    lines is LineIndex of the text: lineno and column are computed from the index when requested,
+    unless lineno is set explicitly
     '''
-    __slots__ = ('type', 'value', 'lineno', 'index', 'end')
+    __slots__ = ('type', 'id', 'value', 'index', 'end', 'text', 'lines', '_lineno')
+
+    @property
+    def lineno(self):
+        try:
+            return self._lineno
+        except AttributeError:
+            return self.lines.lineno(self.index)
+
+    @lineno.setter
+    def lineno(self, value):
+        self._lineno = value
+
+    @property
+    def column(self):
+        return self.lines.column(self.index)
+
     def __repr__(self):
         return f'Token(type={self.type!r}, value={self.value!r}, lineno={self.lineno}, index={self.index}, end={self.end})'
 
@@ -187,6 +305,8 @@ class Lexer(metaclass=LexerMeta):
     ignore = ''
     reflags = 0
     regex_module = re
+    # keywords (rules like NAME = r'\bNAME\b') are found by one regex for words and a lookup table
+    keyword_lookup = False
 
     _token_names = set()
     _token_funcs = {}
@@ -194,6 +314,10 @@ class Lexer(metaclass=LexerMeta):
     _remapping = {}
     _delete = {}
     _remap = {}
+    _keywords = {}
+    _keyword_id = None
+    _words_re = None
+    _words_group_ids = None
 
     # Internal attributes
     __state_stack = None
@@ -290,12 +414,30 @@ class Lexer(metaclass=LexerMeta):
 
         cls._collect_rules()
 
+        if cls.keyword_lookup and not cls.reflags & re.IGNORECASE:
+            raise LexerBuildError('keyword_lookup requires re.IGNORECASE in reflags')
+
         parts = []
+        keywords = {}
+        keywords_pos = None
         for tokname, value in cls._rules:
             if tokname.startswith('ignore_'):
                 tokname = tokname[7:]
                 cls._ignored_tokens.add(tokname)
 
+            elif cls.keyword_lookup and isinstance(value, str):
+                word = _keyword_rule_re.fullmatch(value)
+                if word:
+                    keywords[word.group(1).upper()] = tokname
+                    # the rule for words replaces the last keyword rule
+                    keywords_pos = len(parts)
+                    continue
+
+                word = _keyword_prefix_re.match(value)
+                if word and word.group(1).upper() in keywords:
+                    # like 'NOT IN' after 'NOT': it wouldn't be matched before the keyword
+                    raise LexerBuildError(f'Rule {tokname} has to be defined before keyword {word.group(1)}')
+
             if isinstance(value, str):
                 pattern = value
 
@@ -320,6 +462,18 @@ class Lexer(metaclass=LexerMeta):
 
             parts.append(part)
 
+        cls._keywords = keywords
+        if keywords_pos is not None:
+            # words which are not keywords are matched by the rules after the keywords
+            after_keywords = parts[keywords_pos:]
+            parts.insert(keywords_pos, f'(?P<{_KEYWORD}>{_word_pattern})')
+            cls._keyword_id = token_id(_KEYWORD)
+            if after_keywords:
+                cls._words_re = cls.regex_module.compile('|'.join(after_keywords), cls.reflags)
+                cls._words_group_ids = _group_token_ids(cls._words_re)
+            for tokname in keywords.values():
+                token_id(tokname)
+
         if not parts:
             return
 
@@ -328,6 +482,11 @@ class Lexer(metaclass=LexerMeta):
         # cls._master_re = cls.regex_module.compile('|'.join(parts) + previous, cls.reflags)
         cls._master_re = cls.regex_module.compile('|'.join(parts), cls.reflags)
 
+        # Token ids by the index of the matched group of the master regex
+        cls._group_ids = _group_token_ids(cls._master_re)
+        for tokname in cls._token_names | set(cls.literals):
+            token_id(tokname)
+
         # Verify that that ignore and literals specifiers match the input type
         if not isinstance(cls.ignore, str):
             raise LexerBuildError('ignore specifier must be a string')
@@ -360,17 +519,25 @@ class Lexer(metaclass=LexerMeta):
         self.begin(self.__state_stack.pop())
 
     def tokenize(self, text, lineno=1, index=0):
-        _ignored_tokens = _master_re = _ignore = _token_funcs = _literals = _remapping = None
+        _ignored_tokens = _master_re = _group_ids = _ignore = _token_funcs = _literals = _remapping = None
+        _keywords = _keyword_id = _words_re = _words_group_ids = None
+        _ids = _token_ids
 
         # --- Support for state changes
         def _set_state(cls):
-            nonlocal _ignored_tokens, _master_re, _ignore, _token_funcs, _literals, _remapping
+            nonlocal _ignored_tokens, _master_re, _group_ids, _ignore, _token_funcs, _literals, _remapping
+            nonlocal _keywords, _keyword_id, _words_re, _words_group_ids
             _ignored_tokens = cls._ignored_tokens
             _master_re = cls._master_re
+            _group_ids = cls._group_ids
             _ignore = cls.ignore
             _token_funcs = cls._token_funcs
             _literals = cls.literals
             _remapping = cls._remapping
+            _keywords = cls._keywords
+            _keyword_id = cls._keyword_id
+            _words_re = cls._words_re
+            _words_group_ids = cls._words_group_ids
 
         self.__set_state = _set_state
         _set_state(type(self))
@@ -394,6 +561,8 @@ class Lexer(metaclass=LexerMeta):
 
         # --- Main tokenization function
         self.text = text
+        # line numbers of tokens are computed from their offsets
+        lines = LineIndex(text, lineno, index)
         try:
             while True:
                 try:
@@ -404,16 +573,31 @@ class Lexer(metaclass=LexerMeta):
                     return
 
                 tok = Token()
-                tok.lineno = lineno
+                tok.lines = lines
                 tok.index = index
+                tok.text = text
                 m = _master_re.match(text, index)
+                if m:
+                    tok.type = m.lastgroup
+                    tok.id = _group_ids[m.lastindex]
+                    if tok.id == _keyword_id:
+                        tok.type = _keywords.get(m.group().upper())
+                        if tok.type is not None:
+                            tok.id = _ids[tok.type]
+                        else:
+                            # not a keyword
+                            m = _words_re.match(text, index) if _words_re else None
+                            if m:
+                                tok.type = m.lastgroup
+                                tok.id = _words_group_ids[m.lastindex]
+
                 if m:
                     tok.end = index = m.end()
                     tok.value = m.group()
-                    tok.type = m.lastgroup
 
                     if tok.type in _remapping:
                         tok.type = _remapping[tok.type].get(tok.value, tok.type)
+                        tok.id = _ids.get(tok.type) or token_id(tok.type)
 
                     if tok.type in _token_funcs:
                         self.index = index
@@ -423,6 +607,9 @@ class Lexer(metaclass=LexerMeta):
                         lineno = self.lineno
                         if not tok:
                             continue
+                        # the function could change the type and the end of the token
+                        tok.id = _ids.get(tok.type) or token_id(tok.type)
+                        tok.end = index
 
                     if tok.type in _ignored_tokens:
                         continue
@@ -435,6 +622,7 @@ class Lexer(metaclass=LexerMeta):
                         tok.value = text[index]
                         tok.end = index + 1
                         tok.type = tok.value
+                        tok.id = token_id(tok.type)
                         index += 1
                         yield tok
                     else:
@@ -446,6 +634,7 @@ class Lexer(metaclass=LexerMeta):
                         tok = self.error(tok)
                         if tok is not None:
                             tok.end = self.index
+                            tok.id = token_id(tok.type)
                             yield tok
 
                         index = self.index
@@ -31,9 +31,19 @@
 # OF THIS SOFTWARE, EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 # -----------------------------------------------------------------------------
 
+import os
 import sys
+import json
+import zlib
+import marshal
+import hashlib
 import inspect
-from collections import OrderedDict, defaultdict, Counter
+import tempfile
+import threading
+import importlib
+from collections import OrderedDict, defaultdict, Counter, namedtuple
+
+from .lex import token_id
 
 __all__        = [ 'Parser' ]
 
@@ -52,6 +62,7 @@ class YaccError(Exception):
 
 ERROR_COUNT = 3                # Number of symbols that must be shifted to leave recovery mode
 MAXINT = sys.maxsize
+TABLES_VERSION = 1             # Format version of cached LR tables. Change it to invalidate old caches
 
 # This object is a stand-in for a logging object created by the
 # logging module.   SLY will use this by default to create things
@@ -86,7 +97,38 @@ class SlyLogger(object):
 #        .index      = Starting lex position
 # ----------------------------------------------------------------------
 
+# Position of the rule in the input: offsets of the first and after the last character and line number
+Span = namedtuple('Span', ['start', 'end', 'lineno'])
+
+class ParseControl:
+    # requests from errok() and restart() to the running parse() of the current thread
+    __slots__ = ('errorok', 'restart')
+
+    def __init__(self):
+        self.errorok = False
+        self.restart = False
+
+# stacks of ParseControl of running parse() calls, per thread
+_parse_controls = threading.local()
+
 class YaccSymbol:
+    # lines is LineIndex of the first token of the symbol: lineno is computed from index when requested
+    __slots__ = ('type', 'id', 'value', 'index', 'end', 'lines', '_lineno')
+
+    @property
+    def lineno(self):
+        try:
+            return self._lineno
+        except AttributeError:
+            pass
+        if self.index is None or self.lines is None:
+            return None
+        return self.lines.lineno(self.index)
+
+    @lineno.setter
+    def lineno(self, value):
+        self._lineno = value
+
     def __str__(self):
         return self.type
 
@@ -149,17 +191,19 @@ class YaccProduction:
         return result
     
     def __getattr__(self, name):
-        if name in self._namemap:
-            return self._namemap[name](self._slice)
-        else:
+        # named symbols are resolved to positions when the grammar is built (see Production.namemap)
+        index = self._namemap.get(name)
+        if index is None:
             nameset = '{' + ', '.join(self._namemap) + '}'
             raise AttributeError(f'No symbol {name}. Must be one of {nameset}.')
+        if index.__class__ is int:
+            return self._slice[index].value
+        index, n = index
+        value = self._slice[index].value
+        # The value is either a list (for repetition) or a tuple for optional
+        return [x[n] for x in value] if isinstance(value, list) else value[n]
 
-    def __setattr__(self, name, value):
-        if name[:1] == '_':
-            super().__setattr__(name, value)
-        else:
-            raise AttributeError(f"Can't reassign the value of attribute {name!r}")
+    # there is no __dict__: reassignment of symbols raises AttributeError
 
 # -----------------------------------------------------------------------------
 #                          === Grammar Representation ===
@@ -223,7 +267,7 @@ class Production(object):
                 for key in _name_aliases[key]:
                     namecount[key] += 1
 
-        # Now, walk through the names and generate accessor functions
+        # Now, walk through the names and resolve them to positions in the production
         nameuse = defaultdict(int)
         namemap = { }
         for index, key in enumerate(self.prod):
@@ -232,7 +276,7 @@ class Production(object):
                 nameuse[key] += 1
             else:
                 k = key
-            namemap[k] = lambda s,i=index: s[i].value
+            namemap[k] = index
             if key in _name_aliases:
                 for n, alias in enumerate(_name_aliases[key]):
                     if namecount[alias] > 1:
@@ -240,8 +284,8 @@ class Production(object):
                         nameuse[alias] += 1
                     else:
                         k = alias
-                    # The value is either a list (for repetition) or a tuple for optional 
-                    namemap[k] = lambda s,i=index,n=n: ([x[n] for x in s[i].value]) if isinstance(s[i].value, list) else s[i].value[n]
+                    # position of the symbol and position inside of its value
+                    namemap[k] = (index, n)
 
         self.namemap = namemap
                 
@@ -1566,6 +1610,177 @@ class LRTable(object):
 
         return '\n'.join(out)
 
+# -----------------------------------------------------------------------------
+#                          === LR Table Caching ===
+#
+# Building the LALR tables is by far the most expensive part of defining a
+# parser class.  The tables depend only on the grammar, so they can be saved
+# to disk and restored the next time the same grammar is defined.
+# -----------------------------------------------------------------------------
+
+def grammar_signature(grammar):
+    '''
+    Return a hash of everything in the grammar that affects the LR tables:
+    terminals, precedence, start symbol and the productions in their order.
+    Reduce/reduce conflicts are resolved by the line where a rule is defined,
+    so the relative order of the rule lines is included (but not the lines
+    themselves, so adding a comment to a grammar file doesn't invalidate it)
+    '''
+    lines = sorted({p.line for p in grammar.Productions})
+    line_rank = {line: n for n, line in enumerate(lines)}
+
+    h = hashlib.sha256()
+    h.update(repr((TABLES_VERSION,
+                   sorted(grammar.Terminals),
+                   sorted(grammar.Precedence.items()),
+                   grammar.Start)).encode())
+    for p in grammar.Productions:
+        h.update(repr((p.name, p.prod, p.prec, line_rank[p.line])).encode())
+    return h.hexdigest()
+
+class LRTableData(object):
+    '''
+    LR tables restored from previously saved data.  It has the same runtime
+    attributes as LRTable, but doesn't keep the state descriptions used
+    for the debugging output.
+    '''
+    def __init__(self, grammar, data):
+        self.grammar = grammar
+        self.lr_action = data['action']
+        self.lr_goto = data['goto']
+        self.lr_productions = grammar.Productions
+        self.defaulted_states = data['defaulted_states']
+        self.state_descriptions = OrderedDict()
+        self.sr_conflicts = [tuple(c) for c in data['sr_conflicts']]
+        self.rr_conflicts = [(state, grammar.Productions[chosen], grammar.Productions[rejected])
+                             for state, chosen, rejected in data['rr_conflicts']]
+
+    __str__ = LRTable.__str__
+
+def lrtable_to_data(lrtable):
+    '''
+    Convert LR tables to a structure made only of builtin types
+    '''
+    return {
+        'action': lrtable.lr_action,
+        'goto': lrtable.lr_goto,
+        'defaulted_states': lrtable.defaulted_states,
+        'sr_conflicts': lrtable.sr_conflicts,
+        'rr_conflicts': [(state, chosen.number, rejected.number)
+                         for state, chosen, rejected in lrtable.rr_conflicts],
+    }
+
+def pack_lrtable_data(data):
+    '''
+    Pack LR tables data into compact bytes that don't depend on the python version.
+    Rows of the tables are stored as flat lists of (symbol number, value) pairs
+    '''
+    symbols = sorted({sym for table in (data['action'], data['goto'])
+                      for row in table.values() for sym in row})
+    symnum = {sym: n for n, sym in enumerate(symbols)}
+
+    def pack_table(table):
+        return [[x for sym, value in table[state].items() for x in (symnum[sym], value)]
+                for state in range(len(table))]
+
+    packed = {
+        'symbols': symbols,
+        'action': pack_table(data['action']),
+        'goto': pack_table(data['goto']),
+        'defaulted_states': list(data['defaulted_states'].items()),
+        'sr_conflicts': data['sr_conflicts'],
+        'rr_conflicts': data['rr_conflicts'],
+    }
+    return zlib.compress(json.dumps(packed, separators=(',', ':')).encode(), 9)
+
+def unpack_lrtable_data(packed):
+    '''
+    Restore LR tables data from bytes created by pack_lrtable_data()
+    '''
+    packed = json.loads(zlib.decompress(packed))
+    symbols = packed['symbols']
+
+    def unpack_table(rows):
+        return {state: {symbols[row[i]]: row[i + 1] for i in range(0, len(row), 2)}
+                for state, row in enumerate(rows)}
+
+    return {
+        'action': unpack_table(packed['action']),
+        'goto': unpack_table(packed['goto']),
+        'defaulted_states': dict(packed['defaulted_states']),
+        'sr_conflicts': packed['sr_conflicts'],
+        'rr_conflicts': packed['rr_conflicts'],
+    }
+
+TABLES_MODULE_TEMPLATE = '''\
+# LR tables of {name}
+# This file is generated automatically. Don't edit it.
+
+version = {version!r}
+signature = {signature!r}
+tables = {tables!r}
+'''
+
+def write_lrtable_module(filename, name, signature, data):
+    '''
+    Write LR tables data as a python module. The module can be shipped
+    together with the grammar and loaded by Parser.tablesmodule
+    '''
+    dirname = os.path.dirname(filename)
+    if dirname:
+        os.makedirs(dirname, exist_ok=True)
+    with open(filename, 'w') as f:
+        f.write(TABLES_MODULE_TEMPLATE.format(name=name, version=TABLES_VERSION,
+                                              signature=signature, tables=pack_lrtable_data(data)))
+
+def read_lrtable_module(modname, signature):
+    '''
+    Load LR tables data from a generated module. Returns None if the module
+    doesn't exist or was generated for another grammar
+    '''
+    try:
+        module = importlib.import_module(modname)
+    except ImportError:
+        return None
+    if getattr(module, 'version', None) != TABLES_VERSION or getattr(module, 'signature', None) != signature:
+        return None
+    return unpack_lrtable_data(module.tables)
+
+def read_lrtable_cache(filename, signature):
+    '''
+    Read LR tables data from a cache file. Returns None if the file doesn't
+    exist, is damaged or was built for another grammar
+    '''
+    try:
+        with open(filename, 'rb') as f:
+            version, file_signature, data = marshal.load(f)
+    except Exception:
+        return None
+    if version != TABLES_VERSION or file_signature != signature:
+        return None
+    return data
+
+def write_lrtable_cache(filename, signature, data):
+    '''
+    Write LR tables data to a cache file.  The file is replaced atomically,
+    so concurrent processes never see a partially written file.
+    Returns False if the file can't be written.
+    '''
+    dirname = os.path.dirname(filename)
+    try:
+        os.makedirs(dirname, exist_ok=True)
+        fd, tmpname = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                marshal.dump((TABLES_VERSION, signature, data), f)
+            os.replace(tmpname, filename)
+        except BaseException:
+            os.unlink(tmpname)
+            raise
+    except OSError:
+        return False
+    return True
+
 # Collect grammar rules from a function
 def _collect_grammar_rules(func):
     grammar = []
@@ -1821,8 +2036,9 @@ class ParserMeta(type):
         return cls
 
 class Parser(metaclass=ParserMeta):
-    # Automatic tracking of position information
-    track_positions = True
+    # Automatic tracking of position information of the reduced rules (index, end, lineno).
+    # parse(..., spans=True) tracks positions regardless of it
+    track_positions = False
     
     # Logging object where debugging/diagnostic messages are sent
     log = SlyLogger(sys.stderr)     
@@ -1830,6 +2046,12 @@ class Parser(metaclass=ParserMeta):
     # Debugging filename where parsetab.out data can be written
     debugfile = None
 
+    # Name of a module with pre-generated LR tables (see write_lrtable_module)
+    tablesmodule = None
+
+    # Directory where the computed LR tables are cached between runs. None disables caching
+    cachedir = None
+
     @classmethod
     def __validate_tokens(cls):
         if not hasattr(cls, 'tokens'):
@@ -1965,9 +2187,31 @@ class Parser(metaclass=ParserMeta):
     @classmethod
     def __build_lrtables(cls):
         '''
-        Build the LR Parsing tables from the grammar
+        Build the LR Parsing tables from the grammar or restore them from the cache
         '''
-        lrtable = LRTable(cls._grammar)
+        cls._signature = grammar_signature(cls._grammar)
+
+        lrtable = None
+        # the debugging output needs the full table
+        if cls.tablesmodule and not cls.debugfile:
+            data = read_lrtable_module(cls.tablesmodule, cls._signature)
+            if data is not None:
+                lrtable = LRTableData(cls._grammar, data)
+                cls.log.debug('Parser tables for %s loaded from %s', cls.__qualname__, cls.tablesmodule)
+
+        cachefile = cls.__tables_cachefile() if not cls.debugfile else None
+        if cachefile and lrtable is None:
+            data = read_lrtable_cache(cachefile, cls._signature)
+            if data is not None:
+                lrtable = LRTableData(cls._grammar, data)
+                cls.log.debug('Parser tables for %s loaded from %s', cls.__qualname__, cachefile)
+
+        if lrtable is None:
+            lrtable = LRTable(cls._grammar)
+            if cachefile:
+                if write_lrtable_cache(cachefile, cls._signature, lrtable_to_data(lrtable)):
+                    cls.log.debug('Parser tables for %s written to %s', cls.__qualname__, cachefile)
+
         num_sr = len(lrtable.sr_conflicts)
 
         # Report shift/reduce and reduce/reduce conflicts
@@ -1985,8 +2229,57 @@ class Parser(metaclass=ParserMeta):
                 cls.log.warning('%d reduce/reduce conflicts', num_rr)
 
         cls._lrtable = lrtable
+        cls.__build_parse_tables()
         return True
 
+    @classmethod
+    def __build_parse_tables(cls):
+        '''
+        Build the tables used by parse(): rows of the LR table are lists indexed by
+        integer id of the token type (see sly.lex.token_id) and by number of nonterminal
+        '''
+        lrtable = cls._lrtable
+        num_states = max(lrtable.lr_action) + 1
+
+        ids = [token_id(name) for name in cls._grammar.Terminals]
+        ids.append(token_id('$end'))
+        width = max(ids) + 1
+        actions = []
+        for state in range(num_states):
+            row = [None] * width
+            for name, value in lrtable.lr_action.get(state, {}).items():
+                row[token_id(name)] = value
+            actions.append(row)
+
+        nonterminals = {name: n for n, name in enumerate(cls._grammar.Nonterminals)}
+        gotos = []
+        for state in range(num_states):
+            row = [None] * len(nonterminals)
+            for name, value in lrtable.lr_goto.get(state, {}).items():
+                row[nonterminals[name]] = value
+            gotos.append(row)
+
+        defaulted_states = [None] * num_states
+        for state, value in lrtable.defaulted_states.items():
+            defaulted_states[state] = value
+
+        cls._parse_actions = actions
+        cls._parse_gotos = gotos
+        cls._parse_defaulted_states = defaulted_states
+        # for every production: id of nonterminal on the left side
+        cls._parse_production_ids = [
+            nonterminals.get(p.name) for p in cls._grammar.Productions
+        ]
+
+    @classmethod
+    def __tables_cachefile(cls):
+        '''
+        Name of the file with cached LR tables
+        '''
+        if not cls.cachedir:
+            return None
+        return os.path.join(cls.cachedir, f'{cls.__module__}.{cls.__qualname__}.lrtab')
+
     @classmethod
     def __collect_rules(cls, definitions):
         '''
@@ -2043,78 +2336,138 @@ class Parser(metaclass=ParserMeta):
         else:
             sys.stderr.write('sly: Parse error in input. EOF\n')
  
+    def simulate(self, types, state_stack=None):
+        '''
+        Runs only the LR automaton on the given token types, grammar rules are not called.
+        '$end' type completes the input.
+
+        Returns the stack of states after the last type is shifted (or the input is accepted),
+        None if the types can't follow the state_stack (default is the start of the input).
+        '''
+        actions = self._parse_actions
+        goto = self._parse_gotos
+        prod = self._grammar.Productions
+        prod_ids = self._parse_production_ids
+        defaulted_states = self._parse_defaulted_states
+
+        statestack = [0] if state_stack is None else list(state_stack)
+        for ltype in types:
+            tid = token_id(ltype)
+            while True:
+                state = statestack[-1]
+                t = defaulted_states[state]
+                if t is None:
+                    row = actions[state]
+                    t = row[tid] if tid < len(row) else None
+                if t is None:
+                    return None
+                if t > 0:
+                    statestack.append(t)
+                    break
+                if t == 0:
+                    return statestack
+                plen = prod[-t].len
+                if plen:
+                    del statestack[-plen:]
+                statestack.append(goto[statestack[-1]][prod_ids[-t]])
+        return statestack
+
     def errok(self):
         '''
-        Clear the error status
+        Clear the error status of the running parse() call
         '''
-        self.errorok = True
+        self._parse_control().errorok = True
 
     def restart(self):
         '''
-        Force the parser to restart from a fresh state. Clears the statestack
+        Force the running parse() call to restart from a fresh state. Clears the statestack.
+        Takes effect when error() returns
         '''
-        del self.statestack[:]
-        del self.symstack[:]
-        sym = YaccSymbol()
-        sym.type = '$end'
-        self.symstack.append(sym)
-        self.statestack.append(0)
-        self.state = 0
+        self._parse_control().restart = True
 
-    def parse(self, tokens):
+    def _parse_control(self):
+        controls = getattr(_parse_controls, 'stack', None)
+        if not controls:
+            raise RuntimeError('sly: parser is not running')
+        return controls[-1]
+
+    def parse(self, tokens, spans=False):
         '''
         Parse the given input tokens.
+
+        The state of parsing is kept in local variables, so one parser object
+        can be used for many parse() calls at the same time (from different threads
+        or from inside of grammar rules).
+
+        If spans is True, set_span() is called for the value of every reduced rule
+        with position of the rule in the input.
         '''
+        controls = getattr(_parse_controls, 'stack', None)
+        if controls is None:
+            controls = _parse_controls.stack = []
+        controls.append(ParseControl())
+        try:
+            return self._parse(tokens, spans, controls[-1])
+        finally:
+            controls.pop()
+
+    def _parse(self, tokens, spans, control):
         lookahead = None                                  # Current lookahead symbol
         lookaheadstack = []                               # Stack of lookahead symbols
-        actions = self._lrtable.lr_action                 # Local reference to action table (to avoid lookup on self.)
-        goto    = self._lrtable.lr_goto                   # Local reference to goto table (to avoid lookup on self.)
+        actions = self._parse_actions                     # Local reference to action rows (to avoid lookup on self.)
+        goto    = self._parse_gotos                       # Local reference to goto rows
         prod    = self._grammar.Productions               # Local reference to production list (to avoid lookup on self.)
-        defaulted_states = self._lrtable.defaulted_states # Local reference to defaulted states
+        prod_ids = self._parse_production_ids             # Nonterminal ids of productions
+        defaulted_states = self._parse_defaulted_states   # Local reference to defaulted states
         pslice  = YaccProduction(None)                    # Production object passed to grammar rules
         errorcount = 0                                    # Used during error recovery
+        errorok = False                                   # Error is handled by error() function
+        end_id = token_id('$end')
 
         # Set up the state and symbol stacks
-        self.tokens = tokens
-        self.used_tokens = []
-        self.statestack = statestack = []                 # Stack of parsing states
-        self.symstack = symstack = []                     # Stack of grammar symbols
+        statestack = [0]                                  # Stack of parsing states
+        sym = YaccSymbol()
+        sym.type = '$end'
+        symstack = [sym]                                  # Stack of grammar symbols
         pslice._stack = symstack                          # Associate the stack with the production
-        self.restart()
+        state = 0
 
         # Set up position tracking
-        track_positions = self.track_positions
-        if not hasattr(self, '_line_positions'):
-            self._line_positions = { }           # id: -> lineno
-            self._index_positions = { }          # id: -> (start, end)
+        track_positions = self.track_positions or spans
 
         errtoken   = None                                 # Err token
         while True:
             # Get the next symbol on the input.  If a lookahead symbol
             # is already set, we just use that. Otherwise, we'll pull
             # the next token off of the lookaheadstack or from the lexer
-            if self.state not in defaulted_states:
+            t = defaulted_states[state]
+            if t is None:
                 if not lookahead:
                     if not lookaheadstack:
                         lookahead = next(tokens, None)  # Get the next token
-                        self.used_tokens.append(lookahead)
                     else:
                         lookahead = lookaheadstack.pop()
                     if not lookahead:
                         lookahead = YaccSymbol()
                         lookahead.type = '$end'
-                    
+                        lookahead.id = end_id
+
                 # Check the action table
-                ltype = lookahead.type
-                t = actions[self.state].get(ltype)
-            else:
-                t = defaulted_states[self.state]
+                try:
+                    t = actions[state][lookahead.id]
+                except IndexError:
+                    # token is unknown to the grammar
+                    t = None
+                except AttributeError:
+                    # token was created without lexer
+                    lookahead.id = token_id(lookahead.type)
+                    continue
 
             if t is not None:
                 if t > 0:
                     # shift a symbol on the stack
                     statestack.append(t)
-                    self.state = t
+                    state = t
 
                     symstack.append(lookahead)
                     lookahead = None
@@ -2126,7 +2479,7 @@ class Parser(metaclass=ParserMeta):
 
                 if t < 0:
                     # reduce a symbol on the stack, emit a production
-                    self.production = p = prod[-t]
+                    p = prod[-t]
                     pname = p.name
                     plen  = p.len
                     pslice._namemap = p.namemap
@@ -2145,24 +2498,38 @@ class Parser(metaclass=ParserMeta):
                     # Record positions
                     if track_positions:
                         if plen:
-                            sym.lineno = symstack[-plen].lineno
-                            sym.index = symstack[-plen].index
+                            # line number isn't copied: it is computed from the index when it is needed
+                            first = symstack[-plen]
+                            sym.index = first.index
+                            sym.lines = getattr(first, 'lines', None)
                             sym.end = symstack[-1].end
+                            if sym.index is None:
+                                # starts with zero-length production: take the first known position
+                                for part in symstack[-plen:]:
+                                    if getattr(part, 'index', None) is not None:
+                                        sym.index = part.index
+                                        sym.lines = getattr(part, 'lines', None)
+                                        break
+                            if sym.end is None:
+                                for part in reversed(symstack[-plen:]):
+                                    if getattr(part, 'end', None) is not None:
+                                        sym.end = part.end
+                                        break
                         else:
                             # A zero-length production  (what to put here?)
-                            sym.lineno = None
+                            sym.lines = None
                             sym.index = None
                             sym.end = None
-                        self._line_positions[id(value)] = sym.lineno
-                        self._index_positions[id(value)] = (sym.index, sym.end)
+                        if spans and sym.index is not None:
+                            self.set_span(value, Span(sym.index, sym.end, sym.lineno))
                             
                     if plen:
                         del symstack[-plen:]
                         del statestack[-plen:]
 
                     symstack.append(sym)
-                    self.state = goto[statestack[-1]][pname]
-                    statestack.append(self.state)
+                    state = goto[statestack[-1]][prod_ids[-t]]
+                    statestack.append(state)
                     continue
 
                 if t == 0:
@@ -2181,21 +2548,27 @@ class Parser(metaclass=ParserMeta):
                 # the user defined error() function if this is the
                 # first syntax error.  This function is only called if
                 # errorcount == 0.
-                if errorcount == 0 or self.errorok:
+                if errorcount == 0 or errorok or control.errorok:
                     errorcount = ERROR_COUNT
-                    self.errorok = False
+                    errorok = control.errorok = False
                     if lookahead.type == '$end':
                         errtoken = None               # End of file!
                     else:
                         errtoken = lookahead
 
-                    tok = self.error(errtoken, expected_tokens=list(actions[self.state].keys()))
+                    tok = self.error(errtoken, expected_tokens=list(self._lrtable.lr_action[state].keys()))
+                    if control.restart:
+                        # restart() was called by error()
+                        control.restart = False
+                        del statestack[1:]
+                        del symstack[1:]
+                        state = 0
                     if tok:
                         # User must have done some kind of panic
                         # mode recovery on their own.  The
                         # returned token is the next lookahead
                         lookahead = tok
-                        self.errorok = True
+                        errorok = True
                         continue
                     else:
                         # If at EOF. We just return. Basically dead.
@@ -2211,7 +2584,7 @@ class Parser(metaclass=ParserMeta):
 
                 if len(statestack) <= 1 and lookahead.type != '$end':
                     lookahead = None
-                    self.state = 0
+                    state = 0
                     # Nuke the lookahead stack
                     del lookaheadstack[:]
                     continue
@@ -2235,6 +2608,7 @@ class Parser(metaclass=ParserMeta):
                     # Create the error symbol for the first time and make it the new lookahead symbol
                     t = YaccSymbol()
                     t.type = 'error'
+                    t.id = token_id('error')
 
                     if hasattr(lookahead, 'lineno'):
                         t.lineno = lookahead.lineno
@@ -2248,16 +2622,33 @@ class Parser(metaclass=ParserMeta):
                 else:
                     sym = symstack.pop()
                     statestack.pop()
-                    self.state = statestack[-1]
+                    state = statestack[-1]
                 continue
 
             # Call an error function here
             raise RuntimeError('sly: internal parser error!!!\n')
 
-    # Return position tracking information
+    # Return position tracking information: of the values with spans (parse(..., spans=True)) and of tokens
     def line_position(self, value):
-        return self._line_positions[id(value)]
+        span = getattr(value, 'span', None)
+        if span is not None:
+            return span.lineno
+        return getattr(value, 'lineno', None)
 
     def index_position(self, value):
-        return self._index_positions[id(value)]
+        span = getattr(value, 'span', None)
+        if span is not None:
+            return span.start
+        return getattr(value, 'index', None)
+
+    def set_span(self, value, span):
+        '''
+        Attaches the span to the value of reduced rule, used by parse(..., spans=True).
+        The value of the outermost rule wins if a rule returns the value of its part.
+        Values without attributes (strings, numbers, lists) are skipped
+        '''
+        try:
+            value.span = span
+        except AttributeError:
+            pass
     
@@ -0,0 +1,93 @@
+import copy
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import (
+    BinaryOperation, Constant, ConstantList, Function, Identifier, Insert, NullConstant, Select, Star, Tuple
+)
+
+
+class TestEquality:
+
+    def test_structural(self):
+        query = parse_sql('select a, sum(b) as s from db.t where x = 1 and y in (1, 2) group by a')
+        query2 = parse_sql('select a,  sum(b) AS s from db.t where x=1 and y in (1,2) group by a')
+        assert query == query2
+        assert hash(query) == hash(query2)
+
+        query2.where.args[1].args[1].values[1] = 3
+        assert query != query2
+
+        assert Identifier('a') != Constant('a')
+        assert Constant(1) != Constant(1.0)
+        assert Constant(1) != Constant(True)
+        assert Constant(None) != NullConstant()
+        assert Identifier('a') != 'a'
+
+        # constant is equal to its value only in the lists of values
+        assert Constant(1) != 1
+        assert Function('f', args=[Constant('1')]) != Function('f', args=['1'])
+        assert hash(Function('f', args=[Constant('1')])) != hash(Function('f', args=['1']))
+
+    def test_not_structural_attributes(self):
+        query = parse_sql('select a from t where b = 1', spans=True)
+        query2 = parse_sql('select a from t where b = 1')
+        assert query.span is not None
+        assert query == query2
+        assert hash(query) == hash(query2)
+
+        op = BinaryOperation('=', args=[Identifier('a'), Constant(1)])
+        op2 = copy.deepcopy(op)
+        op2._orig_node = op
+        assert op == op2
+
+    def test_constant_list(self):
+        items = ConstantList([1, 'a', None])
+        tuple_ = Tuple([Constant(1), Constant('a'), NullConstant()])
+        assert items == tuple_
+        assert hash(items) == hash(tuple_)
+        # constants are not created
+        assert items._items is None
+
+        assert items != Tuple([Constant(1), Constant('a', with_quotes=False), NullConstant()])
+
+        insert = parse_sql("insert into t (a, b) values (1, 'x'), (2, null)")
+        assert insert.is_plain
+        assert insert == Insert(
+            table=Identifier('t'),
+            columns=[Identifier('a'), Identifier('b')],
+            values=[[Constant(1), Constant('x')], [Constant(2), NullConstant()]],
+        )
+        assert hash(insert) == hash(Insert(
+            table=Identifier('t'),
+            columns=[Identifier('a'), Identifier('b')],
+            values=[[Constant(1), Constant('x')], [Constant(2), NullConstant()]],
+        ))
+
+    def test_deep_condition(self):
+        condition = ' or '.join(f'a = {i}' for i in range(5000))
+        query = parse_sql(f'select * from t where {condition}')
+        query2 = copy.deepcopy(query)
+        assert query == query2
+        assert hash(query) == hash(query2)
+
+        # the deepest condition
+        node = query2.where
+        while node.op == 'or':
+            node = node.args[0]
+        node.args[1].value = -1
+        assert query != query2
+
+    def test_freeze(self):
+        query = Select(targets=[Star()], from_table=Identifier('t'), where=Identifier('a'))
+        assert not query.frozen
+
+        query2 = copy.deepcopy(query).freeze()
+        assert query2.frozen and query2.where.frozen
+        assert hash(query2) == hash(query)
+        assert query2 == query
+
+        # copy of frozen node is not frozen
+        assert not copy.deepcopy(query2).frozen
+
+        cache = {query2: 'plan'}
+        assert cache[query] == 'plan'
@@ -74,3 +74,52 @@ class TestInsert:
 
         assert str(ast).lower() == sql.lower()
         assert ast.to_tree() == expected_ast.to_tree()
+
+    def test_insert_plain_values(self, dialect):
+        sql = "INSERT INTO tbl_name(a, b, c) VALUES (1, 'x', NULL), (2.5, 'y', TRUE)"
+
+        ast = parse_sql(sql, dialect=dialect)
+        assert ast.is_plain
+        assert ast.values == [
+            [1, 'x', None],
+            [2.5, 'y', True],
+        ]
+
+        expected_ast = Insert(
+            table=Identifier('tbl_name'),
+            columns=[Identifier('a'), Identifier('b'), Identifier('c')],
+            values=[
+                [Constant(1), Constant('x'), NullConstant()],
+                [Constant(2.5), Constant('y'), Constant(True)],
+            ]
+        )
+        assert str(ast) == str(expected_ast)
+        assert ast.to_tree() == expected_ast.to_tree()
+
+    def test_insert_not_plain_values(self, dialect):
+        sql = "INSERT INTO tbl_name(a, b) VALUES (1, 'x'), (2, 'y'), (3, b)"
+
+        ast = parse_sql(sql, dialect=dialect)
+        assert not ast.is_plain
+
+        expected_ast = Insert(
+            table=Identifier('tbl_name'),
+            columns=[Identifier('a'), Identifier('b')],
+            values=[
+                [Constant(1), Constant('x')],
+                [Constant(2), Constant('y')],
+                [Constant(3), Identifier('b')],
+            ]
+        )
+        assert str(ast) == str(expected_ast)
+        assert ast.to_tree() == expected_ast.to_tree()
+        assert isinstance(ast.values[0][0], Constant)
+
+    def test_insert_many_rows(self, dialect):
+        rows = [[i, f'v{i}'] for i in range(2000)]
+        values = ', '.join(f"({a}, '{b}')" for a, b in rows)
+        sql = f"INSERT INTO tbl_name(a, b) VALUES {values}"
+
+        ast = parse_sql(sql, dialect=dialect)
+        assert ast.is_plain
+        assert ast.values == rows
@@ -0,0 +1,74 @@
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select, Star
+from mindsdb_sql.parser.ast.base import clone_value
+
+
+class TestClone:
+
+    def test_clone(self):
+        sql = '''
+            select a, sum(b) over (partition by c) as s, case when x = 1 then 'a' else null end
+            from db.t as t join (select * from t2 where y in (1, 2)) as t2 on t.id = t2.id
+            where a = 1 and b is not null order by a desc limit 10
+            using p1 = 1, p2 = {'k': [1, 2]}
+        '''
+        query = parse_sql(sql)
+        query2 = query.clone()
+
+        assert query2 == query
+        assert query2.to_tree() == query.to_tree()
+        assert str(query2) == str(query)
+
+        # copy doesn't share nodes and containers
+        query2.targets[0].parts.append('x')
+        query2.from_table.right.where.args[1].values.append(3)
+        query2.using['p2']['k'].append(3)
+        query2.where.args[0].args[1].value = 2
+        assert str(query) == str(parse_sql(sql))
+
+    def test_share_leaves(self):
+        query = parse_sql('select *, a, 1 from t where b = 2')
+        query2 = query.clone(share_leaves=True)
+        assert query2 == query
+
+        assert query2.targets[0] is query.targets[0]
+        assert query2.targets[2] is query.targets[2]
+        assert query2.where.args[1] is query.where.args[1]
+        assert query2.targets[1] is not query.targets[1]
+        assert query2.where is not query.where
+
+    def test_not_copied_attributes(self):
+        node = BinaryOperation('=', args=[Identifier('a'), Constant(1)])
+        node2 = node.clone()
+        node2._orig_node = node
+
+        # reference to the original node is kept
+        node3 = node2.clone()
+        assert node3._orig_node is node
+
+        identifier = Identifier('t')
+        identifier.sub_select = Select(targets=[Star()])
+        identifier2 = identifier.clone()
+        assert identifier2.sub_select == identifier.sub_select
+        assert identifier2.sub_select is not identifier.sub_select
+
+    def test_frozen(self):
+        query = parse_sql('select a from t').freeze()
+        query2 = query.clone()
+        assert not query2.frozen and not query2.targets[0].frozen
+        assert query2 == query
+
+    def test_deep_condition(self):
+        condition = ' or '.join(f'a = {i}' for i in range(5000))
+        query = parse_sql(f'select * from t where {condition}')
+        query2 = query.clone()
+        assert query2 == query
+        assert query2.where is not query.where
+
+    def test_clone_value(self):
+        assert clone_value(None) is None
+        items = [Identifier('a'), {'x': (Constant(1),)}]
+        items2 = clone_value(items)
+        assert items2 == items
+        assert items2[0] is not items[0]
+        assert items2[1]['x'][0] is not items[1]['x'][0]
@@ -0,0 +1,95 @@
+import copy
+
+import pytest
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import Constant, ConstantList, Identifier, Tuple, make_tuple
+from mindsdb_sql.planner.utils import query_traversal
+from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
+
+
+class TestConstantList:
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    def test_parse(self, dialect):
+        ast = parse_sql("select * from t where x in (1, 2, 1.5, 'a')", dialect)
+        node = ast.where.args[1]
+        assert type(node) is ConstantList
+        assert node.values == [1, 2, 1.5, 'a']
+
+        # the same as tuple of constants
+        assert node == Tuple(items=[Constant(1), Constant(2), Constant(1.5), Constant('a')])
+        assert str(node) == "(1, 2, 1.5, 'a')"
+
+        ast = parse_sql('select * from t where x in (1, y)', dialect)
+        assert type(ast.where.args[1]) is Tuple
+
+    def test_items(self):
+        node = ConstantList([1, 2])
+        assert node.items == [Constant(1), Constant(2)]
+        assert node.get_values() == [1, 2]
+
+        node.items[0] = Identifier('y')
+        assert node.get_values() is None
+        assert str(node) == '(y, 2)'
+
+        # the same constants are plain for the parser and for get_values
+        for item in (Constant(1, parentheses=True), Constant(1, alias=Identifier('a')),
+                     Constant('a', with_quotes=False)):
+            node = ConstantList([1, 2])
+            node.items[0] = item
+            assert node.get_values() is None
+            assert type(make_tuple([item, Constant(2)])) is Tuple
+
+    def test_render_parenthesized_item(self):
+        # parenthesized constant is not plain value: it isn't rendered in expanding parameter
+        ast = parse_sql('select * from t where x in (1, 2)')
+        ast.where.args[1].items[0] = Constant(1, parentheses=True)
+        stmt, _ = SqlalchemyRender('postgres').get_query(ast)
+        assert list(stmt.compile().params.values()) == [1, 2]
+
+    def test_copy_and_traversal(self):
+        ast = parse_sql('select * from t where x in (1, 2, 3)')
+        ast2 = copy.deepcopy(ast)
+        assert ast2 == ast
+        assert ast2.where.args[1].values is not ast.where.args[1].values
+
+        visited = []
+
+        def callback(node, **kwargs):
+            visited.append(type(node))
+
+        query_traversal(ast, callback)
+        assert ConstantList in visited
+        assert Constant not in visited
+
+        # items are traversed after they are changed
+        ast.where.args[1].items[0] = Identifier('a')
+        query_traversal(ast, callback)
+        assert Identifier in visited
+
+    @pytest.mark.parametrize('dialect', ['postgres', 'mysql', 'mssql'])
+    def test_render(self, dialect):
+        render = SqlalchemyRender(dialect)
+        for sql, expected in [
+            ("select * from t where x in ('a', 'b''c') and y not in (1, 2)",
+             "x IN ('a', 'b''c') AND (y NOT IN (1, 2))"),
+            # different types
+            ("select * from t where x in (1, 1.5, 'a')", "x IN (1, 1.5, 'a')"),
+        ]:
+            assert expected in render.get_string(parse_sql(sql), with_failback=False).replace('\n', '')
+
+    def test_render_parameter(self):
+        # values are one expanding parameter of the statement
+        stmt, _ = SqlalchemyRender('postgres').get_query(parse_sql('select * from t where x in (1, 2, 3)'))
+        params = stmt.compile().params
+        assert list(params.values()) == [[1, 2, 3]]
+
+    def test_render_not_in_list(self):
+        # only operands of IN are rendered as expanding parameter
+        render = SqlalchemyRender('postgres')
+
+        sql = render.get_string(parse_sql('select * from t where (a, b) = (1, 2)'), with_failback=False)
+        assert sql.replace('\n', '') == 'SELECT * FROM t WHERE (a, b) = (1, 2)'
+
+        sql = render.get_string(parse_sql('select (1, 2) as x, (a, 1) as y from t'), with_failback=False)
+        assert sql.replace('\n', '') == 'SELECT (1, 2) AS x, (a, 1) AS y FROM t'
@@ -0,0 +1,67 @@
+import copy
+import pickle
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier
+from mindsdb_sql.planner import plan_query
+from mindsdb_sql.planner.ts_utils import find_and_remove_time_filter, find_time_filter
+from mindsdb_sql.planner.utils import query_traversal
+from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
+
+# deeper than default recursion limit
+SIZE = 5000
+
+
+def make_condition(size, op):
+    return f' {op} '.join(f'a = {i}' for i in range(size))
+
+
+class TestDeepConditions:
+    def test_get_operands(self):
+        ast = parse_sql('select * from t where a = 1 or (b = 2 or c = 3) or (d = 4 and e = 5)')
+        operands = ast.where.get_operands()
+        assert [str(item) for item in operands] == ['a = 1', 'b = 2', 'c = 3', '(d = 4 AND e = 5)']
+
+        # operation with alias is an operand
+        node = BinaryOperation('or', args=[
+            BinaryOperation('or', args=[Identifier('a'), Identifier('b')], alias=Identifier('x')),
+            Identifier('c')
+        ])
+        assert len(node.get_operands()) == 2
+
+    def test_long_chain(self):
+        sql = f'select * from int1.tbl where b = 1 and ({make_condition(SIZE, "or")})'
+        ast = parse_sql(sql)
+
+        assert str(ast) == f'SELECT * FROM int1.tbl WHERE b = 1 AND ({make_condition(SIZE, "OR")})'
+        assert len(ast.where.args[1].get_operands()) == SIZE
+
+        ast2 = copy.deepcopy(ast)
+        assert str(ast2) == str(ast)
+        ast2.where.args[1].args[0].args[1] = Constant(1)
+        assert str(ast2) != str(ast)
+
+        assert str(pickle.loads(pickle.dumps(ast))) == str(ast)
+
+        constants = []
+
+        def find_constants(node, **kwargs):
+            if isinstance(node, Constant):
+                constants.append(node.value)
+
+        query_traversal(ast, find_constants)
+        assert sorted(constants) == sorted([1, *range(SIZE)])
+
+        sql = SqlalchemyRender('postgres').get_string(ast, with_failback=False)
+        assert sql.count(' OR ') == SIZE - 1
+
+        plan = plan_query(ast, integrations=['int1'])
+        assert len(plan.steps) == 1
+
+    def test_time_filter(self):
+        ast = parse_sql(f'select * from t where {make_condition(SIZE, "and")} and t > 1')
+        time_filter = find_time_filter(ast.where, 't')
+        assert str(time_filter) == 't > 1'
+
+        where = find_and_remove_time_filter(ast.where, time_filter)
+        assert str(where) == make_condition(SIZE, 'AND')
@@ -0,0 +1,115 @@
+import pytest
+
+import mindsdb_sql
+from mindsdb_sql import parse_sql, get_lexer_parser
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.ast import Select, Identifier, Constant, BinaryOperation
+from mindsdb_sql.parser.dialects.mindsdb.fast_select import parse_select
+from mindsdb_sql.parser.template import TemplateCache
+
+
+def tokenize(sql):
+    lexer, parser = get_lexer_parser('mindsdb')
+    return list(lexer.tokenize(sql)), parser
+
+
+@pytest.fixture
+def fast_parse():
+    old_value = mindsdb_sql.get_fast_parse()
+    mindsdb_sql.set_fast_parse(True)
+    yield
+    mindsdb_sql.set_fast_parse(old_value)
+
+
+class TestFastSelect:
+    @pytest.mark.parametrize('sql', [
+        'select 1',
+        'select * from mindsdb.models',
+        'select distinct a, t.b as x, c y, d as `z z`, e as \'w\' from int1.tbl as t',
+        'select t.*, count(*), max(distinct a), db.f(a, 1), g() from t',
+        'select t.date, t.latest from t where t.offset = 1',
+        "select * from t where a = 1 and (b = 'x' or b = 'y') and not c is null or d != -1.5",
+        'select * from t where a in (1, 2, 3) and b not in (1, x) and c like ? and d is not true',
+        'select - - 1, - a * b, -1 + 2, a - -1, not a = b from t where not a and b',
+        'select a + b * c - d / e, (a + b) * c, (1) from t where a = b = c',
+        'select * from t1 join t2 on t1.a = t2.a left join t3 as x left outer join t4 y on x.a = y.a',
+        'select * from t1, t2 as x, t3 y where t1.a = x.a',
+        'select a from t where a > 1 group by a, b having count(*) > 1 order by a desc, b nulls last limit 10 offset 5',
+        'select a from t order by a asc nulls first limit 5, 10',
+    ])
+    def test_same_ast(self, sql):
+        tokens, parser = tokenize(sql)
+        ast = parse_select(tokens)
+        expected = parser.parse(iter(tokens))
+
+        assert type(ast) is Select
+        assert ast == expected
+        assert ast.to_tree() == expected.to_tree()
+        assert str(ast) == str(expected)
+
+    @pytest.mark.parametrize('sql', [
+        # not in the subset
+        'select * from (select 1) as t',
+        'select * from t where a in (select b from t2)',
+        'select cast(a as int) from t',
+        'select a::int from t',
+        'select * from t where a between 1 and 2',
+        'select * from t1 union select * from t2',
+        'select "a" from t',
+        'select * from int1 (select 1)',
+        'select * from t where a > last',
+        'select sum(a) over (partition by b) from t',
+        'select * from t for update',
+        'show tables',
+        # errors
+        'select a from t where a',
+        'select a where a = 1',
+        'select a from t where a < b < c',
+        'select a from t limit 1.5',
+        'select a from t limit 1, 2 offset 3',
+        'select a from t1, t2 join t3',
+        'select a from t where',
+        "select - 'a'",
+    ])
+    def test_fallback(self, sql):
+        tokens, parser = tokenize(sql)
+        assert parse_select(tokens) is None
+
+    def test_parse_sql(self, fast_parse):
+        sql = 'select a from int1.tbl where x = 1'
+        assert parse_sql(sql) == Select(
+            targets=[Identifier('a')],
+            from_table=Identifier('int1.tbl'),
+            where=BinaryOperation('=', args=[Identifier('x'), Constant(1)])
+        )
+
+        # other dialects and queries are parsed by LALR parser
+        assert parse_sql(sql, 'mysql') == parse_sql(sql)
+        assert str(parse_sql('select * from (select 1) as t')) == 'SELECT * FROM (SELECT 1) AS t'
+
+        # error of LALR parser
+        with pytest.raises(ParsingException) as e:
+            parse_sql('select a from t where a <')
+        assert 'unexpected end of query' in str(e.value)
+
+    def test_deep_nesting(self, fast_parse):
+        # deeply nested expressions are parsed by LALR parser
+        for sql in (
+            'select ' + '(' * 600 + '1' + ')' * 600 + ' from t',
+            'select ' + '(' * 2000 + '1' + ')' * 2000 + ' from t',
+            'select ' + 'f(' * 600 + 'a' + ')' * 600 + ', ' + 'not ' * 600 + 'a from t',
+        ):
+            tokens, parser = tokenize(sql)
+            assert parse_select(tokens) is None
+            assert parse_sql(sql) == parser.parse(iter(tokens))
+
+    def test_templates(self, fast_parse):
+        old_cache = mindsdb_sql.get_template_cache()
+        cache = TemplateCache()
+        mindsdb_sql.set_template_cache(cache)
+        try:
+            assert str(parse_sql("select a from t where x = 1 and y = 'a'")) == "SELECT a FROM t WHERE x = 1 AND y = 'a'"
+            assert str(parse_sql("select a from t where x = 2 and y = 'b'")) == "SELECT a FROM t WHERE x = 2 AND y = 'b'"
+            assert cache.hits == 1
+        finally:
+            mindsdb_sql.set_template_cache(old_cache)
@@ -0,0 +1,183 @@
+import copy
+import gc
+import pickle
+
+import pytest
+
+from mindsdb_sql import parse_sql, set_intern_table, set_parse_cache
+from mindsdb_sql.parser.ast import Constant, Identifier, NullConstant, Star
+from mindsdb_sql.parser.cache import ParseCache
+from mindsdb_sql.parser.intern import InternTable
+from mindsdb_sql.planner import plan_query
+
+
+@pytest.fixture
+def table():
+    table = InternTable()
+    set_intern_table(table)
+    yield table
+    set_intern_table(None)
+
+
+class TestIntern:
+
+    def test_parse(self, table):
+        query = parse_sql("select a, t.b, 1, 'x', null, * from t where a = 1 and c = 'x'")
+        query2 = parse_sql("select a from t2 where c is null and d = 1")
+
+        assert query.targets[0] is query.where.args[0].args[0]
+        assert query.targets[2] is query.where.args[0].args[1]
+        assert query.targets[3] is query.where.args[1].args[1]
+        assert query2.targets[0] is query.targets[0]
+        assert query2.where.args[0].args[1] is query.targets[4]
+
+        # ASTs are not changed
+        assert str(query) == "SELECT a, t.b, 1, 'x', NULL, * FROM t WHERE a = 1 AND c = 'x'"
+        assert str(query2) == "SELECT a FROM t2 WHERE c IS NULL AND d = 1"
+        assert table.stats()['hits'] > 0
+
+    def test_different_leaves(self, table):
+        nodes = [
+            Constant(1), Constant(1.0), Constant(True), Constant('1'), Constant('1', with_quotes=False),
+            Constant(0.0), Constant(-0.0), NullConstant(), Constant(None),
+            Identifier('a'), Identifier('A'), Identifier('a', alias=Identifier('b')), Identifier(parts=['a', 'b']),
+            Identifier(parts=['a', Star()]), Star(),
+        ]
+        interned = [table.intern(node) for node in nodes]
+        assert interned == nodes
+        assert len(set(map(id, interned))) == len(nodes)
+
+        assert table.intern(Constant(1)) is interned[0]
+        assert table.intern(Identifier(parts=['a', Star()])) is interned[13]
+
+        # not leaves and leaves with not structural attributes
+        identifier = Identifier('a')
+        identifier.sub_select = parse_sql('select 1')
+        assert table.intern(identifier) is identifier
+        query = parse_sql('select 1')
+        assert table.intern(query) is query
+
+    def test_immutable_parts(self, table):
+        query = parse_sql('select t.a as x from t')
+        query2 = parse_sql('select t.a as x from t2')
+        identifier = query.targets[0]
+        assert identifier is query2.targets[0]
+        assert identifier.parts == ['t', 'a']
+
+        with pytest.raises(TypeError):
+            identifier.parts[-1] = 'b'
+        with pytest.raises(TypeError):
+            identifier.alias.parts.append('y')
+        # attributes of interned leaves can't be set
+        with pytest.raises(TypeError):
+            identifier.parts = ['b']
+        with pytest.raises(TypeError):
+            identifier.alias = None
+        with pytest.raises(TypeError):
+            identifier.alias.parts = ['y']
+        with pytest.raises(TypeError):
+            parse_sql('select 1').targets[0].value = 2
+        assert str(query2) == 'SELECT t.a AS x FROM t2'
+
+        # copies can be changed
+        for copy_ in (identifier.clone(), copy.deepcopy(identifier), pickle.loads(pickle.dumps(identifier))):
+            assert copy_ == identifier
+            copy_.parts[-1] = 'b'
+            copy_.alias.parts.append('y')
+            copy_.alias = None
+        assert str(query2) == 'SELECT t.a AS x FROM t2'
+
+    def test_weak_references(self, table):
+        query = parse_sql('select a, b from t where c = 1')
+        assert len(table) > 0
+        del query
+        gc.collect()
+        assert len(table) == 0
+
+    def test_per_dialect(self):
+        sql = 'select a from t'
+        for per_dialect in (False, True):
+            set_intern_table(InternTable(per_dialect=per_dialect))
+            try:
+                query = parse_sql(sql, dialect='mindsdb')
+                query2 = parse_sql(sql, dialect='mysql')
+                assert (query.targets[0] is query2.targets[0]) is not per_dialect
+            finally:
+                set_intern_table(None)
+
+    def test_parse_cache(self, table):
+        set_parse_cache(ParseCache())
+        try:
+            sql = 'select a from t where b = 1'
+            query = parse_sql(sql)
+            query2 = parse_sql(sql)
+            assert query2 is not query
+            assert query2.where.args[0] is query.where.args[0]
+        finally:
+            set_parse_cache(None)
+
+    def test_copy_on_write(self, table):
+        query = parse_sql('select a from t where b = 1')
+        set_intern_table(None)
+        query2 = parse_sql('select b, a from t2')
+
+        query3 = table.intern_tree(query2, copy_on_write=True)
+        assert query3 == query2
+        assert query3.targets[0] is query.where.args[0]
+        assert query3.targets[1] is query.targets[0]
+        # the tree is not changed, its leaves are not added to the table: their copies are added
+        assert query2.targets[1] is not query.targets[0]
+        assert query3.from_table is not query2.from_table
+        assert table.intern(Identifier('t2')) is query3.from_table
+
+    def test_deep_condition(self, table):
+        condition = ' or '.join(f'a = {i % 10}' for i in range(5000))
+        query = parse_sql(f'select * from t where {condition}')
+        assert query.where.args[1].args[0] is query.where.args[0].args[1].args[0]
+
+    def test_planner(self, table):
+        set_intern_table(None)
+        query = parse_sql('select t.a, p.y from int1.tbl as t join mindsdb.pred as p where t.x = 1')
+        query_copy = query.clone()
+        set_intern_table(table)
+
+        plan = plan_query(query, integrations=['int1'], predictor_namespace='mindsdb',
+                          predictor_metadata={'pred': {}})
+        assert query == query_copy
+        assert plan.steps[0].query.from_table is table.intern(Identifier('tbl', alias=Identifier('t')))
+        # leaves of the query are not shared with the table
+        assert query.from_table.left.alias is not table.intern(Identifier('t'))
+
+        set_intern_table(InternTable(plans=False))
+        plan = plan_query(query, integrations=['int1'], predictor_namespace='mindsdb',
+                          predictor_metadata={'pred': {}})
+        assert plan.steps[0].query.from_table is not table.intern(Identifier('tbl', alias=Identifier('t')))
+
+    def test_planner_leaves_not_changed(self, table):
+        # planner changes identifiers of the where in place (removes table aliases), not the interned leaves
+        query = parse_sql('select * from mysql.data.ny_output as ta left join mindsdb.tp3 as tb '
+                          'where ta.pickup_hour between 1 and 10 and ta.vendor_id = 1')
+        leaves = [query.where.args[0].args[0], query.where.args[1].args[0], query.where.args[1].args[1]]
+        texts = [leaf.to_tree() for leaf in leaves]
+
+        plan_query(query, integrations=['mysql'], predictor_namespace='mindsdb',
+                   predictor_metadata={'tp3': {'timeseries': True, 'order_by_column': 'pickup_hour',
+                                               'group_by_columns': ['vendor_id'], 'window': 5}})
+
+        assert [leaf.to_tree() for leaf in leaves] == texts
+        assert all(table.intern(leaf) is leaf for leaf in leaves)
+
+    def test_planner_per_dialect(self):
+        table = InternTable(per_dialect=True)
+        set_intern_table(table)
+        try:
+            params = dict(integrations=['int1'], predictor_namespace='mindsdb', predictor_metadata={'pred': {}})
+            for dialect in ('mindsdb', 'mysql'):
+                query = parse_sql('select a from int1.tbl where b = 1', dialect=dialect)
+                plan = plan_query(query, dialect=dialect, **params)
+                # leaves created by the planner are in the table of the dialect
+                target = plan.steps[0].query.targets[0]
+                assert target is table.intern(Identifier('a', alias=Identifier('a')), dialect=dialect)
+                assert plan.steps[0].query.where.args[0] is query.where.args[0]
+        finally:
+            set_intern_table(None)
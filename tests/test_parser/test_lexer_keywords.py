@@ -0,0 +1,45 @@
+import re
+
+import pytest
+
+from sly import Lexer
+from sly.lex import LexerBuildError
+
+from mindsdb_sql.parser.lexer import SQLLexer
+from mindsdb_sql.parser.dialects.mindsdb.lexer import MindsDBLexer
+
+
+def regex_lexer(lexer_cls):
+    class RegexLexer(lexer_cls):
+        tokens = lexer_cls.tokens
+        keyword_lookup = False
+
+    return RegexLexer
+
+
+def get_tokens(lexer, sql):
+    return [(t.type, t.value, t.lineno, t.index, t.end) for t in lexer.tokenize(sql)]
+
+
+class TestKeywordLookup:
+    @pytest.mark.parametrize('lexer_cls', [SQLLexer, MindsDBLexer])
+    @pytest.mark.parametrize('sql', [
+        'SeLeCt a, b1 as select_ from t group by a order  by b nulls first',
+        'select$x from t where x is not null and y not in (1) and not exists (select 1)',
+        'select 1.5end, 1select, _from, `from` from t',
+        'create knowledge base kb, knowledge_bases',
+        'select a from t where x not\nlike 1 partition by y',
+    ])
+    def test_same_tokens(self, lexer_cls, sql):
+        assert lexer_cls._keywords
+        assert get_tokens(lexer_cls(), sql) == get_tokens(regex_lexer(lexer_cls)(), sql)
+
+    def test_rule_after_keyword(self):
+        with pytest.raises(LexerBuildError):
+            class BadLexer(Lexer):
+                reflags = re.IGNORECASE
+                keyword_lookup = True
+                tokens = {NOT, NOT_IN}
+
+                NOT = r'\bNOT\b'
+                NOT_IN = r'\bNOT\s+IN\b'
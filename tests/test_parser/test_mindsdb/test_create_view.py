@@ -42,6 +42,19 @@ class TestCreateView:
         assert str(ast) == str(expected_ast)
         assert ast.to_tree() == expected_ast.to_tree()
 
+    def test_create_view_query_str_is_original_text(self):
+        query_str = """SELECT a, 'it''s' AS b  -- comment
+               FROM (SELECT * FROM pred) AS t
+            WHERE f(x) > 0"""
+        sql = f"CREATE VIEW my_view AS ({query_str})"
+        ast = parse_sql(sql, dialect='mindsdb')
+        assert ast.query_str == query_str
+
+    def test_create_view_long_query(self):
+        query_str = 'SELECT * FROM pred WHERE ' + ' AND '.join(f'(a{i} = {i})' for i in range(1000))
+        ast = parse_sql(f"CREATE VIEW my_view ({query_str})", dialect='mindsdb')
+        assert ast.query_str == query_str
+
     # def test_create_dataset_full(self):
     #     sql = "CREATE DATASET my_view FROM integr AS ( SELECT * FROM pred )"
     #     ast = parse_sql(sql, dialect='mindsdb')
@@ -0,0 +1,111 @@
+import pytest
+
+from mindsdb_sql import parse_sql, set_parse_cache
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.ast import Identifier
+from mindsdb_sql.parser.cache import ParseCache
+
+
+@pytest.fixture
+def cache():
+    cache = ParseCache(max_size=10)
+    set_parse_cache(cache)
+    yield cache
+    set_parse_cache(None)
+
+
+class TestParseCache:
+
+    def test_hit_and_miss(self, cache):
+        sql = 'select a from tbl where b = 1'
+
+        ast1 = parse_sql(sql)
+        ast2 = parse_sql(sql + ';')
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hits'] == 1
+        assert ast1.to_tree() == ast2.to_tree()
+
+        # other dialect
+        parse_sql(sql, dialect='mysql')
+        assert cache.stats()['misses'] == 2
+        assert len(cache) == 2
+
+    def test_modification_of_result(self, cache):
+        sql = 'select a from tbl where b = 1'
+
+        ast = parse_sql(sql)
+        ast.where = None
+        ast.targets.append(Identifier('x'))
+
+        ast2 = parse_sql(sql)
+        assert ast2.to_string() == 'SELECT a FROM tbl WHERE b = 1'
+        ast2.from_table.parts[0] = 'tbl2'
+
+        assert parse_sql(sql).to_string() == 'SELECT a FROM tbl WHERE b = 1'
+
+    def test_size_limit(self, cache):
+        for i in range(15):
+            parse_sql(f'select {i}')
+
+        assert len(cache) == 10
+        assert cache.stats()['evictions'] == 5
+
+        # the last used query is kept
+        parse_sql('select 5')
+        parse_sql('select 15')
+        parse_sql('select 5')
+        assert cache.stats()['hits'] == 2
+
+    def test_memory_limit(self):
+        cache = ParseCache(max_memory=2000)
+        set_parse_cache(cache)
+        try:
+            for i in range(20):
+                parse_sql(f'select a{i} from tbl')
+                assert cache.stats()['memory'] <= 2000
+            assert 0 < len(cache) < 20
+
+            # too big for the cache
+            cache.clear()
+            parse_sql('select ' + ', '.join(f'col{i}' for i in range(200)) + ' from tbl')
+            assert len(cache) == 0
+        finally:
+            set_parse_cache(None)
+
+    def test_invalidate(self, cache):
+        parse_sql('select 1')
+        parse_sql('select 2')
+        parse_sql('select 1', dialect='mysql')
+
+        cache.invalidate('select 1', 'mindsdb')
+        assert len(cache) == 2
+
+        cache.invalidate(dialect='mysql')
+        assert len(cache) == 1
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.stats()['memory'] == 0
+
+    def test_errors_not_cached(self, cache):
+        for i in range(2):
+            with pytest.raises(ParsingException):
+                parse_sql('select from where')
+        assert len(cache) == 0
+
+    def test_shared(self):
+        cache = ParseCache(max_size=10, shared=True)
+        set_parse_cache(cache)
+        try:
+            sql = 'select a from tbl where b = 1'
+            ast = parse_sql(sql)
+            assert ast.frozen
+            assert parse_sql(sql) is ast
+            assert cache.stats()['memory'] > 0
+
+            # copy can be changed
+            ast2 = ast.clone()
+            ast2.where = None
+            assert parse_sql(sql).to_string() == 'SELECT a FROM tbl WHERE b = 1'
+        finally:
+            set_parse_cache(None)
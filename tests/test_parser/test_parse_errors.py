@@ -0,0 +1,104 @@
+import pytest
+
+from sly.lex import LineIndex
+
+from mindsdb_sql import parse_sql, get_lexer_parser
+from mindsdb_sql.exceptions import ParsingException
+
+
+def get_error(sql, **kwargs):
+    with pytest.raises(ParsingException) as e:
+        parse_sql(sql, **kwargs)
+    return str(e.value)
+
+
+class TestErrorSuggestions:
+    @pytest.mark.parametrize('sql, suggestion', [
+        ('select a, from t', 'Expected symbol: "[identifier]"'),
+        ('select * from t limit', 'Possible inputs: "FALSE", "TRUE", "NULL", "-", "[number]", "[string]"'),
+        ('select * from t where x in (1, 2', 'Possible inputs: ")", ","'),
+        ('insert into t (a, b) value (1, 2)', 'Expected symbol: "SELECT"'),
+        ('delete t where a=1', 'Expected symbol: "FROM"'),
+        ('select * from (select a from t', 'Expected symbol: ")"'),
+        ('select a from t union', 'Possible inputs: "ALL", "SELECT", "(", "WITH"'),
+    ])
+    def test_suggestion(self, sql, suggestion):
+        assert get_error(sql).split('\n')[-1] == suggestion
+
+    def test_location(self):
+        message = get_error('select a from t were x=1')
+        assert message.split('\n') == [
+            'Syntax error, unknown input:',
+            '>select a from t were x=1',
+            '----------------------^',
+        ]
+
+    def test_location_multiline(self):
+        message = get_error('select a,\n  b\n  from t\n\twere x=1\n')
+        assert message.split('\n')[:5] == [
+            'Syntax error, unknown input:',
+            '>  b',
+            '>  from t',
+            '> were x=1',
+            '-------^',
+        ]
+
+        message = get_error('select a\nfrom t where')
+        assert message.split('\n')[:4] == [
+            'Syntax error, unexpected end of query:',
+            '>select a',
+            '>from t where',
+            '-------------^',
+        ]
+
+    def test_without_suggestions(self):
+        message = get_error('delete t where a=1', suggestions=False)
+        assert 'Expected symbol' not in message
+        assert message.split('\n')[:2] == ['Syntax error, unknown input:', '>delete t where a=1']
+
+
+class TestSimulate:
+    def test_simulate(self):
+        lexer, parser = get_lexer_parser('mindsdb')
+        types = [token.type for token in lexer.tokenize('select a from t')]
+
+        assert parser.simulate(types + ['$end']) is not None
+        assert parser.simulate(types[:-1] + ['$end']) is None
+
+        # continue from the state of the prefix
+        states = parser.simulate(types[:2])
+        assert parser.simulate(types[2:] + ['$end'], states) is not None
+        assert parser.simulate(['SELECT'], states) is None
+
+
+class TestLineIndex:
+    def test_line_index(self):
+        text = 'select a,\n\n  b\nfrom t'
+        lines = LineIndex(text)
+        for index in range(len(text) + 1):
+            before = text[:index]
+            assert lines.lineno(index) == before.count('\n') + 1
+            assert lines.column(index) == len(before) - before.rfind('\n') - 1
+        assert [lines.line(i) for i in range(1, 5)] == text.split('\n')
+
+    def test_token_lines(self):
+        lexer, parser = get_lexer_parser('mindsdb')
+        text = "select a,\n 'x\ny',\n  b from t"
+        tokens = list(lexer.tokenize(text))
+        assert [(t.value, t.lineno, t.column) for t in tokens if t.type in ('ID', 'QUOTE_STRING')] == [
+            ('a', 1, 7), ("'x\ny'", 2, 1), ('b', 4, 2), ('t', 4, 9)
+        ]
+
+    def test_no_line_numbers_on_success(self, monkeypatch):
+        calls = []
+        lineno = LineIndex.lineno
+        monkeypatch.setattr(LineIndex, 'lineno', lambda self, index: calls.append(index) or lineno(self, index))
+
+        sql = 'select a, b from t\nwhere x = 1\nlimit 3'
+        parse_sql(sql)
+        assert calls == []
+
+        # spans compute line numbers of the reduced rules from their offsets
+        ast = parse_sql(sql, spans=True)
+        assert ast.where.span.lineno == 2
+        assert ast.limit.span.lineno == 3
@@ -0,0 +1,85 @@
+import re
+
+import pytest
+from sly.lex import LexError
+
+import mindsdb_sql
+from mindsdb_sql import parse_sql, get_lexer_parser, strip_query
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.ast import Constant, BinaryOperation, Identifier
+from mindsdb_sql.parser.limits import ParseLimits
+
+
+@pytest.fixture
+def limits():
+    old_limits = mindsdb_sql.get_parse_limits()
+    limits = ParseLimits()
+    mindsdb_sql.set_parse_limits(limits)
+    yield limits
+    mindsdb_sql.set_parse_limits(old_limits)
+
+
+class TestParseLimits:
+    def test_length(self, limits):
+        limits.max_length = 20
+        parse_sql('select a from tbl;   ')
+
+        with pytest.raises(ParsingException, match='too long'):
+            parse_sql('select a, b from tbl1')
+
+    def test_tokens(self, limits):
+        limits.max_tokens = 6
+        parse_sql('select a, b from t')
+
+        with pytest.raises(ParsingException, match='too many tokens'):
+            parse_sql('select a, b, c from t')
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    def test_depth(self, limits, dialect):
+        limits.max_depth = 3
+        parse_sql('select ((1) + (2)) * (((3)))', dialect)
+
+        with pytest.raises(ParsingException, match='nested too deeply'):
+            parse_sql('select ((((1))))', dialect)
+
+    def test_no_limits(self, limits):
+        sql = 'select ' + ' + '.join(['(((1)))'] * 100)
+        assert parse_sql(sql) is not None
+
+
+class TestScanners:
+    mindsdb_strings = [
+        ("'a\\'b'", "a'b"),
+        ("'a''b'", "a'b"),
+        ('"a\\"b"', 'a"b'),
+        ("'x\\'y'", "x'y"),
+        # closed in the way of regex backtracking
+        ("'C:\\'", 'C:'),
+    ]
+
+    @pytest.mark.parametrize('literal, value', mindsdb_strings)
+    def test_strings(self, literal, value):
+        ast = parse_sql(f'select {literal}')
+        assert ast.targets[0].value == value
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    def test_not_closed(self, dialect):
+        for sql in ['select `a', 'select ``', "select '" + '\\' * 100]:
+            if dialect != 'mindsdb' and sql.startswith("select '"):
+                continue
+            with pytest.raises(LexError):
+                parse_sql(sql, dialect)
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    def test_comments(self, dialect):
+        ast = parse_sql('select /* a */ x /* b */ from `t 1`', dialect)
+        assert str(ast) == str(parse_sql('select x from `t 1`', dialect))
+
+        # not closed comment is division
+        lexer, parser = get_lexer_parser(dialect)
+        tokens = [t.type for t in lexer.tokenize('select 4 /* 2 /*')]
+        assert tokens == ['SELECT', 'INTEGER', 'DIVIDE', 'STAR', 'INTEGER', 'DIVIDE', 'STAR']
+
+    def test_strip_query(self):
+        for sql in ['select 1', 'select 1;', 'select 1 ; ;\n', ' ;', '', 'select "1 ;"  \t']:
+            assert strip_query(sql) == re.sub(r'[\s;]+$', '', sql)
@@ -0,0 +1,54 @@
+import pytest
+
+from mindsdb_sql import parse_many, parse_sql
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.ast import Identifier, Select
+from mindsdb_sql.parser.parallel import dump_asts, load_asts
+
+
+SQLS = [
+    "select a, b as x from db.tbl where c = 1 and d in (1, 2)",
+    "select * from (select 1 as a) as t",
+    "select from where",
+    "insert into tbl (a, b) values (1, 'x'), (2, NULL)",
+    "create view v as (select * from t)",
+    "select (a + 1) * 2 from t",
+    "select 'x;$' §",
+] * 3
+
+
+class TestParseMany:
+
+    @pytest.mark.parametrize('workers', [1, 2])
+    def test_parse_many(self, workers):
+        results = parse_many(SQLS, workers=workers, chunksize=4)
+        assert len(results) == len(SQLS)
+
+        for sql, result in zip(SQLS, results):
+            try:
+                ast = parse_sql(sql)
+            except Exception:
+                assert isinstance(result, ParsingException)
+                continue
+            assert result.to_tree() == ast.to_tree()
+            assert str(result) == str(ast)
+
+    def test_transfer_format(self):
+        ast = parse_sql("select (a + 1) * 2 as x, b from t")
+        data = dump_asts([ast])
+        ast2 = load_asts(data)[0]
+
+        assert ast2.to_tree() == ast.to_tree()
+        assert str(ast2) == str(ast)
+
+        # defaults are not serialized
+        target = ast2.targets[1]
+        assert target.__getstate__() == {'parts': ['b']}
+        assert target.alias is None and target.parentheses is False
+        assert ast2.targets[0].args[0].parentheses is True
+        assert ast2.targets[0].alias == Identifier('x')
+
+        # modification of loaded node
+        target.alias = Identifier('y')
+        assert str(ast2) == 'SELECT (a + 1) * 2 AS x, b AS y FROM t'
+        assert Select(targets=[Identifier('b')]).targets[0].alias is None
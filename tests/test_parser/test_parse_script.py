@@ -0,0 +1,91 @@
+import io
+import mmap
+
+import pytest
+
+from mindsdb_sql import parse_script, parse_sql
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.script import split_script
+
+
+SCRIPT = """-- header; comment
+select 'a;b' as x;  /* c ; */
+create job j (insert into t (select 1); select 2) every 1 hour;
+;;
+select "q;" from `t;1`  -- x;
+;
+select 'it''s;', '\\';' ; select 1
+"""
+
+STATEMENTS = [
+    "select 'a;b' as x",
+    "create job j (insert into t (select 1); select 2) every 1 hour",
+    'select "q;" from `t;1`',
+    "select 'it''s;', '\\';'",
+    'select 1',
+]
+
+
+class TestParseScript:
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 7, 1000])
+    def test_split(self, chunk_size):
+        statements = list(split_script(io.StringIO(SCRIPT), chunk_size=chunk_size))
+        assert [sql for sql, _ in statements] == STATEMENTS
+
+        for sql, span in statements:
+            assert SCRIPT[span.start:span.end] == sql
+            assert span.lineno == SCRIPT[:span.start].count('\n') + 1
+
+    def test_sources(self, tmp_path):
+        expected = [(sql, span) for sql, span in split_script(SCRIPT)]
+
+        # binary file with multibyte chars cut by chunks
+        script = SCRIPT.replace('a;b', 'ä;ß')
+        path = tmp_path / 'script.sql'
+        path.write_text(script, encoding='utf-8')
+        with open(path, 'rb') as fd:
+            statements = list(split_script(fd, chunk_size=3))
+        assert statements[0][0] == "select 'ä;ß' as x"
+        assert [span for _, span in statements] == [span for _, span in expected]
+
+        with open(path, 'r+b') as fd:
+            with mmap.mmap(fd.fileno(), 0) as mm:
+                assert list(split_script(mm, chunk_size=5)) == statements
+
+        # iterable of lines
+        assert list(split_script(SCRIPT.splitlines(keepends=True))) == expected
+
+    def test_parse_script(self):
+        result = list(parse_script(io.StringIO(SCRIPT), chunk_size=10))
+        assert len(result) == len(STATEMENTS)
+        for (ast, span), sql in zip(result, STATEMENTS):
+            assert ast.to_tree() == parse_sql(sql).to_tree()
+            assert SCRIPT[span.start:span.end] == sql
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql'])
+    def test_other_dialects(self, dialect):
+        script = "select 1;\n\nselect a from b where c = 'x;y'\n;\n  -- end\n"
+        result = [str(ast) for ast, _ in parse_script(script, dialect=dialect)]
+        assert result == ['SELECT 1', "SELECT a FROM b WHERE c = 'x;y'"]
+
+    def test_not_closed(self):
+        assert list(split_script("select 1; select 'a;b")) == [
+            ('select 1', (0, 8, 1)),
+            ("select 'a;b", (10, 21, 1)),
+        ]
+        assert [sql for sql, _ in split_script('select 1; /* select 2; select 3')] == ['select 1']
+
+    def test_error(self):
+        statements = parse_script('select 1; select from; select 2')
+        ast, span = next(statements)
+        assert str(ast) == 'SELECT 1'
+        with pytest.raises(ParsingException):
+            next(statements)
+
+    def test_long_statement(self):
+        values = ', '.join(f"({i}, 'v;{i}')" for i in range(2000))
+        script = f'insert into t values {values}; select 1'
+        statements = list(split_script(io.StringIO(script), chunk_size=16))
+        assert statements[0][0] == f'insert into t values {values}'
+        assert statements[1][0] == 'select 1'
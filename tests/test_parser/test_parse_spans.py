@@ -0,0 +1,60 @@
+import pytest
+
+from mindsdb_sql import parse_sql, get_lexer_parser
+from mindsdb_sql.parser.ast import Select, Constant, Identifier
+
+
+@pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+class TestParseSpans:
+
+    def test_spans(self, dialect):
+        sql = "select a, b + 1 as x\nfrom tbl\nwhere c = 'x' and d in (1, 2)"
+
+        ast = parse_sql(sql, dialect, spans=True)
+
+        def text(node):
+            return sql[node.span.start:node.span.end]
+
+        assert text(ast) == sql
+        assert ast.span.lineno == 1
+
+        assert text(ast.targets[0]) == 'a'
+        assert text(ast.targets[1]) == 'b + 1 as x'
+        assert text(ast.from_table) == 'tbl'
+
+        where = ast.where
+        assert text(where) == "c = 'x' and d in (1, 2)"
+        assert text(where.args[0]) == "c = 'x'"
+        assert text(where.args[0].args[1]) == "'x'"
+        assert text(where.args[1].args[0]) == 'd'
+
+        if dialect == 'mindsdb':
+            # only mindsdb lexer counts lines
+            assert ast.from_table.span.lineno == 2
+            assert where.span.lineno == 3
+
+    def test_no_spans(self, dialect):
+        ast = parse_sql('select a from tbl', dialect)
+        assert ast.span is None
+        assert ast.targets[0].span is None
+
+        # nodes created without parser
+        assert Select(targets=[Constant(1)]).span is None
+
+    def test_positions_are_opt_in(self, dialect):
+        lexer, parser = get_lexer_parser(dialect)
+        assert not parser.track_positions
+
+        ast = parser.parse(lexer.tokenize('select a from tbl'))
+        assert ast.targets[0] == Identifier('a')
+        assert ast.targets[0].span is None
+
+    def test_parser_doesnt_keep_positions(self, dialect):
+        lexer, parser = get_lexer_parser(dialect)
+        for i in range(3):
+            ast = parser.parse(lexer.tokenize(f'select a{i} from tbl'), spans=True)
+            assert ast.targets[0] == Identifier(f'a{i}')
+            assert ast.targets[0].span.start == 7
+
+        assert not hasattr(parser, '_line_positions')
+        assert not hasattr(parser, '_index_positions')
@@ -0,0 +1,106 @@
+import pytest
+
+from mindsdb_sql import parse_sql, set_template_cache, get_template_cache
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.ast import Constant, Identifier, Select, BinaryOperation
+from mindsdb_sql.parser.template import TemplateCache
+
+
+@pytest.fixture
+def cache():
+    cache = TemplateCache(max_size=10)
+    set_template_cache(cache)
+    yield cache
+    set_template_cache(None)
+
+
+def parse_without_templates(sql, dialect='mindsdb'):
+    cache = get_template_cache()
+    set_template_cache(None)
+    try:
+        return parse_sql(sql, dialect)
+    finally:
+        set_template_cache(cache)
+
+
+class TestParseTemplate:
+
+    def test_bind_constants(self, cache):
+        ast = parse_sql("select a from mindsdb.model where a = 1 and b = 'x' limit 10")
+        assert cache.stats()['misses'] == 1
+
+        ast = parse_sql("select a from mindsdb.model where a = 2 and b = 'it''s' limit 3")
+        assert cache.stats()['hits'] == 1
+
+        expected_ast = Select(
+            targets=[Identifier('a')],
+            from_table=Identifier('mindsdb.model'),
+            where=BinaryOperation(op='and', args=[
+                BinaryOperation(op='=', args=[Identifier('a'), Constant(2)]),
+                BinaryOperation(op='=', args=[Identifier('b'), Constant("it's")]),
+            ]),
+            limit=Constant(3)
+        )
+        assert ast.to_tree() == expected_ast.to_tree()
+        assert str(ast) == str(expected_ast)
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    @pytest.mark.parametrize('sqls', [
+        ["select * from t where x = -1 and y in (1, 2, 3)", "select * from t where x = -20 and y in (4, 5, 6)"],
+        ["select * from t where x = 'a' order by a limit 1 offset 2", "select * from t where x = 'b' order by a limit 3 offset 4"],
+        ["insert into t (a, b) values (1, 'a'), (2, 'b')", "insert into t (a, b) values (3.5, 'c'), (-4, 'd')"],
+        ['select "a" from t where b = 1', 'select "b" from t where b = 2'],
+        ["select 'a' as x, 1 + 2 from t", "select 'b' as x, 3 + 4 from t"],
+    ])
+    def test_same_as_parser(self, cache, dialect, sqls):
+        for sql in sqls:
+            ast = parse_sql(sql, dialect)
+            expected_ast = parse_without_templates(sql, dialect)
+            assert ast.to_tree() == expected_ast.to_tree()
+            assert str(ast) == str(expected_ast)
+
+    def test_constant_list(self, cache):
+        parse_sql("select * from t where x in (1, -2, 'a')")
+        ast = parse_sql("select * from t where x in (3, -4, 'b')")
+        assert cache.stats()['hits'] == 1
+        assert ast.where.args[1].values == [3, -4, 'b']
+
+    def test_not_bindable(self, cache):
+        # literals are not constants
+        for i in range(3):
+            ast = parse_sql(f"create model m predict y using a={i}, b='x{i}'")
+            assert ast.using == {'a': i, 'b': f'x{i}'}
+
+        for i in range(3):
+            ast = parse_sql(f"create view v as (select * from t where a={i})")
+            assert ast.query_str == f'select * from t where a={i}'
+
+        stats = cache.stats()
+        assert stats['misses'] == 2
+        assert stats['not_bindable'] == 4
+        assert stats['hits'] == 0
+
+    def test_modification_of_result(self, cache):
+        ast = parse_sql('select a from t where b = 1')
+        ast.where.args[1].value = 10
+
+        ast = parse_sql('select a from t where b = 2')
+        ast.where.args[1].value = 20
+        ast = parse_sql('select a from t where b = 3')
+        assert str(ast) == 'SELECT a FROM t WHERE b = 3'
+
+    def test_size_limit(self, cache):
+        for i in range(15):
+            parse_sql(f'select a{i} from t where b = 1')
+        assert len(cache) == 10
+
+    def test_errors(self, cache):
+        for i in range(2):
+            with pytest.raises(ParsingException):
+                parse_sql(f'select {i} from where')
+        assert len(cache) == 0
+
+        # error from grammar action
+        parse_sql('select * from t limit 1')
+        with pytest.raises(ParsingException):
+            parse_sql('select * from t limit 1.5')
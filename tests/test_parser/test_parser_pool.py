@@ -0,0 +1,129 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from mindsdb_sql import parse_sql, get_lexer_parser_pool
+from mindsdb_sql.exceptions import ParsingException
+from sly import Lexer, Parser
+
+
+class NumLexer(Lexer):
+    tokens = {NUMBER, SEMI}
+    ignore = ' '
+    NUMBER = r'\d+'
+    SEMI = r';'
+
+
+class NumParser(Parser):
+    tokens = NumLexer.tokens
+
+    def __init__(self, errok=False, restart=False):
+        self.use_errok = errok
+        self.use_restart = restart
+        self.errors = []
+
+    @_('statements statement')
+    def statements(self, p):
+        return p.statements + [p.statement]
+
+    @_('statement')
+    def statements(self, p):
+        return [p.statement]
+
+    @_('NUMBER SEMI')
+    def statement(self, p):
+        return int(p.NUMBER)
+
+    @_('error SEMI')
+    def statement(self, p):
+        return None
+
+    def error(self, token, expected_tokens=None):
+        self.errors.append(token)
+        if self.use_errok:
+            self.errok()
+        if self.use_restart:
+            self.restart()
+
+
+class TestLexerParserPool:
+
+    def test_reuse(self):
+        pool = get_lexer_parser_pool('mindsdb')
+        with pool.acquire() as item1:
+            pass
+        with pool.acquire() as item2:
+            assert item2 is item1
+
+            # taken item is not given to another caller
+            with pool.acquire() as item3:
+                assert item3 is not item2
+
+    def test_reentrant_parser(self):
+        # parser doesn't keep state of parsing, the same object can be used in nested calls
+        with get_lexer_parser_pool('mindsdb').acquire() as (lexer, parser):
+            nested = []
+
+            def tokens():
+                for i, token in enumerate(lexer.tokenize('select a from b')):
+                    if i == 2:
+                        nested_tokens = lexer.__class__().tokenize('select c from d where x=1')
+                        nested.append(parser.parse(nested_tokens))
+                    yield token
+
+            ast = parser.parse(tokens())
+            assert ast.to_string() == 'SELECT a FROM b'
+            assert nested[0].to_string() == 'SELECT c FROM d WHERE x = 1'
+
+    @pytest.mark.parametrize('dialect', ['sqlite', 'mysql', 'mindsdb'])
+    def test_threads(self, dialect):
+        sqls = [
+            f'select a{i}, b from tbl{i} where c = {i} order by a{i} limit {i}'
+            for i in range(200)
+        ]
+        sqls.append('select a from')
+        expected = [str(parse_sql(sql, dialect)) if sql != 'select a from' else None for sql in sqls]
+
+        def parse(sql):
+            try:
+                return str(parse_sql(sql, dialect))
+            except ParsingException:
+                return None
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            result = list(executor.map(parse, sqls * 5))
+
+        assert result == expected * 5
+
+    def test_unknown_dialect(self):
+        with pytest.raises(ParsingException):
+            parse_sql('select 1', dialect='unknown')
+
+
+class TestParserErrorRecovery:
+
+    def test_errok(self):
+        parser = NumParser()
+        assert parser.parse(NumLexer().tokenize('1; 2 2 2 2; 3;')) == [1, None, 3]
+        assert len(parser.errors) == 1
+
+        # error() is called again without waiting for shifted tokens
+        parser = NumParser(errok=True)
+        assert parser.parse(NumLexer().tokenize('1; 2 2 2 2; 3;')) == [1, None, 3]
+        assert len(parser.errors) > 1
+
+    def test_restart(self):
+        # parsed statements are dropped
+        parser = NumParser(restart=True)
+        assert parser.parse(NumLexer().tokenize('1; 2 2; 3;')) == [3]
+
+    def test_positions(self):
+        parser = NumParser()
+        token = list(NumLexer().tokenize('1; 22;'))[2]
+        assert parser.line_position(token) == 1
+        assert parser.index_position(token) == 3
+
+        with get_lexer_parser_pool('mindsdb').acquire() as (lexer, parser):
+            ast = parser.parse(lexer.tokenize('select a\nfrom b where c = 1'), spans=True)
+            assert parser.index_position(ast.where) == 22
+            assert parser.line_position(ast.where) == 2
@@ -0,0 +1,121 @@
+import os
+
+from sly import Lexer, Parser
+from sly.yacc import (LRTable, LRTableData, lrtable_to_data, pack_lrtable_data, unpack_lrtable_data,
+                      write_lrtable_module)
+
+
+class CalcLexer(Lexer):
+    tokens = {NUMBER, PLUS, TIMES}
+    ignore = ' '
+
+    NUMBER = r'\d+'
+    PLUS = r'\+'
+    TIMES = r'\*'
+
+
+def make_parser(tables_dir, with_times=True, tables_module=None):
+
+    class CalcParser(Parser):
+        tokens = CalcLexer.tokens
+        cachedir = tables_dir
+        tablesmodule = tables_module
+
+        precedence = (
+            ('left', PLUS),
+            ('left', TIMES),
+        )
+
+        @_('expr PLUS expr')
+        def expr(self, p):
+            return p.expr0 + p.expr1
+
+        if with_times:
+            @_('expr TIMES expr')
+            def expr(self, p):
+                return p.expr0 * p.expr1
+
+        @_('NUMBER')
+        def expr(self, p):
+            return int(p.NUMBER)
+
+    return CalcParser
+
+
+class TestParserTablesCache:
+
+    def test_tables_are_cached(self, tmp_path):
+        cachedir = str(tmp_path)
+
+        parser_cls = make_parser(cachedir)
+        assert isinstance(parser_cls._lrtable, LRTable)
+        assert len(os.listdir(cachedir)) == 1
+
+        parser_cls2 = make_parser(cachedir)
+        assert isinstance(parser_cls2._lrtable, LRTableData)
+        assert parser_cls2._lrtable.lr_action == parser_cls._lrtable.lr_action
+        assert parser_cls2._lrtable.lr_goto == parser_cls._lrtable.lr_goto
+
+        result = parser_cls2().parse(CalcLexer().tokenize('2 + 3 * 4'))
+        assert result == 14
+
+    def test_grammar_change_rebuilds_tables(self, tmp_path):
+        cachedir = str(tmp_path)
+
+        make_parser(cachedir)
+        parser_cls = make_parser(cachedir, with_times=False)
+        assert isinstance(parser_cls._lrtable, LRTable)
+
+        result = parser_cls().parse(CalcLexer().tokenize('2 + 3'))
+        assert result == 5
+
+    def test_damaged_cache_file(self, tmp_path):
+        cachedir = str(tmp_path)
+
+        make_parser(cachedir)
+        for name in os.listdir(cachedir):
+            with open(os.path.join(cachedir, name), 'wb') as f:
+                f.write(b'damaged')
+
+        parser_cls = make_parser(cachedir)
+        assert isinstance(parser_cls._lrtable, LRTable)
+
+        parser_cls = make_parser(cachedir)
+        assert isinstance(parser_cls._lrtable, LRTableData)
+
+    def test_cache_is_disabled(self, tmp_path):
+        parser_cls = make_parser(None)
+        assert isinstance(parser_cls._lrtable, LRTable)
+
+
+class TestParserTablesModule:
+
+    def test_pack_tables(self):
+        parser_cls = make_parser(None)
+        data = lrtable_to_data(parser_cls._lrtable)
+
+        data2 = unpack_lrtable_data(pack_lrtable_data(data))
+        assert data2['action'] == data['action']
+        assert data2['goto'] == data['goto']
+        assert data2['defaulted_states'] == data['defaulted_states']
+
+    def test_tables_from_module(self, tmp_path, monkeypatch):
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        parser_cls = make_parser(None)
+        write_lrtable_module(str(tmp_path / 'calc_parsetab.py'), 'CalcParser',
+                             parser_cls._signature, lrtable_to_data(parser_cls._lrtable))
+
+        parser_cls = make_parser(None, tables_module='calc_parsetab')
+        assert isinstance(parser_cls._lrtable, LRTableData)
+
+        result = parser_cls().parse(CalcLexer().tokenize('2 * 3 + 4'))
+        assert result == 10
+
+        # grammar was changed: module is ignored
+        parser_cls = make_parser(None, with_times=False, tables_module='calc_parsetab')
+        assert isinstance(parser_cls._lrtable, LRTable)
+
+    def test_missed_module(self):
+        parser_cls = make_parser(None, tables_module='not_existing_parsetab')
+        assert isinstance(parser_cls._lrtable, LRTable)
@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+import mindsdb_sql
+from mindsdb_sql import parse_sql
+from mindsdb_sql.exceptions import ParsingException
+from mindsdb_sql.parser.cache import ParseCache
+from mindsdb_sql.parser.fingerprint import fingerprint, node_fingerprint
+from mindsdb_sql.parser.stats import QueryStats
+from mindsdb_sql.planner import plan_query
+from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
+
+
+@pytest.fixture
+def stats():
+    old_stats = mindsdb_sql.get_query_stats()
+    stats = QueryStats()
+    mindsdb_sql.set_query_stats(stats)
+    yield stats
+    mindsdb_sql.set_query_stats(old_stats)
+
+
+class TestFingerprint:
+    @pytest.mark.parametrize('sql1, sql2', [
+        ('select a from t where x = 1', "SELECT  a\nFROM t WHERE x='abc'"),
+        ('select * from t where x in (1, 2, 3)', "select * from t where x in ('a')"),
+        ('select * from t where x not in (-1, null)', 'select * from t where x NOT  IN (1)'),
+        ('select * from t limit 1 offset 2', 'select * from t limit ? offset 0.5'),
+    ])
+    def test_same(self, sql1, sql2):
+        assert fingerprint(sql1) == fingerprint(sql2)
+
+    @pytest.mark.parametrize('sql1, sql2', [
+        ('select a from t', 'select b from t'),
+        ('select a from t', 'select A from t'),
+        ('select a from t where x in (1, 2)', 'select a from t where x in (select 1)'),
+        ('select a from t where x in (1, 2)', 'select a from t where x in (1, y)'),
+        ('select `select` from t', 'select select from t'),
+    ])
+    def test_different(self, sql1, sql2):
+        assert fingerprint(sql1).key != fingerprint(sql2).key
+
+    def test_normalized_query(self):
+        result = fingerprint("Select a, `b c` from t where x  not\nin (1, 'x') and y > -2.5 limit 10")
+        assert result.query == 'SELECT a , `b c` FROM t WHERE x NOT IN (...) AND y > - ? LIMIT ?'
+
+        # part of the query which can't be lexed is kept
+        assert fingerprint('select a § b').query == 'SELECT a § b'
+
+    def test_node_fingerprint(self):
+        ast = parse_sql('select a from t where x = 1')
+        assert node_fingerprint(ast) == fingerprint('select a from t where x = 2')
+        assert ast.fingerprint is not None
+
+
+class TestQueryStats:
+    def test_phases(self, stats):
+        for value in range(3):
+            ast = parse_sql(f'select * from int1.tbl where x = {value}')
+            plan_query(ast, integrations=['int1'])
+            SqlalchemyRender('postgres').get_string(ast)
+
+        with pytest.raises(ParsingException):
+            parse_sql('select * from int1.tbl where x =')
+
+        assert len(stats) == 2
+        item = stats.get(fingerprint('select * from int1.tbl where x = 5'))
+        assert item['query'] == 'SELECT * FROM int1 . tbl WHERE x = ?'
+        assert item['count'] == 3
+        assert item['errors'] == 0
+        assert set(item['phases']) == {'parse', 'plan', 'render'}
+        for phase in item['phases'].values():
+            assert phase['count'] == 3
+            assert 0 < phase['max_time'] <= phase['total_time']
+
+        item = stats.get(fingerprint('select * from int1.tbl where x ='))
+        assert item['errors'] == 1
+        assert item['phases']['parse']['count'] == 1
+
+    def test_parse_cache(self, stats):
+        old_cache = mindsdb_sql.get_parse_cache()
+        mindsdb_sql.set_parse_cache(ParseCache())
+        try:
+            for _ in range(3):
+                parse_sql('select a from t where x = 1', 'sqlite')
+                parse_sql('select a from t where x = 1')
+        finally:
+            mindsdb_sql.set_parse_cache(old_cache)
+
+        assert [item['count'] for item in stats.top()] == [6]
+
+    def test_eviction(self):
+        stats = QueryStats(max_size=40)
+        stats.record(fingerprint('select a from t'), 'parse', 10)
+        for i in range(100):
+            stats.record(fingerprint(f'select a{i} from t'), 'parse', 1)
+
+        assert len(stats) <= 40
+        assert stats.evictions > 0
+        assert stats.top(1)[0]['query'] == 'SELECT a FROM t'
+
+    def test_threads(self):
+        stats = QueryStats()
+        queries = [fingerprint(f'select a{i} from t') for i in range(10)]
+
+        def worker():
+            for _ in range(100):
+                for query in queries:
+                    stats.record(query, 'parse', 0.001)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [item['count'] for item in stats.top(None)] == [400] * 10
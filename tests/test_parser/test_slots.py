@@ -0,0 +1,67 @@
+import copy
+import pickle
+
+import pytest
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser import ast
+from mindsdb_sql.parser.ast.base import ASTNode
+from mindsdb_sql.parser.dialects.mindsdb import CreatePredictor
+
+
+def all_node_classes(cls=ASTNode):
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from all_node_classes(subclass)
+
+
+class TestSlots:
+
+    def test_no_dict(self):
+        for cls in all_node_classes():
+            assert '__slots__' in cls.__dict__, cls
+            assert '__dict__' not in dir(cls), cls
+
+    def test_unknown_attribute(self):
+        node = ast.Identifier('a')
+        with pytest.raises(AttributeError):
+            node.unknown = 1
+
+    def test_declared_fields(self):
+        node = ast.Identifier('a')
+        assert node.sub_select is None
+        node.sub_select = ast.Select(targets=[ast.Star()])
+
+        node2 = copy.deepcopy(node)
+        assert node2.sub_select == node.sub_select
+        assert node2.sub_select is not node.sub_select
+
+        op = ast.BinaryOperation('=', args=[ast.Identifier('a'), ast.Constant(1)])
+        assert op._orig_node is None
+
+    @pytest.mark.parametrize('sql', [
+        "select a, b as x, count(*) over (partition by c) from db.tbl as t where c in (1, 2) order by a limit 2",
+        "insert into tbl (a, b) values (1, 'x'), (2, NULL)",
+        "create predictor p from int (select * from t) predict y using a=1",
+    ])
+    def test_pickle_and_copy(self, sql):
+        query = parse_sql(sql)
+
+        for query2 in (
+            pickle.loads(pickle.dumps(query)),
+            copy.deepcopy(query),
+            copy.copy(query),
+        ):
+            assert type(query2) is type(query)
+            assert query2.to_tree() == query.to_tree()
+            assert str(query2) == str(query)
+
+    def test_state(self):
+        query = parse_sql('select a from t')
+        # attributes with default values are not included
+        assert query.targets[0].__getstate__() == {'parts': ['a']}
+
+        node = CreatePredictor.__new__(CreatePredictor)
+        node.__setstate__({'name': ast.Identifier('p')})
+        assert node.name == ast.Identifier('p')
+        assert node.alias is None and node.parentheses is False
@@ -0,0 +1,58 @@
+import pytest
+
+from sly import Lexer, Parser
+
+
+class ListLexer(Lexer):
+    tokens = {NUMBER, NAME, COMMA, MINUS}
+    ignore = ' '
+
+    NUMBER = r'\d+'
+    NAME = r'[a-z]+'
+    COMMA = r','
+    MINUS = r'-'
+
+
+class ListParser(Parser):
+    tokens = ListLexer.tokens
+
+    @_('NAME [ MINUS ] NUMBER { COMMA NUMBER }')
+    def items(self, p):
+        first = -int(p.NUMBER0) if p.MINUS else int(p.NUMBER0)
+        return p.NAME, [first] + [int(value) for value in p.NUMBER1]
+
+    @_('NAME NAME')
+    def items(self, p):
+        # reassignment of symbols is not allowed
+        p.NAME0 = 'x'
+
+
+class TestProductionAccessors:
+    def test_named_symbols(self):
+        parser = ListParser()
+
+        assert parser.parse(ListLexer().tokenize('a 1')) == ('a', [1])
+        assert parser.parse(ListLexer().tokenize('b - 1, 2, 3')) == ('b', [-1, 2, 3])
+
+    def test_named_symbols_are_positions(self):
+        namemaps = [p.namemap for p in ListParser._grammar.Productions if p.name == 'items']
+
+        assert all(
+            isinstance(index, int) or isinstance(index, tuple)
+            for namemap in namemaps for index in namemap.values()
+        )
+
+    def test_assign_symbol(self):
+        with pytest.raises(AttributeError):
+            ListParser().parse(ListLexer().tokenize('a b'))
+
+    def test_unknown_symbol(self):
+        class BadParser(Parser):
+            tokens = ListLexer.tokens
+
+            @_('NAME')
+            def items(self, p):
+                return p.NUMBER
+
+        with pytest.raises(AttributeError, match='No symbol NUMBER'):
+            BadParser().parse(ListLexer().tokenize('a'))
@@ -0,0 +1,149 @@
+import pytest
+
+from mindsdb_sql import parse_sql, set_parse_cache
+from mindsdb_sql.parser.ast import Constant, Identifier
+from mindsdb_sql.parser.cache import ParseCache
+from mindsdb_sql.planner import plan_query
+from mindsdb_sql.planner.utils import query_traversal
+
+PLAN_PARAMS = dict(
+    integrations=['int1', 'int2'],
+    predictor_namespace='mindsdb',
+    default_namespace='mindsdb',
+    predictor_metadata={
+        'pred': {},
+        'tp3': {
+            'timeseries': True,
+            'window': 10,
+            'order_by_column': 'date',
+            'group_by_columns': ['type'],
+        },
+    },
+)
+
+
+class TestReplace:
+
+    def test_replace(self):
+        query = parse_sql('select a from t where b = 1')
+        query2 = query.replace(where=None)
+
+        assert query2.where is None
+        assert query.where is not None
+        assert query2.targets is query.targets
+        assert query2.from_table is query.from_table
+
+        assert query.replace() == query
+        assert query.replace() is not query
+
+
+class TestCopyOnWrite:
+
+    def test_traversal(self):
+        query = parse_sql('select a, b from t where x = 1 and y = 2 order by c')
+        text = query.to_string()
+
+        def rename(node, **kwargs):
+            if isinstance(node, Identifier) and node.parts == ['y']:
+                return Identifier('z')
+
+        query2 = query_traversal(query, rename, copy_on_write=True)
+        assert query2.to_string() == 'SELECT a, b FROM t WHERE x = 1 AND z = 2 ORDER BY c'
+        assert query.to_string() == text
+
+        # only the path to the replaced node is copied
+        assert query2 is not query
+        assert query2.where is not query.where
+        assert query2.where.args[1] is not query.where.args[1]
+        assert query2.where.args[0] is query.where.args[0]
+        assert query2.targets is query.targets
+        assert query2.order_by is query.order_by
+        assert query2.from_table is query.from_table
+
+        # nothing to replace
+        assert query_traversal(query, lambda node, **kwargs: None, copy_on_write=True) is None
+
+    def test_deep_condition(self):
+        condition = ' and '.join(f'a = {i}' for i in range(5000))
+        query = parse_sql(f'select * from t where {condition}')
+
+        def replace_last(node, **kwargs):
+            if isinstance(node, Constant) and node.value == 4999:
+                return Constant(-1)
+
+        query2 = query_traversal(query, replace_last, copy_on_write=True)
+        assert query2.where.args[1].args[1].value == -1
+        assert query.where.args[1].args[1].value == 4999
+        assert query2.where.args[0] is query.where.args[0]
+
+    def test_in_place(self):
+        query = parse_sql('select a from t where b = 1')
+        where = query.where
+
+        def replace_constant(node, **kwargs):
+            if isinstance(node, Constant):
+                return Constant(2)
+
+        assert query_traversal(query, replace_constant) is None
+        assert query.where is where
+        assert query.where.args[1].value == 2
+
+    def test_in_place_order(self):
+        query = parse_sql('select a from t where b = 1')
+        seen = {}
+
+        def replace_table(node, is_table=False, parent_query=None, **kwargs):
+            if is_table and isinstance(node, Identifier) and node.parts == ['t']:
+                return Identifier('new_t')
+            if isinstance(node, Identifier) and not is_table:
+                seen[node.parts[-1]] = parent_query.from_table.parts
+
+        query_traversal(query, replace_table)
+
+        # replaced table is visible to callbacks of the next children
+        assert seen == {'a': ['new_t'], 'b': ['new_t']}
+        assert query.from_table.parts == ['new_t']
+
+
+class TestPlannerDoesNotModifyQuery:
+
+    @pytest.mark.parametrize('sql', [
+        "select a, b, sum(c) as s from int1.tbl where x = 1 group by a, b order by s desc limit 10",
+        "select x.a from (select a, b from int1.tbl where c is not null) as x",
+        "select * from int1.tbl where a in (select a from int2.tbl2 where b = 'x')",
+        "select t.a, p.y from int1.tbl as t join mindsdb.pred as p where t.x = 1 and p.z = 2 limit 100",
+        "select t.a, p.y from int1.tbl as t join mindsdb.pred as p on t.b = p.b limit 10 offset 2",
+        "select t.a, t2.b from int1.tbl as t join (select * from int2.tbl2) as t2 on t.id = t2.id where t.x > 1",
+        "select t.a, t.b, p.y from int1.tbl as t join int2.tbl2 as t2 on t.id = t2.id "
+        "join mindsdb.pred as p where t.x > 10 and t2.y = 'a'",
+        "select p.date, p.y from int1.tbl as t join mindsdb.tp3 as p where t.date > latest and t.type = 'house'",
+        "select * from int1.tbl where a = 1 and int1.fnc(b) > 2 order by a limit 1",
+        "update int1.tbl set a = df.a from (select * from int2.tbl2 where c = 1) as df where tbl.id = df.id",
+        "delete from int1.tbl where a in (select a from int2.tbl2)",
+        "select a, b from int1.tbl union select a, b from int2.tbl2",
+    ])
+    def test_query_not_modified(self, sql):
+        query = parse_sql(sql, dialect='mindsdb').freeze()
+        query_copy = query.clone()
+
+        plan_query(query, **PLAN_PARAMS)
+
+        # comparison of not frozen copies: cached hashes are not used
+        assert query.clone() == query_copy
+
+        # the same query can be planned again
+        plan = plan_query(query, **PLAN_PARAMS)
+        assert plan.steps == plan_query(query_copy, **PLAN_PARAMS).steps
+
+    def test_shared_parse_cache(self):
+        set_parse_cache(ParseCache(shared=True))
+        try:
+            sql = 'select t.a, p.y from int1.tbl as t join mindsdb.pred as p where t.x = 1'
+            query = parse_sql(sql, dialect='mindsdb')
+            plan = plan_query(query, **PLAN_PARAMS)
+
+            query2 = parse_sql(sql, dialect='mindsdb')
+            assert query2 is query
+            assert plan_query(query2, **PLAN_PARAMS).steps == plan.steps
+        finally:
+            set_parse_cache(None)
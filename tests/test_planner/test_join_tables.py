@@ -258,7 +258,11 @@ class TestPlanJoinTables:
         expected_plan = QueryPlan(integrations=['int'],
                                   steps=[
                                       FetchDataframeStep(integration='int',
-                                                         query=query),
+                                                         query=parse_sql('''
+                                                            SELECT tab1.column1, tab2.column1, tab2.column2
+                                                            FROM tab1
+                                                            INNER JOIN tab2 ON tab1.column1 = tab2.column1
+                                                         ''')),
                                       FetchDataframeStep(integration='int',
                                                          query=Select(targets=[Star()],
                                                                       from_table=Identifier('tab2')),
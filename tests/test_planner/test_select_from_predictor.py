@@ -170,6 +170,18 @@ class TestPlanSelectFromPredictor:
             plan_query(query, predictor_namespace='mindsdb', predictor_metadata={'pred': {}})
 
 
+    def test_select_from_predictor_deep_where(self):
+        # long chain of conditions is extracted without recursion
+        condition = ' and '.join(f'x{i} = {i}' for i in range(5000))
+        query = parse_sql(f'select * from mindsdb.pred where {condition}')
+        plan = plan_query(query, predictor_namespace='mindsdb', predictor_metadata={'pred': {}})
+
+        assert plan.steps[0].row_dict == {f'x{i}': i for i in range(5000)}
+
+        query = parse_sql(f'select * from mindsdb.pred where {condition} and x > 1')
+        with pytest.raises(PlanningException):
+            plan_query(query, predictor_namespace='mindsdb', predictor_metadata={'pred': {}})
+
     def test_select_from_predictor_no_where_error(self):
         query = Select(targets=[Star()],
                        from_table=Identifier('mindsdb.pred'))